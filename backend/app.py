@@ -10,21 +10,48 @@ Description : Production-grade REST API for stock data fetching, technical
 ==============================================================================
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, g, jsonify, request
 from flask_cors import CORS
+import atexit
 import logging
+import os
+import queue
+import threading
+import time
 import traceback
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+import numpy as np
+
+import config
 
 # Internal service modules
+from services.bar_store import BarStore
+from services.cache import TTLCache
+from services.cache_snapshot import CacheSnapshot
+from services.shared_cache import SharedCache
+from services.market_data import build_provider
+from services.meta_store import MetaStore
 from services.stock_service import StockService
 from services.indicator_service import IndicatorService
 from services.prediction_service import PredictionService
-from utils.validators import validate_ticker, validate_period
-from utils.response_builder import success_response, error_response
+from services.scheduler import HostLock, MarketHours, RefreshScheduler
+from services.screener_service import ScreenerService, ScreenerIndex, parse_filters
+from services.stream_service import StreamHub, StockFeed, ReplayFeed, SSE_HEARTBEAT
+from utils.validators import (validate_ticker, validate_period, validate_indicators,
+                              validate_tickers, validate_format, validate_points,
+                              validate_fields)
+from utils.response_builder import success_response, error_response, RESPONSE_FORMATS
+from utils.serializer import OrjsonProvider
+from utils.http_cache import make_etag, cache_headers, is_not_modified
+from utils.downsample import lttb_indices
+from utils.metrics import (REGISTRY, REQUEST_SECONDS, RESPONSE_BYTES, StageTimer,
+                           CONTENT_TYPE as METRICS_CONTENT_TYPE)
 
 # ─── Application Bootstrap ────────────────────────────────────────────────────
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app)
 # ─── Logging Configuration ────────────────────────────────────────────────────
 
@@ -40,9 +67,145 @@ logger = logging.getLogger(__name__)
 
 # ─── Service Instantiation ────────────────────────────────────────────────────
 
-stock_svc     = StockService()
+market_data   = build_provider(
+    config.MARKET_DATA_PROVIDER,
+    fixture_dir=config.FIXTURE_DIR,
+    latency_file=config.FIXTURE_LATENCY_FILE,
+    seed=config.FIXTURE_SEED,
+    record_dir=config.MARKET_DATA_RECORD_DIR,
+    url=config.MARKET_DATA_URL,
+    timeout=config.MARKET_DATA_TIMEOUT,
+)
+stock_cache   = TTLCache(
+    max_entries=config.CACHE_MAX_ENTRIES,
+    max_bytes=config.CACHE_MAX_BYTES,
+    shared=SharedCache(config.SHARED_CACHE_PATH,
+                       max_entries=config.SHARED_CACHE_MAX_ENTRIES,
+                       lock_timeout=config.SHARED_CACHE_LOCK_TIMEOUT)
+    if config.SHARED_CACHE_ENABLED else None,
+)
+stock_svc     = StockService(
+    provider=market_data,
+    bar_store=BarStore(config.BAR_STORE_DIR) if config.BAR_STORE_ENABLED else None,
+    cache=stock_cache,
+    cache_ttl=config.CACHE_TTL,
+    io_threads=config.ASYNC_IO_THREADS,
+    meta_store=MetaStore(config.META_STORE_PATH,
+                         static_max_age=config.META_STATIC_MAX_AGE,
+                         market_max_age=config.META_MARKET_MAX_AGE,
+                         active_age=config.META_ACTIVE_SECONDS,
+                         max_entries=config.META_STORE_MAX_ENTRIES)
+    if config.META_STORE_ENABLED else None,
+)
 indicator_svc = IndicatorService()
-prediction_svc = PredictionService()
+prediction_svc = PredictionService(params=PredictionService.load_params(
+    config.PREDICTOR_PARAMS_FILE or config.PREDICTOR_PARAMS_DIR))
+
+screener_svc   = ScreenerService(stock_svc, indicator_svc, prediction_svc,
+                                 universe=config.SCREENER_UNIVERSE,
+                                 period=config.SCREENER_PERIOD)
+
+# Bounded pool shared by all list endpoints for per-ticker upstream fan-out
+snapshot_pool = ThreadPoolExecutor(max_workers=config.SNAPSHOT_WORKERS,
+                                   thread_name_prefix="snapshot")
+# Meta lookups of /api/predict(/batch): kept off snapshot_pool, whose threads
+# may all be held by slow dashboard quotes
+meta_pool     = ThreadPoolExecutor(max_workers=config.META_LOOKUP_WORKERS,
+                                   thread_name_prefix="meta")
+
+# Curated dashboard lists
+TRENDING = [
+    "RELIANCE.NS", "TCS.NS", "INFY.NS", "HDFCBANK.NS",
+    "ICICIBANK.NS", "WIPRO.NS", "SBIN.NS", "AXISBANK.NS"
+]
+TOP = [
+    "BAJFINANCE.NS", "ASIANPAINT.NS", "MARUTI.NS", "TITAN.NS",
+    "HINDUNILVR.NS", "LTIM.NS", "NESTLEIND.NS", "ADANIENT.NS"
+]
+
+# Latest published dashboard snapshot per label. Refresh jobs replace an
+# entry with one assignment, so readers always get a complete payload.
+snapshots = {}
+
+
+def _fresh_snapshots(saved: dict, max_age: float) -> dict:
+    """Saved dashboard snapshots generated less than `max_age` seconds ago."""
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=max_age)
+    fresh  = {}
+    for label, snap in saved.items():
+        try:
+            if datetime.fromisoformat(snap["generated_at"]) >= cutoff:
+                fresh[label] = snap
+        except (KeyError, TypeError, ValueError):
+            pass
+    return fresh
+
+
+# Warm start: reload the hot state saved by the previous process (cache
+# entries still within their TTL, dashboard snapshots younger than
+# WARM_START_SNAPSHOT_MAX_AGE) before serving
+warm_start = CacheSnapshot(config.WARM_START_PATH) if config.WARM_START_ENABLED else None
+if warm_start is not None:
+    snapshots.update(_fresh_snapshots(warm_start.load(stock_cache).get("snapshots", {}),
+                                      config.WARM_START_SNAPSHOT_MAX_AGE))
+
+market_hours = MarketHours(config.MARKET_TIMEZONE, config.MARKET_OPEN,
+                           config.MARKET_CLOSE, config.MARKET_HOLIDAYS)
+scheduler    = RefreshScheduler(market_hours, workers=config.SCHEDULER_WORKERS)
+
+# Live updates for /api/stream: one shared poll loop per subscribed ticker.
+# A replay feed ignores the exchange clock (it has no session to follow).
+_replay    = config.STREAM_FEED == "replay"
+stream_hub = StreamHub(
+    ReplayFeed(lambda t: market_data.history(t, "5y"), warmup=config.STREAM_REPLAY_WARMUP)
+    if _replay else StockFeed(stock_svc),
+    poll_interval=config.STREAM_POLL_SECONDS,
+    closed_interval=config.STREAM_CLOSED_POLL_SECONDS,
+    linger=config.STREAM_LINGER_SECONDS,
+    market=None if _replay else market_hours,
+)
+# Worker threads the Flask /api/stream route may hold at once
+_stream_slots = threading.BoundedSemaphore(config.STREAM_MAX_CONNECTIONS)
+
+# Scrape-time gauges/counters for state the services already track
+@REGISTRY.collector
+def _service_metrics() -> list:
+    stats   = stock_svc.cache_stats()
+    counted = ("hits", "misses", "coalesced", "evictions", "expirations", "load_errors")
+    return [
+        *((f"stock_cache_{k}_total", "counter", f"StockService cache {k}.",
+           {(): stats[k]}) for k in counted if k in stats),
+        *((f"stock_cache_{k}", "gauge", f"StockService cache {k}.",
+           {(): stats[k]}) for k in ("hit_ratio", "entries", "bytes") if k in stats),
+        *((f"stock_shared_cache_{k}_total", "counter", f"Shared cache tier {k}.",
+           {(): v}) for k, v in stats.get("shared", {}).items() if k != "hit_ratio"),
+        *((f"meta_store_{k}", "gauge", f"MetaStore {k.replace('_', ' ')}.",
+           {(): v}) for k, v in stats.get("meta_store", {}).items()),
+        ("stream_subscribers", "gauge", "Open /api/stream subscriptions per ticker.",
+         {(("ticker", t),): n for t, n in stream_hub.status().items()}),
+    ]
+
+
+# ─── Request metrics ──────────────────────────────────────────────────────────
+
+@app.before_request
+def _start_request_timer():
+    g.request_started = time.perf_counter()
+
+
+@app.after_request
+def _record_request_metrics(response):
+    """Latency / size histograms and a Server-Timing header for every response."""
+    elapsed  = time.perf_counter() - g.request_started
+    endpoint = request.endpoint or "unknown"
+    REQUEST_SECONDS.observe(elapsed, endpoint=endpoint, status=response.status_code)
+    if not response.is_streamed:
+        RESPONSE_BYTES.observe(response.calculate_content_length() or 0, endpoint=endpoint)
+
+    timer  = g.get("timer")
+    stages = f"{timer.header()}, " if timer is not None and timer.stages else ""
+    response.headers["Server-Timing"] = f"{stages}total;dur={elapsed * 1000:.1f}"
+    return response
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -52,11 +215,38 @@ prediction_svc = PredictionService()
 @app.route("/api/health", methods=["GET"])
 def health_check():
     """Liveness probe — used by deployment orchestration."""
-    return jsonify({"status": "ok", "version": "2.0.0"}), 200
+    return jsonify({"status": "ok", "version": "2.0.0",
+                    "predictor_params": prediction_svc.params_version}), 200
+
+
+@app.route("/api/cache/stats", methods=["GET"])
+def cache_stats():
+    """Hit / miss / eviction counters of the StockService cache (for sizing)."""
+    return success_response({"stock_service": stock_svc.cache_stats()})
+
+
+@app.route("/api/scheduler/status", methods=["GET"])
+def scheduler_status():
+    """Next / last run, duration and last error of each background refresh job."""
+    return success_response({"jobs": scheduler.status()})
+
+
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    """Prometheus exposition: per-stage latency, upstream calls, cache, sizes."""
+    return Response(REGISTRY.render(), content_type=METRICS_CONTENT_TYPE)
 
 
 # ─── /api/predict ──────────────────────────────────────────────────────────────
 
+# Payload fields a `fields=` projection can name ('ticker' is always kept)
+PREDICT_PROJECTABLE_FIELDS = {
+    "meta", "current", "predicted", "trend", "confidence", "change_pct",
+    "indicators", "chart", "signals",
+    *(f"chart.{c}" for c in ("open", "high", "low", "close", "volume")),
+}
+
+
 @app.route("/api/predict", methods=["GET"])
 def predict():
     """
@@ -65,65 +255,221 @@ def predict():
     Query params:
         ticker (str)  : Stock symbol, e.g. RELIANCE.NS
         period (str)  : Historical window — '1mo' | '3mo' | '6mo' | '1y' (default: '3mo')
+        indicators (str, optional) : Comma-separated subset of indicator
+                        fields / groups, e.g. 'rsi14,macd' (default: all)
+        format (str, optional) : 'json' (default) or 'msgpack' — the chart
+                        columns then arrive as typed arrays (utils/serializer.py)
+        points (int, optional) : Downsample the chart (and the overlay series
+                        with it) to this many bars with LTTB (default: every bar)
+        fields (str, optional) : Comma-separated payload fields to return,
+                        e.g. 'predicted,trend,chart.close' — 'chart.<column>'
+                        keeps one chart column plus labels (default: all)
 
     Returns:
         JSON with current price, predicted price, trend, confidence,
         technical indicators, and OHLCV history for charting.
+        Carries ETag / Last-Modified / Cache-Control; a matching
+        If-None-Match (or If-Modified-Since) gets an empty 304 instead.
     """
-    ticker = request.args.get("ticker", "").upper().strip()
-    period = request.args.get("period", "3mo").strip()
-
-    # ── Input validation ──────────────────────────────────────────────────────
-    ticker_err = validate_ticker(ticker)
-    if ticker_err:
-        return error_response(ticker_err, 400)
-
-    period_err = validate_period(period)
-    if period_err:
-        return error_response(period_err, 400)
+    opts, arg_err = _parse_predict_args(request.args)
+    ticker, period = opts["ticker"], opts["period"]
+    if arg_err:
+        return error_response(arg_err, 400)
 
     try:
         logger.info(f"[predict] ticker={ticker}, period={period}")
 
-        # Step 1 — Fetch raw OHLCV data from Yahoo Finance
-        raw_data = stock_svc.fetch_history(ticker, period)
+        # Step 1 — Fetch raw OHLCV data from Yahoo Finance; meta (company
+        # name, sector, market cap) is independent and downloads alongside
+        timer = g.timer = StageTimer("predict")
+        meta_future = (meta_pool.submit(timer.timed, "fetch_meta",
+                                        stock_svc.fetch_meta, ticker)
+                       if _wants(opts, "meta") else None)
+        with timer.stage("fetch_history"):
+            raw_data = stock_svc.fetch_history(ticker, period)
         if raw_data is None or raw_data.empty:
             return error_response(f"No data found for ticker '{ticker}'. "
                                   "Ensure suffix (.NS/.BO) is correct.", 404)
 
-        # Step 2 — Compute technical indicators
-        indicators = indicator_svc.compute_all(raw_data)
+        # Revalidation: answered from the inputs alone, before any
+        # indicator, prediction or serialisation work
+        meta = (_meta_result(meta_future, ticker,
+                             time.monotonic() + config.META_LOOKUP_TIMEOUT)
+                if meta_future is not None else None)
+        etag, last_modified, max_age = _predict_validators(raw_data, meta, opts)
+        headers = cache_headers(etag, last_modified, max_age)
+        if is_not_modified(request.headers, etag, last_modified):
+            return "", 304, headers
+
+        payload = _predict_payload(raw_data, meta, opts, timer)
+        with timer.stage("encode"):
+            response, status = success_response(payload, fmt=opts["format"])
+        return response, status, headers
 
-        # Step 3 — Run prediction engine
-        prediction = prediction_svc.predict(raw_data, indicators)
+    except Exception as exc:
+        logger.error(f"[predict] Unhandled exception for {ticker}: {exc}\n"
+                     + traceback.format_exc())
+        return error_response("Internal server error. Please try again.", 500)
 
-        # Step 4 — Fetch meta (company name, sector, market cap)
-        meta = stock_svc.fetch_meta(ticker)
 
-        # Step 5 — Serialize OHLCV for frontend chart
-        chart_data = stock_svc.serialize_ohlcv(raw_data)
+# ─── /api/predict/batch ────────────────────────────────────────────────────────
 
-        payload = {
-            "ticker"    : ticker,
-            "meta"      : meta,
-            "current"   : round(float(raw_data["Close"].iloc[-1]), 2),
-            "predicted" : prediction["predicted_price"],
-            "trend"     : prediction["trend"],
-            "confidence": prediction["confidence"],
-            "change_pct": prediction["change_pct"],
-            "indicators": indicators,
-            "chart"     : chart_data,
-            "signals"   : prediction["signals"],
-        }
+# Payload fields a batch caller may leave out with "exclude"
+BATCH_OPTIONAL_FIELDS = ("meta", "indicators", "chart", "signals")
+
+
+@app.route("/api/predict/batch", methods=["POST"])
+def predict_batch():
+    """
+    /api/predict for a list of tickers in one request.
+
+    Histories are downloaded with one batched call, indicators are computed
+    cross-sectionally and predictions are vectorised (PredictionService.
+    predict_many), so a watchlist shares its upstream I/O.
+
+    JSON body:
+        tickers (list)  : Stock symbols (max PREDICT_BATCH_MAX_TICKERS)
+        period (str)    : Historical window, as /api/predict (default: '3mo')
+        indicators (str | list, optional) : Indicator subset, as /api/predict
+        exclude (list, optional) : Payload fields to omit — any of
+                          'meta', 'indicators', 'chart', 'signals'
 
-        return success_response(payload)
+    Returns:
+        {"predictions": [per-ticker /api/predict payload, in request order],
+         "errors": {ticker: message}} — one bad ticker does not fail the batch.
+    """
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict):
+        return error_response("Request body must be a JSON object.", 400)
+
+    tickers = body.get("tickers")
+    if isinstance(tickers, list) and all(isinstance(t, str) for t in tickers):
+        tickers = list(dict.fromkeys(t.upper().strip() for t in tickers))
+    tickers_err = validate_tickers(tickers, config.PREDICT_BATCH_MAX_TICKERS)
+    if tickers_err:
+        return error_response(tickers_err, 400)
+
+    period = str(body.get("period", "3mo")).strip()
+    period_err = validate_period(period)
+    if period_err:
+        return error_response(period_err, 400)
+
+    fields = None
+    if body.get("indicators") is not None:
+        names = body["indicators"]
+        if isinstance(names, str):
+            names = names.split(",")
+        if not isinstance(names, list):
+            return error_response(
+                "Field 'indicators' must be a comma-separated string or a list of names.", 400)
+        names = [str(n).strip().lower() for n in names if str(n).strip()]
+        ind_err = validate_indicators(names, indicator_svc.selectable_fields())
+        if ind_err:
+            return error_response(ind_err, 400)
+        fields = indicator_svc.expand_fields(names)
+
+    exclude = body.get("exclude") or []
+    if not isinstance(exclude, list):
+        exclude = [exclude]
+    unknown = [f for f in exclude if f not in BATCH_OPTIONAL_FIELDS]
+    if unknown:
+        return error_response(
+            f"Invalid 'exclude' value(s): {', '.join(map(str, unknown))}. "
+            f"Accepted values: {', '.join(BATCH_OPTIONAL_FIELDS)}.", 400)
+    exclude = set(exclude)
+
+    try:
+        logger.info(f"[predict/batch] tickers={len(tickers)}, period={period}")
+
+        # Meta lookups run on the pool while the histories download
+        metas = {} if "meta" in exclude else {
+            t: meta_pool.submit(stock_svc.fetch_meta, t) for t in tickers}
+
+        frames = stock_svc.fetch_history_many(tickers, period)
+        payloads, errors = _batch_predictions(frames, fields, exclude)
+
+        deadline = time.monotonic() + config.META_LOOKUP_TIMEOUT
+        for t, fut in metas.items():
+            if t in payloads:
+                payloads[t]["meta"] = _meta_result(fut, t, deadline)
+
+        for t in tickers:
+            if t not in payloads and t not in errors:
+                errors[t] = (f"No data found for ticker '{t}'. "
+                             "Ensure suffix (.NS/.BO) is correct.")
+
+        return success_response({
+            "predictions": [payloads[t] for t in tickers if t in payloads],
+            "errors"     : errors,
+        })
 
     except Exception as exc:
-        logger.error(f"[predict] Unhandled exception for {ticker}: {exc}\n"
+        logger.error(f"[predict/batch] Unhandled exception: {exc}\n"
                      + traceback.format_exc())
         return error_response("Internal server error. Please try again.", 500)
 
 
+# ─── /api/screener ─────────────────────────────────────────────────────────────
+
+@app.route("/api/screener", methods=["GET"])
+def screener():
+    """
+    Filter and sort the screener universe on its latest indicator and
+    prediction values (served from the in-memory index, no upstream calls).
+
+    Query params:
+        filter (str, optional) : Comma-separated conditions, all must hold,
+                                 e.g. 'rsi14<30,price>sma50,trend=BULLISH'
+        sort (str, optional)   : Field to sort by, '-' prefix for descending
+        limit (int)            : Max rows (default: 50)
+        fields (str, optional) : Comma-separated fields per row (default: all)
+
+    Returns:
+        JSON with matching rows, match count, universe size and the
+        index's generated_at timestamp.
+    """
+    started = time.perf_counter()
+    index   = screener_svc.index
+    if index is None and not (_background_started and config.SCHEDULER_ENABLED
+                              and config.SCREENER_ENABLED):
+        index = screener_svc.refresh()     # no background job: build on demand
+    if index is None:
+        return error_response("Screener index is still being built. Try again shortly.", 503)
+
+    valid_fields = set(ScreenerIndex.NUMERIC_FIELDS) | {"trend"}
+    try:
+        filters = parse_filters(request.args.get("filter", ""))
+    except ValueError as e:
+        return error_response(str(e), 400)
+
+    sort = request.args.get("sort", "").strip().lower() or None
+    if sort and sort.lstrip("-") not in set(ScreenerIndex.NUMERIC_FIELDS):
+        return error_response(f"Invalid sort field '{sort.lstrip('-')}'.", 400)
+
+    fields = None
+    if "fields" in request.args:
+        fields = [f.strip().lower() for f in request.args["fields"].split(",") if f.strip()]
+        unknown = [f for f in fields if f not in valid_fields]
+        if unknown:
+            return error_response(f"Unknown field(s): {', '.join(unknown)}.", 400)
+
+    try:
+        limit = int(request.args.get("limit", 50))
+    except ValueError:
+        return error_response("Parameter 'limit' must be an integer.", 400)
+    if not 1 <= limit <= config.SCREENER_MAX_LIMIT:
+        return error_response(f"Parameter 'limit' must be between 1 and "
+                              f"{config.SCREENER_MAX_LIMIT}.", 400)
+
+    result = index.query(filters, sort=sort, limit=limit, fields=fields)
+    return success_response({
+        **result,
+        "universe"    : len(index),
+        "generated_at": index.generated_at,
+        "took_ms"     : round((time.perf_counter() - started) * 1000, 3),
+    })
+
+
 # ─── /api/stocks/trending ──────────────────────────────────────────────────────
 
 @app.route("/api/stocks/trending", methods=["GET"])
@@ -132,11 +478,7 @@ def trending_stocks():
     Returns snapshot data for a curated list of high-volume Indian stocks.
     Used to populate the "Trending Stocks" dashboard section.
     """
-    TRENDING = [
-        "RELIANCE.NS", "TCS.NS", "INFY.NS", "HDFCBANK.NS",
-        "ICICIBANK.NS", "WIPRO.NS", "SBIN.NS", "AXISBANK.NS"
-    ]
-    return _bulk_snapshot(TRENDING, "trending")
+    return _serve_snapshot("trending", TRENDING)
 
 
 # ─── /api/stocks/top ──────────────────────────────────────────────────────────
@@ -147,11 +489,7 @@ def top_stocks():
     Returns snapshot data for stocks identified as top performers
     based on recent 30-day returns.
     """
-    TOP = [
-        "BAJFINANCE.NS", "ASIANPAINT.NS", "MARUTI.NS", "TITAN.NS",
-        "HINDUNILVR.NS", "LTIM.NS", "NESTLEIND.NS", "ADANIENT.NS"
-    ]
-    return _bulk_snapshot(TOP, "top")
+    return _serve_snapshot("top", TOP)
 
 
 # ─── /api/stocks/search ───────────────────────────────────────────────────────
@@ -177,25 +515,482 @@ def search_stock():
         return error_response("Could not fetch quote.", 500)
 
 
+# ─── /api/stream ───────────────────────────────────────────────────────────────
+
+@app.route("/api/stream", methods=["GET"])
+def stream():
+    """
+    Server-Sent Events: a 'quote' event per ticker whenever its latest bar
+    changes — price, change_pct and the incrementally updated indicator
+    scalars. The current state of every ticker is sent on connect.
+
+    Query params:
+        tickers (str) : Comma-separated symbols (max STREAM_MAX_TICKERS)
+
+    Each connection holds a worker thread, so at most STREAM_MAX_CONNECTIONS
+    are open per process (503 beyond). Serve it from a threaded server
+    (gunicorn -k gthread; a sync worker is killed by --timeout mid-stream)
+    or through asgi.py, which streams without a thread per client.
+    """
+    tickers, tickers_err = _parse_stream_tickers(request.args)
+    if tickers_err:
+        return error_response(tickers_err, 400)
+    if not _stream_slots.acquire(blocking=False):
+        response, status = error_response(
+            "Too many live streams open on this server. Try again later.", 503)
+        response.headers["Retry-After"] = str(int(config.STREAM_HEARTBEAT_SECONDS))
+        return response, status
+
+    def generate():
+        events = queue.Queue(maxsize=config.STREAM_QUEUE_SIZE)
+        token  = stream_hub.subscribe(tickers, events.put_nowait)
+        try:
+            yield b"retry: 5000\n\n"
+            while True:
+                try:
+                    yield events.get(timeout=config.STREAM_HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    yield SSE_HEARTBEAT
+        finally:
+            stream_hub.unsubscribe(token)
+
+    response = Response(generate(), mimetype="text/event-stream",
+                        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+    response.call_on_close(_stream_slots.release)      # also if never iterated
+    return response
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 #  PRIVATE HELPERS
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def _bulk_snapshot(tickers: list, label: str):
+def _parse_stream_tickers(args) -> tuple:
+    """Validate /api/stream's `tickers` param → (ticker list, error or None)."""
+    tickers = list(dict.fromkeys(t.strip().upper()
+                                 for t in args.get("tickers", "").split(",") if t.strip()))
+    return tickers, validate_tickers(tickers, config.STREAM_MAX_TICKERS)
+
+
+def _parse_predict_args(args) -> tuple:
+    """
+    Validate /api/predict query params (a mapping with .get / `in`).
+
+    Returns:
+        (options, error message or None) — options holds ticker, period,
+        indicators (expanded field list or None), format, points (int or
+        None) and fields (payload projection set or None).
+    """
+    opts = {
+        "ticker"    : args.get("ticker", "").upper().strip(),
+        "period"    : args.get("period", "3mo").strip(),
+        "format"    : args.get("format", "json").lower().strip(),
+        "indicators": None,
+        "points"    : None,
+        "fields"    : None,
+    }
+
+    # ── Input validation ──────────────────────────────────────────────────────
+    ticker_err = validate_ticker(opts["ticker"])
+    if ticker_err:
+        return opts, ticker_err
+
+    period_err = validate_period(opts["period"])
+    if period_err:
+        return opts, period_err
+
+    format_err = validate_format(opts["format"], RESPONSE_FORMATS)
+    if format_err:
+        return opts, format_err
+
+    if "indicators" in args:
+        names = [n.strip().lower() for n in args["indicators"].split(",") if n.strip()]
+        ind_err = validate_indicators(names, indicator_svc.selectable_fields())
+        if ind_err:
+            return opts, ind_err
+        opts["indicators"] = indicator_svc.expand_fields(names)
+
+    if "points" in args:
+        points_err = validate_points(args["points"].strip())
+        if points_err:
+            return opts, points_err
+        opts["points"] = int(args["points"])
+
+    if "fields" in args:
+        names = [n.strip().lower() for n in args["fields"].split(",") if n.strip()]
+        fields_err = validate_fields(names, PREDICT_PROJECTABLE_FIELDS)
+        if fields_err:
+            return opts, fields_err
+        opts["fields"] = set(names)
+
+    return opts, None
+
+
+def _wants(opts: dict, field: str) -> bool:
+    """Whether the `fields=` projection in `opts` keeps payload field `field`."""
+    fields = opts["fields"]
+    return fields is None or field in fields or any(
+        f.startswith(field + ".") for f in fields)
+
+
+def _meta_result(future, ticker: str, deadline: float) -> dict:
+    """
+    A fetch_meta future's result, waiting until `deadline` (monotonic) at
+    most; placeholder meta after that (the lookup still fills the cache).
+    """
+    try:
+        return future.result(timeout=max(deadline - time.monotonic(), 0))
+    except FutureTimeout:
+        logger.warning(f"fetch_meta for {ticker} exceeded {config.META_LOOKUP_TIMEOUT}s; "
+                       "serving placeholder meta")
+        return stock_svc.fallback_meta(ticker)
+
+
+def _predict_validators(raw_data, meta: dict | None, opts: dict) -> tuple:
+    """
+    HTTP cache validators for an /api/predict response → (etag, last_modified, max_age).
+
+    The payload is a pure function of the history, meta, request options and
+    predictor params. Of the history only the last bar can change between
+    downloads (new bar, or today's bar moving intraday), so it stands in for
+    the whole frame. While the session is open the last bar is live:
+    Last-Modified is now and the lifetime is short. Once closed the data is
+    final until the next open; Last-Modified is the close of the last bar's
+    session.
+    """
+    last_ts = raw_data.index[-1]
+    etag    = make_etag(
+        sorted((k, sorted(v) if isinstance(v, set) else v) for k, v in opts.items()),
+        prediction_svc.params_version,
+        len(raw_data), str(raw_data.index[0]), str(last_ts),
+        raw_data.iloc[-1][["Open", "High", "Low", "Close", "Volume"]].tolist(),
+        sorted(meta.items()) if meta is not None else None,
+    )
+
+    now = datetime.now(timezone.utc)
+    if market_hours.is_open(now):
+        return etag, now, config.HTTP_CACHE_MAX_AGE_OPEN
+
+    _, bar_close  = market_hours.session(last_ts.date())
+    until_open    = (market_hours.next_open(now) - now).total_seconds()
+    return etag, min(bar_close, now), min(until_open, config.HTTP_CACHE_MAX_AGE_CLOSED)
+
+
+def _predict_payload(raw_data, meta: dict | None, opts: dict,
+                     timer: StageTimer | None = None) -> dict:
+    """
+    CPU part of /api/predict: indicators, prediction and chart for one history.
+
+    Only the fields kept by opts["fields"] are built. With opts["points"]
+    the chart and the overlay series are downsampled to the same LTTB
+    selection of bars; format 'msgpack' keeps the chart columns as NumPy
+    arrays. Each step is timed into `timer`.
+    """
+    timer = timer or StageTimer("predict")
+
+    rows = None
+    if opts["points"] is not None and len(raw_data) > opts["points"]:
+        with timer.stage("downsample"):
+            rows = lttb_indices(raw_data["Close"].to_numpy(dtype=np.float64), opts["points"])
+
+    # Step 2 — Compute technical indicators (shared graph: the prediction
+    # inputs and the requested fields reuse the same intermediates)
+    with timer.stage("compute_all"):
+        graph      = indicator_svc.evaluate(raw_data)
+        inputs     = graph.to_dict(prediction_svc.REQUIRED_INDICATORS, series=False)
+        obv_trend  = graph.value("obv_trend")
+        indicators = (graph.to_dict(opts["indicators"], rows=rows)
+                      if _wants(opts, "indicators") else None)
+
+    # Step 3 — Run prediction engine
+    with timer.stage("predict"):
+        prediction = prediction_svc.predict(raw_data, inputs, obv_trend=obv_trend)
+
+    payload = {
+        "ticker"    : opts["ticker"],
+        "meta"      : meta,
+        "current"   : round(float(raw_data["Close"].iloc[-1]), 2),
+        "predicted" : prediction["predicted_price"],
+        "trend"     : prediction["trend"],
+        "confidence": prediction["confidence"],
+        "change_pct": prediction["change_pct"],
+        "signals"   : prediction["signals"],
+    }
+    if indicators is not None:
+        payload["indicators"] = indicators
+
+    # Step 4 — Serialize OHLCV for frontend chart
+    if _wants(opts, "chart"):
+        with timer.stage("serialize_ohlcv"):
+            bars  = raw_data if rows is None else raw_data.iloc[rows]
+            chart = stock_svc.serialize_ohlcv(bars, typed=opts["format"] == "msgpack")
+        if opts["fields"] is not None and "chart" not in opts["fields"]:
+            chart = {k: v for k, v in chart.items()
+                     if k == "labels" or f"chart.{k}" in opts["fields"]}
+        payload["chart"] = chart
+
+    if opts["fields"] is not None:
+        payload = {k: v for k, v in payload.items() if k == "ticker" or _wants(opts, k)}
+    return payload
+
+
+def _batch_predictions(frames: dict, fields: list | None, exclude: set):
+    """
+    Build /api/predict payloads (without meta) for many histories at once.
+
+    Tickers sharing the union date index are computed in one
+    compute_universe() + predict_many() pass. A ticker with holes in that
+    index (other exchange holidays, a stale last bar) would get forward-
+    filled bars there, so it goes through the single-ticker graph instead
+    and its numbers always equal /api/predict's.
+
+    Returns:
+        ({ticker: payload}, {ticker: error message})
+    """
+    payloads, errors = {}, {}
+    frames = {t: df for t, df in frames.items() if df is not None and not df.empty}
+    if not frames:
+        return payloads, errors
+
+    want_signals = "signals" not in exclude
+    want_series  = "indicators" not in exclude
+
+    _, tickers, close, high, low, volume = indicator_svc.align_frames(frames)
+    contiguous = indicator_svc.contiguous_columns(close)
+
+    aligned  = [t for t, ok in zip(tickers, contiguous) if ok]
+    cols     = [j for j, ok in enumerate(contiguous) if ok]
+    results  = {}
+    if aligned:
+        universe = indicator_svc.compute_universe(
+            close[:, cols], high[:, cols], low[:, cols], volume[:, cols],
+            aligned, include_series=want_series, include_obv_trend=True)
+        preds = prediction_svc.predict_many(
+            np.array([float(frames[t]["Close"].iloc[-1]) for t in aligned]),
+            prediction_svc.stack_indicators([universe[t] for t in aligned]),
+            np.array([universe[t].pop("obv_trend") for t in aligned]),
+            details=want_signals,
+        )
+        for i, t in enumerate(aligned):
+            results[t] = (universe[t], {
+                "predicted_price": float(preds["predicted_price"][i]),
+                "trend"          : str(preds["trend"][i]),
+                "confidence"     : float(preds["confidence"][i]),
+                "change_pct"     : float(preds["change_pct"][i]),
+                "signals"        : preds["signals"][i] if want_signals else None,
+            })
+
+    for t in tickers:
+        if t in results:
+            continue
+        try:
+            graph = indicator_svc.evaluate(frames[t])
+            results[t] = (graph.to_dict(series=want_series), prediction_svc.predict(
+                frames[t],
+                graph.to_dict(prediction_svc.REQUIRED_INDICATORS, series=False),
+                obv_trend=graph.value("obv_trend"),
+            ))
+        except Exception as e:
+            logger.warning(f"[predict/batch] Skipping {t}: {e}")
+            errors[t] = "Prediction failed for this ticker."
+
+    for t, (indicators, prediction) in results.items():
+        df = frames[t]
+        payload = {
+            "ticker"    : t,
+            "current"   : round(float(df["Close"].iloc[-1]), 2),
+            "predicted" : prediction["predicted_price"],
+            "trend"     : prediction["trend"],
+            "confidence": prediction["confidence"],
+            "change_pct": prediction["change_pct"],
+        }
+        if "indicators" not in exclude:
+            payload["indicators"] = _select_indicators(indicators, fields)
+        if "chart" not in exclude:
+            payload["chart"] = stock_svc.serialize_ohlcv(df)
+        if want_signals:
+            payload["signals"] = prediction["signals"]
+        payloads[t] = payload
+
+    return payloads, errors
+
+
+def _select_indicators(indicators: dict, fields: list | None) -> dict:
+    """Project a compute_all()-schema dict onto `fields` (None = all)."""
+    if fields is None:
+        return indicators
+    out = {f: indicators[f] for f in fields}
+    if "series" in indicators:
+        out["series"] = {k: v for k, v in indicators["series"].items() if k in fields}
+    return out
+
+
+def _serve_snapshot(label: str, tickers: list):
+    """
+    Serve the published snapshot for `label` from memory. Before the first
+    background refresh has landed (or with the scheduler off), build it
+    inline and publish it.
+    """
+    snap = snapshots.get(label)
+    if snap is None:
+        snap = _refresh_snapshot(label, tickers)
+    return success_response(snap)
+
+
+def _refresh_snapshot(label: str, tickers: list) -> dict:
+    """
+    Rebuild and publish one dashboard snapshot. An empty rebuild (upstream
+    down) keeps the previous snapshot, which still carries its own
+    generated_at.
+    """
+    snap = _bulk_snapshot(tickers, label)
+    snap["generated_at"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    if snap["stocks"] or label not in snapshots:
+        snapshots[label] = snap
+    else:
+        logger.warning(f"[{label}] refresh returned no stocks; keeping previous snapshot")
+    return snapshots[label]
+
+
+def _bulk_snapshot(tickers: list, label: str) -> dict:
     """
     Fetch lightweight snapshot (price, change, sparkline) for multiple tickers.
     Failures on individual tickers are swallowed so the list still loads.
+
+    Histories come from one StockService.fetch_history_many call, waited on
+    for at most SNAPSHOT_BATCH_TIMEOUT; the per-ticker remainder runs
+    concurrently on `snapshot_pool`. Each ticker gets at most
+    SNAPSHOT_TICKER_TIMEOUT seconds from submission, capped by the overall
+    SNAPSHOT_DEADLINE; tickers that miss are reported under "pending" (their
+    fetch keeps running and lands in the cache for the next request).
     """
-    results = []
-    for t in tickers:
+    started  = time.monotonic()
+    deadline = started + config.SNAPSHOT_DEADLINE
+
+    # One batched history download for the whole list; on failure or timeout
+    # each quick_quote falls back to its own per-ticker history call. The
+    # batch gets only part of the deadline so that fallback has time to run.
+    histories = {}
+    batch = snapshot_pool.submit(stock_svc.fetch_history_many, tickers, "1mo")
+    try:
+        histories = batch.result(timeout=min(config.SNAPSHOT_BATCH_TIMEOUT,
+                                             config.SNAPSHOT_DEADLINE))
+    except FutureTimeout:
+        logger.warning(f"[{label}] batch history download missed the deadline")
+    except Exception as e:
+        logger.warning(f"[{label}] batch history download failed: {e}")
+
+    submitted = time.monotonic()
+    futures   = [(t, snapshot_pool.submit(stock_svc.quick_quote, t, histories.get(t)))
+                 for t in tickers]
+
+    results, pending = [], []
+    for t, fut in futures:
+        now    = time.monotonic()
+        budget = min(submitted + config.SNAPSHOT_TICKER_TIMEOUT, deadline) - now
         try:
-            snap = stock_svc.quick_quote(t)
+            snap = fut.result(timeout=max(budget, 0))
             if snap:
                 results.append(snap)
+        except FutureTimeout:
+            pending.append(t)              # left running: it warms the cache
+            logger.warning(f"[{label}] {t} missed the snapshot deadline")
         except Exception as e:
             logger.warning(f"[{label}] Skipping {t}: {e}")
 
-    return success_response({"stocks": results, "category": label})
+    return {
+        "stocks"  : results,
+        "category": label,
+        "partial" : bool(pending),
+        "pending" : pending,
+    }
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#  BACKGROUND REFRESH
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _prewarm(tickers: list, periods: list):
+    """
+    Fill the cache for `tickers` after a (re)start, off the request path, so
+    the first requests cost what they do in steady state. The dashboards are
+    left to the scheduler's immediate first run when it is enabled.
+    """
+    started = time.monotonic()
+    for period in periods:
+        try:
+            stock_svc.fetch_history_many(tickers, period)
+        except Exception as e:
+            logger.warning(f"Prewarm of {period} history failed: {e}")
+    list(snapshot_pool.map(stock_svc.fetch_meta, tickers))
+    if not config.SCHEDULER_ENABLED:
+        _refresh_snapshot("trending", TRENDING)
+        _refresh_snapshot("top", TOP)
+    logger.info(f"Prewarmed {len(tickers)} tickers ({', '.join(periods)}) "
+                f"in {time.monotonic() - started:.2f}s")
+
+
+def _save_warm_start():
+    """Snapshot the hot state for the next boot (timer job and at exit)."""
+    try:
+        warm_start.save(stock_cache, {"snapshots": dict(snapshots)})
+    except Exception as e:
+        logger.warning(f"Warm-start snapshot failed: {e}")
+
+
+# One process per host owns the jobs that maintain host-wide files; the
+# others only publish their own in-process state (see SCHEDULER_LOCK_PATH)
+host_runner = False
+
+_background_started = False
+_background_guard   = threading.Lock()
+
+
+def start_background():
+    """
+    Start this process's background work: host election, prewarm, the
+    warm-start save and the refresh scheduler.
+
+    Called by the serving entry points (gunicorn.conf.py after each fork,
+    asgi.py at lifespan startup, `python app.py` in the reloader's child),
+    never on import, so scripts and tests that import app stay passive.
+    Runs once per process; later calls do nothing.
+    """
+    global host_runner, _background_started
+    with _background_guard:
+        if _background_started:
+            return
+        _background_started = True
+
+    host_runner = HostLock(config.SCHEDULER_LOCK_PATH).acquire()
+
+    if warm_start is not None:
+        # Every worker prewarms its own cache (reusing the shared tier's
+        # entries when it is enabled); only the host runner saves
+        threading.Thread(target=_prewarm, name="prewarm", daemon=True,
+                         args=(config.WARM_START_TICKERS or TRENDING + TOP,
+                               config.WARM_START_PERIODS)).start()
+        if host_runner:
+            atexit.register(_save_warm_start)
+
+    if not config.SCHEDULER_ENABLED:
+        return
+    scheduler.add("trending", lambda: _refresh_snapshot("trending", TRENDING),
+                  interval=config.SNAPSHOT_REFRESH_SECONDS)
+    scheduler.add("top", lambda: _refresh_snapshot("top", TOP),
+                  interval=config.SNAPSHOT_REFRESH_SECONDS)
+    if config.META_STORE_ENABLED:
+        # Other workers only reload the store the runner keeps up to date
+        scheduler.add("meta", lambda: stock_svc.refresh_meta(TRENDING + TOP,
+                                                             fetch=host_runner),
+                      interval=config.META_REFRESH_SECONDS)
+    if warm_start is not None and host_runner:
+        scheduler.add("warm-start", _save_warm_start,
+                      interval=config.WARM_START_SAVE_SECONDS,
+                      closed_interval=config.WARM_START_SAVE_SECONDS, run_now=False)
+    if config.SCREENER_ENABLED:
+        scheduler.add("screener", screener_svc.refresh,
+                      interval=config.SCREENER_REFRESH_SECONDS)
+    scheduler.start()
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -203,6 +998,8 @@ def _bulk_snapshot(tickers: list, label: str):
 # ═══════════════════════════════════════════════════════════════════════════════
 
 if __name__ == "__main__":
-    import os
     os.makedirs("logs", exist_ok=True)
+    # The reloader's parent only watches files; its child serves
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        start_background()
     app.run(debug=True, host="0.0.0.0", port=5000)
\ No newline at end of file
@@ -0,0 +1,325 @@
+"""
+==============================================================================
+AI-Based Stock Market Analyzer — ASGI (async) Entry Point
+==============================================================================
+Description : Async serving mode. /api/predict runs natively on the event
+              loop: the history and meta downloads are awaited together and
+              the CPU work runs on a small thread pool, so one process keeps
+              hundreds of predictions in flight while they wait on upstream.
+              /api/stream is served natively too (no thread per client).
+              Every other route is the unchanged Flask app, bridged to ASGI
+              on its own thread pool.
+
+Run:
+    uvicorn asgi:application --host 0.0.0.0 --port 5000 --workers 2
+    gunicorn -k uvicorn.workers.UvicornWorker -w 2 asgi:application
+==============================================================================
+"""
+
+import asyncio
+import io
+import logging
+import sys
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from urllib.parse import parse_qsl
+
+from werkzeug.datastructures import Headers
+
+import config
+from app import (app as flask_app, stock_svc, stream_hub, start_background,
+                 _parse_predict_args, _wants, _parse_stream_tickers,
+                 _predict_validators, _predict_payload)
+from services.stream_service import SSE_HEARTBEAT
+from utils.http_cache import cache_headers, is_not_modified
+from utils.metrics import REQUEST_SECONDS, RESPONSE_BYTES, StageTimer
+from utils.response_builder import success_body, error_body, encode_body
+
+logger = logging.getLogger(__name__)
+
+cpu_pool  = ThreadPoolExecutor(max_workers=config.ASYNC_CPU_THREADS,
+                               thread_name_prefix="asgi-cpu")
+wsgi_pool = ThreadPoolExecutor(max_workers=config.ASGI_WSGI_THREADS,
+                               thread_name_prefix="asgi-wsgi")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#  ASYNC ROUTES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+async def predict(query: dict, headers: Headers, timer: StageTimer) -> tuple:
+    """
+    Async /api/predict — same params, payload, caching and stage timings
+    as app.predict.
+
+    Returns:
+        (status, body or None, format, extra headers)
+    """
+    opts, arg_err = _parse_predict_args(query)
+    ticker, period = opts["ticker"], opts["period"]
+    if arg_err:
+        return 400, error_body(arg_err, 400), "json", {}
+
+    try:
+        logger.info(f"[predict:async] ticker={ticker}, period={period}")
+
+        # History and meta are independent upstream calls: await both at once
+        raw_data, meta = await asyncio.gather(
+            _timed(timer, "fetch_history", stock_svc.afetch_history(ticker, period)),
+            _timed(timer, "fetch_meta", _meta_or_fallback(ticker))
+            if _wants(opts, "meta") else _none(),
+        )
+        if raw_data is None or raw_data.empty:
+            return 404, error_body(f"No data found for ticker '{ticker}'. "
+                                   "Ensure suffix (.NS/.BO) is correct.", 404), "json", {}
+
+        etag, last_modified, max_age = _predict_validators(raw_data, meta, opts)
+        cache = cache_headers(etag, last_modified, max_age)
+        if is_not_modified(headers, etag, last_modified):
+            return 304, None, opts["format"], cache
+
+        payload = await asyncio.get_running_loop().run_in_executor(
+            cpu_pool, _predict_payload, raw_data, meta, opts, timer)
+        return 200, success_body(payload), opts["format"], cache
+
+    except Exception as exc:
+        logger.error(f"[predict:async] Unhandled exception for {ticker}: {exc}\n"
+                     + traceback.format_exc())
+        return 500, error_body("Internal server error. Please try again.", 500), "json", {}
+
+
+async def stream(query: dict, receive, send):
+    """Async /api/stream — same events as app.stream, no thread per client."""
+    tickers, tickers_err = _parse_stream_tickers(query)
+    if tickers_err:
+        await _send_body(send, 400, error_body(tickers_err, 400), "json", {})
+        return
+
+    loop   = asyncio.get_running_loop()
+    events = asyncio.Queue(maxsize=config.STREAM_QUEUE_SIZE)
+
+    def push(frame: bytes):             # called on the hub's poll threads
+        loop.call_soon_threadsafe(_offer, events, frame)
+
+    await send({
+        "type"   : "http.response.start",
+        "status" : 200,
+        "headers": [
+            (b"content-type", b"text/event-stream"),
+            (b"cache-control", b"no-cache"),
+            (b"x-accel-buffering", b"no"),
+            (b"access-control-allow-origin", b"*"),
+        ],
+    })
+    await send({"type": "http.response.body", "body": b"retry: 5000\n\n", "more_body": True})
+
+    token        = stream_hub.subscribe(tickers, push)
+    disconnected = asyncio.ensure_future(_wait_disconnect(receive))
+    try:
+        while True:
+            nxt = asyncio.ensure_future(events.get())
+            done, _ = await asyncio.wait({nxt, disconnected},
+                                         timeout=config.STREAM_HEARTBEAT_SECONDS,
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if disconnected in done:
+                nxt.cancel()
+                return
+            frame = nxt.result() if nxt in done else SSE_HEARTBEAT
+            if nxt not in done:
+                nxt.cancel()
+            await send({"type": "http.response.body", "body": frame, "more_body": True})
+    finally:
+        stream_hub.unsubscribe(token)
+        disconnected.cancel()
+
+
+# Handlers: handler(query, headers, timer) → (status, body, format, headers);
+# the function name is the metrics endpoint label (matches the Flask one)
+ASYNC_ROUTES = {
+    ("GET", "/api/predict"): predict,
+}
+
+# Routes that write their own (streamed) response: handler(query, receive, send)
+STREAM_ROUTES = {
+    ("GET", "/api/stream"): stream,
+}
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#  ASGI APPLICATION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+async def application(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    route   = (scope["method"], scope["path"])
+    handler = ASYNC_ROUTES.get(route)
+    if handler is None and route not in STREAM_ROUTES:
+        await _call_wsgi(scope, receive, send)
+        return
+
+    query = dict(parse_qsl(scope.get("query_string", b"").decode("latin-1"),
+                           keep_blank_values=True))
+    if handler is None:
+        await STREAM_ROUTES[route](query, receive, send)
+        return
+    headers = Headers([(k.decode("latin-1"), v.decode("latin-1"))
+                       for k, v in scope.get("headers", [])])
+    started = time.perf_counter()
+    timer   = StageTimer(handler.__name__)
+    await _send_body(send, *await handler(query, headers, timer),
+                     timer=timer, started=started)
+
+
+# ─── Private helpers ──────────────────────────────────────────────────────────
+
+async def _none():
+    return None
+
+
+def _offer(events: asyncio.Queue, frame: bytes):
+    """Enqueue without blocking; a subscriber that far behind skips the event."""
+    try:
+        events.put_nowait(frame)
+    except asyncio.QueueFull:
+        pass
+
+
+async def _timed(timer: StageTimer, name: str, awaitable):
+    with timer.stage(name):
+        return await awaitable
+
+
+async def _meta_or_fallback(ticker: str) -> dict:
+    """afetch_meta bounded by META_LOOKUP_TIMEOUT, as app._meta_result."""
+    try:
+        return await asyncio.wait_for(stock_svc.afetch_meta(ticker),
+                                      config.META_LOOKUP_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning(f"fetch_meta for {ticker} exceeded {config.META_LOOKUP_TIMEOUT}s; "
+                       "serving placeholder meta")
+        return stock_svc.fallback_meta(ticker)
+
+
+async def _wait_disconnect(receive):
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+
+async def _send_body(send, status: int, body: dict | None, fmt: str, extra: dict,
+                     timer: StageTimer | None = None, started: float | None = None):
+    """
+    Send a JSON / msgpack response encoded like app.py's (plus CORS header).
+    With a timer, also records the request metrics and Server-Timing header
+    app.py's after_request hook adds.
+    """
+    headers = [(b"access-control-allow-origin", b"*")]
+    headers += [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in extra.items()]
+    payload = b""
+    if body is not None:
+        with timer.stage("encode") if timer is not None else nullcontext():
+            payload, mimetype = encode_body(body, fmt)
+        headers.append((b"content-type", mimetype.encode()))
+    headers.append((b"content-length", str(len(payload)).encode()))
+
+    if started is not None:
+        elapsed = time.perf_counter() - started
+        REQUEST_SECONDS.observe(elapsed, endpoint=timer.endpoint, status=status)
+        RESPONSE_BYTES.observe(len(payload), endpoint=timer.endpoint)
+        stages = f"{timer.header()}, " if timer.stages else ""
+        headers.append((b"server-timing",
+                        f"{stages}total;dur={elapsed * 1000:.1f}".encode("latin-1")))
+
+    await send({
+        "type"   : "http.response.start",
+        "status" : status,
+        "headers": headers,
+    })
+    await send({"type": "http.response.body", "body": payload})
+
+
+async def _call_wsgi(scope, receive, send):
+    """Run the Flask app for one request on wsgi_pool and relay its response."""
+    body = bytearray()
+    while True:
+        message = await receive()
+        body.extend(message.get("body", b""))
+        if not message.get("more_body"):
+            break
+
+    environ = _wsgi_environ(scope, bytes(body))
+    result  = {}
+
+    def start_response(status, headers, exc_info=None):
+        result["status"]  = int(status.split(" ", 1)[0])
+        result["headers"] = headers
+
+    def run():
+        response = flask_app(environ, start_response)
+        try:
+            return b"".join(response)
+        finally:
+            if hasattr(response, "close"):
+                response.close()
+
+    content = await asyncio.get_running_loop().run_in_executor(wsgi_pool, run)
+    await send({
+        "type"   : "http.response.start",
+        "status" : result["status"],
+        "headers": [(k.lower().encode("latin-1"), v.encode("latin-1"))
+                    for k, v in result["headers"]],
+    })
+    await send({"type": "http.response.body", "body": content})
+
+
+def _wsgi_environ(scope, body: bytes) -> dict:
+    """Build a PEP 3333 environ from an ASGI HTTP scope."""
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+    environ = {
+        "REQUEST_METHOD"   : scope["method"],
+        "SCRIPT_NAME"      : scope.get("root_path", "").encode("utf-8").decode("latin-1"),
+        "PATH_INFO"        : scope["path"].encode("utf-8").decode("latin-1"),
+        "QUERY_STRING"     : scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME"      : str(server[0]),
+        "SERVER_PORT"      : str(server[1]),
+        "SERVER_PROTOCOL"  : f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR"      : client[0],
+        "wsgi.version"     : (1, 0),
+        "wsgi.url_scheme"  : scope.get("scheme", "http"),
+        "wsgi.input"       : io.BytesIO(body),
+        "wsgi.errors"      : sys.stderr,
+        "wsgi.multithread" : True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once"    : False,
+        "CONTENT_LENGTH"   : str(len(body)),
+    }
+    for name, value in scope.get("headers", []):
+        key = name.decode("latin-1").upper().replace("-", "_")
+        value = value.decode("latin-1")
+        if key == "CONTENT_TYPE":
+            environ["CONTENT_TYPE"] = value
+        elif key != "CONTENT_LENGTH":
+            key = f"HTTP_{key}"
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            start_background()
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            stream_hub.close()
+            cpu_pool.shutdown(wait=False)
+            wsgi_pool.shutdown(wait=False)
+            await send({"type": "lifespan.shutdown.complete"})
+            return
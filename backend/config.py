@@ -0,0 +1,231 @@
+"""
+==============================================================================
+config.py
+==============================================================================
+Responsibility : Central runtime configuration. Every tunable is read from
+                 the environment (or a local .env file) with a sane default,
+                 so deployments never need code edits.
+==============================================================================
+"""
+
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# ─── Paths ────────────────────────────────────────────────────────────────────
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.getenv("DATA_DIR", os.path.join(BASE_DIR, "data"))
+
+# ─── Market data provider (services/market_data.py) ───────────────────────────
+
+# "yfinance" (live), "fixture" (offline CSV/Parquet replay) or "http"
+# (an HTTP market-data service, e.g. scripts/stub_upstream.py for load tests)
+MARKET_DATA_PROVIDER = os.getenv("MARKET_DATA_PROVIDER", "yfinance")
+
+FIXTURE_DIR          = os.getenv("FIXTURE_DIR", os.path.join(DATA_DIR, "fixtures"))
+FIXTURE_LATENCY_FILE = os.getenv("FIXTURE_LATENCY_FILE") or None
+FIXTURE_SEED         = int(os.getenv("FIXTURE_SEED", "42"))
+
+MARKET_DATA_URL     = os.getenv("MARKET_DATA_URL") or None
+MARKET_DATA_TIMEOUT = float(os.getenv("MARKET_DATA_TIMEOUT", "10"))   # seconds
+
+# When set, every upstream response is recorded here as fixtures
+MARKET_DATA_RECORD_DIR = os.getenv("MARKET_DATA_RECORD_DIR") or None
+
+# ─── Bar store (services/bar_store.py) ────────────────────────────────────────
+
+# One memory-mapped columnar file per ticker lives here. Off by default for
+# fixture replay, which is already local and anchored at the fixture's end.
+BAR_STORE_ENABLED = os.getenv(
+    "BAR_STORE_ENABLED", "1" if MARKET_DATA_PROVIDER == "yfinance" else "0") == "1"
+BAR_STORE_DIR     = os.getenv("BAR_STORE_DIR", os.path.join(DATA_DIR, "bars"))
+
+# ─── In-process cache (services/cache.py) ─────────────────────────────────────
+
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "512"))
+CACHE_MAX_BYTES   = int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Seconds each StockService method's results stay fresh
+CACHE_TTL = {
+    "history": float(os.getenv("CACHE_TTL_HISTORY", "60")),
+    "meta"   : float(os.getenv("CACHE_TTL_META", str(6 * 3600))),
+    "quote"  : float(os.getenv("CACHE_TTL_QUOTE", "30")),
+}
+
+# ─── Shared cache tier (services/shared_cache.py) ─────────────────────────────
+
+# SQLite (WAL) file behind the in-process cache, shared by every worker on
+# the host: one worker's upstream fetch serves the others. Off by default.
+SHARED_CACHE_ENABLED      = os.getenv("SHARED_CACHE_ENABLED", "0") == "1"
+SHARED_CACHE_PATH         = os.getenv("SHARED_CACHE_PATH",
+                                      os.path.join(DATA_DIR, "shared-cache.sqlite3"))
+SHARED_CACHE_MAX_ENTRIES  = int(os.getenv("SHARED_CACHE_MAX_ENTRIES", "4096"))
+# Longest a worker waits for another worker's load of the same key
+SHARED_CACHE_LOCK_TIMEOUT = float(os.getenv("SHARED_CACHE_LOCK_TIMEOUT", "15"))   # seconds
+
+# ─── Metadata store (services/meta_store.py) ──────────────────────────────────
+
+# Company meta persisted per ticker and loaded in bulk at startup, so requests
+# never wait on the provider's meta call (Yahoo's slow `.info`) after a
+# ticker's first sighting. Off by default for fixture replay, like the bar store.
+META_STORE_ENABLED     = os.getenv(
+    "META_STORE_ENABLED", "1" if MARKET_DATA_PROVIDER == "yfinance" else "0") == "1"
+META_STORE_PATH        = os.getenv("META_STORE_PATH", os.path.join(DATA_DIR, "meta.sqlite3"))
+# Age at which each field group is re-fetched by the "meta" scheduler job
+META_STATIC_MAX_AGE    = float(os.getenv("META_STATIC_MAX_AGE", str(24 * 3600)))  # name, sector, ...
+META_MARKET_MAX_AGE    = float(os.getenv("META_MARKET_MAX_AGE", "3600"))          # market cap, P/E, 52w
+META_REFRESH_SECONDS   = float(os.getenv("META_REFRESH_SECONDS", "600"))
+# Only tickers served within META_ACTIVE_SECONDS are refreshed; the store
+# keeps the META_STORE_MAX_ENTRIES most recently served
+META_ACTIVE_SECONDS    = float(os.getenv("META_ACTIVE_SECONDS", str(2 * 24 * 3600)))
+META_STORE_MAX_ENTRIES = int(os.getenv("META_STORE_MAX_ENTRIES", "2000"))
+
+# ─── Warm start (services/cache_snapshot.py) ──────────────────────────────────
+
+# Hot state (cache entries, dashboard snapshots) is saved to WARM_START_PATH
+# every WARM_START_SAVE_SECONDS and at exit, and loaded back on boot; then
+# the WARM_START_TICKERS (default: the trending + top lists) are prewarmed
+# for WARM_START_PERIODS in the background. On hosts with an ephemeral disk
+# point the path at a persistent volume, or only the prewarm applies.
+# Every worker restores and prewarms its own cache; only the host runner
+# (SCHEDULER_LOCK_PATH) saves. With several workers, enable
+# SHARED_CACHE_ENABLED so a worker's prewarm skips the histories another
+# worker already downloaded.
+WARM_START_ENABLED          = os.getenv(
+    "WARM_START_ENABLED", "1" if MARKET_DATA_PROVIDER == "yfinance" else "0") == "1"
+WARM_START_PATH             = os.getenv("WARM_START_PATH",
+                                        os.path.join(DATA_DIR, "warm-start.msgpack"))
+WARM_START_SAVE_SECONDS     = float(os.getenv("WARM_START_SAVE_SECONDS", "300"))
+# Saved dashboard snapshots older than this are dropped instead of served
+WARM_START_SNAPSHOT_MAX_AGE = float(os.getenv("WARM_START_SNAPSHOT_MAX_AGE", "1800"))
+WARM_START_TICKERS          = [t.strip().upper()
+                               for t in os.getenv("WARM_START_TICKERS", "").split(",") if t.strip()]
+WARM_START_PERIODS          = [p.strip()
+                               for p in os.getenv("WARM_START_PERIODS", "1mo,3mo").split(",") if p.strip()]
+
+# ─── Snapshot fan-out (app._bulk_snapshot) ────────────────────────────────────
+
+SNAPSHOT_WORKERS        = int(os.getenv("SNAPSHOT_WORKERS", "8"))
+SNAPSHOT_TICKER_TIMEOUT = float(os.getenv("SNAPSHOT_TICKER_TIMEOUT", "4"))   # seconds
+SNAPSHOT_DEADLINE       = float(os.getenv("SNAPSHOT_DEADLINE", "6"))         # seconds
+# Share of the deadline the batched history download may use, so the
+# per-ticker fallback still has time when the batch stalls
+SNAPSHOT_BATCH_TIMEOUT  = float(os.getenv("SNAPSHOT_BATCH_TIMEOUT",
+                                          str(SNAPSHOT_DEADLINE / 2)))         # seconds
+
+# ─── Batch prediction (app.predict_batch) ─────────────────────────────────────
+
+PREDICT_BATCH_MAX_TICKERS = int(os.getenv("PREDICT_BATCH_MAX_TICKERS", "50"))
+
+# ─── Meta lookups (app.predict, app.predict_batch) ────────────────────────────
+
+# Own pool, so a stalled meta call never queues behind dashboard fan-out on
+# SNAPSHOT_WORKERS; past the timeout the payload carries placeholder meta
+META_LOOKUP_WORKERS = int(os.getenv("META_LOOKUP_WORKERS", "8"))
+META_LOOKUP_TIMEOUT = float(os.getenv("META_LOOKUP_TIMEOUT", "3"))   # seconds
+
+# ─── Predictor parameters (services/prediction_service.py) ────────────────────
+
+# Tuned predictor-vN.json files written by scripts/optimize.py; the highest
+# version is loaded at startup. PREDICTOR_PARAMS_FILE pins one file instead.
+PREDICTOR_PARAMS_DIR  = os.getenv("PREDICTOR_PARAMS_DIR", os.path.join(BASE_DIR, "params"))
+PREDICTOR_PARAMS_FILE = os.getenv("PREDICTOR_PARAMS_FILE") or None
+
+# ─── Screener (services/screener_service.py) ──────────────────────────────────
+
+SCREENER_ENABLED = os.getenv("SCREENER_ENABLED", "1") == "1"   # needs SCHEDULER_ENABLED
+
+# Universe: comma-separated SCREENER_UNIVERSE, else one symbol per line in
+# SCREENER_UNIVERSE_FILE, else the NIFTY 50 constituents below.
+_NIFTY_50 = (
+    "ADANIENT.NS,ADANIPORTS.NS,APOLLOHOSP.NS,ASIANPAINT.NS,AXISBANK.NS,"
+    "BAJAJ-AUTO.NS,BAJFINANCE.NS,BAJAJFINSV.NS,BEL.NS,BHARTIARTL.NS,CIPLA.NS,"
+    "COALINDIA.NS,DRREDDY.NS,EICHERMOT.NS,GRASIM.NS,HCLTECH.NS,HDFCBANK.NS,"
+    "HDFCLIFE.NS,HEROMOTOCO.NS,HINDALCO.NS,HINDUNILVR.NS,ICICIBANK.NS,INDUSINDBK.NS,"
+    "INFY.NS,ITC.NS,JSWSTEEL.NS,KOTAKBANK.NS,LT.NS,LTIM.NS,M&M.NS,MARUTI.NS,"
+    "NESTLEIND.NS,NTPC.NS,ONGC.NS,POWERGRID.NS,RELIANCE.NS,SBILIFE.NS,SBIN.NS,"
+    "SHRIRAMFIN.NS,SUNPHARMA.NS,TATACONSUM.NS,TATAMOTORS.NS,TATASTEEL.NS,TCS.NS,"
+    "TECHM.NS,TITAN.NS,TRENT.NS,ULTRACEMCO.NS,WIPRO.NS"
+)
+
+
+def _load_universe() -> list:
+    if os.getenv("SCREENER_UNIVERSE"):
+        raw = os.getenv("SCREENER_UNIVERSE").split(",")
+    elif os.getenv("SCREENER_UNIVERSE_FILE"):
+        with open(os.getenv("SCREENER_UNIVERSE_FILE"), "r", encoding="utf-8") as fh:
+            raw = [line.split("#")[0] for line in fh]
+    else:
+        raw = _NIFTY_50.split(",")
+    return [t.strip().upper() for t in raw if t.strip()]
+
+
+SCREENER_UNIVERSE         = _load_universe()
+SCREENER_PERIOD           = os.getenv("SCREENER_PERIOD", "3mo")
+SCREENER_REFRESH_SECONDS  = float(os.getenv("SCREENER_REFRESH_SECONDS", "300"))
+SCREENER_MAX_LIMIT        = int(os.getenv("SCREENER_MAX_LIMIT", "500"))
+
+# ─── Background refresh (services/scheduler.py) ───────────────────────────────
+
+SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "1") == "1"
+SCHEDULER_WORKERS = int(os.getenv("SCHEDULER_WORKERS", "2"))
+
+# Every serving process (each gunicorn worker) runs the jobs that publish
+# in-process state: the trending / top snapshots and the screener index, so
+# their upstream traffic grows with the worker count (enable the shared
+# cache tier to coalesce it, or set SCHEDULER_ENABLED=0 and let requests
+# build them on demand). Jobs that maintain host-wide files (meta refresh,
+# warm-start save) run in one process per host only: the one holding this
+# lock.
+SCHEDULER_LOCK_PATH = os.getenv("SCHEDULER_LOCK_PATH", os.path.join(DATA_DIR, "scheduler.lock"))
+
+# Exchange session the refresh cadence follows (default: NSE)
+MARKET_TIMEZONE = os.getenv("MARKET_TIMEZONE", "Asia/Kolkata")
+MARKET_OPEN     = os.getenv("MARKET_OPEN", "09:15")
+MARKET_CLOSE    = os.getenv("MARKET_CLOSE", "15:30")
+MARKET_HOLIDAYS = [d.strip() for d in os.getenv("MARKET_HOLIDAYS", "").split(",") if d.strip()]
+
+# Seconds between trending / top snapshot rebuilds during the session
+SNAPSHOT_REFRESH_SECONDS = float(os.getenv("SNAPSHOT_REFRESH_SECONDS", "60"))
+
+# ─── Async serving mode (asgi.py) ─────────────────────────────────────────────
+
+# Threads holding blocking upstream calls (yfinance) for async callers; each
+# in-flight upstream wait occupies one
+ASYNC_IO_THREADS   = int(os.getenv("ASYNC_IO_THREADS", "256"))
+
+# Threads running CPU-bound steps (indicators, prediction, serialisation)
+ASYNC_CPU_THREADS  = int(os.getenv("ASYNC_CPU_THREADS", str(os.cpu_count() or 2)))
+
+# Threads running the remaining (synchronous) Flask routes under ASGI
+ASGI_WSGI_THREADS  = int(os.getenv("ASGI_WSGI_THREADS", "32"))
+
+# ─── HTTP caching (app._predict_validators) ───────────────────────────────────
+
+# Cache-Control max-age of /api/predict while the session is open (the last
+# bar is live) and, capped by the time to the next open, while it is closed
+HTTP_CACHE_MAX_AGE_OPEN   = int(os.getenv("HTTP_CACHE_MAX_AGE_OPEN", "60"))
+HTTP_CACHE_MAX_AGE_CLOSED = int(os.getenv("HTTP_CACHE_MAX_AGE_CLOSED", "1800"))
+
+# ─── Live stream (services/stream_service.py) ─────────────────────────────────
+
+# "market": poll through StockService; "replay": step through the provider's
+# recorded history one bar per poll (offline runs with the fixture provider)
+STREAM_FEED                = os.getenv("STREAM_FEED", "market")
+STREAM_REPLAY_WARMUP       = int(os.getenv("STREAM_REPLAY_WARMUP", "250"))
+
+STREAM_POLL_SECONDS        = float(os.getenv("STREAM_POLL_SECONDS", "5"))
+STREAM_CLOSED_POLL_SECONDS = float(os.getenv("STREAM_CLOSED_POLL_SECONDS", "300"))
+STREAM_LINGER_SECONDS      = float(os.getenv("STREAM_LINGER_SECONDS", "30"))
+STREAM_HEARTBEAT_SECONDS   = float(os.getenv("STREAM_HEARTBEAT_SECONDS", "15"))
+STREAM_MAX_TICKERS         = int(os.getenv("STREAM_MAX_TICKERS", "20"))
+
+# Events buffered per subscriber; a client further behind skips events
+STREAM_QUEUE_SIZE          = int(os.getenv("STREAM_QUEUE_SIZE", "256"))
+
+# Open /api/stream connections per process on the Flask (WSGI) route, where
+# each one holds a worker thread; beyond it clients get a 503. asgi.py,
+# which holds no thread per client, is not capped.
+STREAM_MAX_CONNECTIONS     = int(os.getenv("STREAM_MAX_CONNECTIONS", "4"))
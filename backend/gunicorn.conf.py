@@ -0,0 +1,17 @@
+"""
+==============================================================================
+gunicorn.conf.py
+==============================================================================
+Read by gunicorn from the working directory (run it from backend/):
+    gunicorn -w 2 --threads 8 app:app
+
+Importing app starts no threads; each worker starts its own background work
+(refresh scheduler, host election, prewarm) once the app is loaded, so it
+also runs in every worker under --preload instead of in the master only.
+==============================================================================
+"""
+
+
+def post_worker_init(worker):
+    from app import start_background
+    start_background()
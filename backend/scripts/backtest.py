@@ -0,0 +1,117 @@
+"""
+==============================================================================
+scripts/backtest.py
+==============================================================================
+Responsibility : Command-line walk-forward backtest of the prediction engine.
+
+Usage (from backend/):
+    python -m scripts.backtest --tickers RELIANCE.NS,TCS.NS --history 5y
+    python -m scripts.backtest --tickers-file universe.txt --workers 8 \\
+                               --out backtest.json
+
+Histories come from the configured market-data provider (MARKET_DATA_PROVIDER,
+so fixture replay works offline) and the report is printed / written as JSON.
+==============================================================================
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+
+import config
+from services.backtest_service import BacktestService, PERIOD_BARS
+from services.bar_store import BarStore
+from services.market_data import build_provider
+from services.stock_service import StockService
+from utils.validators import validate_ticker, VALID_PERIODS
+
+logger = logging.getLogger(__name__)
+
+
+def load_tickers(args) -> list:
+    """Tickers from --tickers and/or --tickers-file (one per line, # comments)."""
+    tickers = (args.tickers or "").split(",")
+    if args.tickers_file:
+        with open(args.tickers_file, "r", encoding="utf-8") as fh:
+            tickers += [line.split("#")[0] for line in fh]
+    tickers = [t.strip().upper() for t in tickers if t.strip()]
+    for t in tickers:
+        err = validate_ticker(t)
+        if err:
+            raise SystemExit(err)
+    return list(dict.fromkeys(tickers))
+
+
+def build_stock_service() -> StockService:
+    """StockService wired like app.py, minus the in-process cache."""
+    provider = build_provider(
+        config.MARKET_DATA_PROVIDER,
+        fixture_dir=config.FIXTURE_DIR,
+        latency_file=config.FIXTURE_LATENCY_FILE,
+        seed=config.FIXTURE_SEED,
+        record_dir=config.MARKET_DATA_RECORD_DIR,
+        url=config.MARKET_DATA_URL,
+        timeout=config.MARKET_DATA_TIMEOUT,
+    )
+    bar_store = BarStore(config.BAR_STORE_DIR) if config.BAR_STORE_ENABLED else None
+    return StockService(provider=provider, bar_store=bar_store)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Walk-forward backtest of PredictionService.")
+    parser.add_argument("--tickers", help="Comma-separated symbols")
+    parser.add_argument("--tickers-file", help="File with one symbol per line")
+    parser.add_argument("--history", default="5y", choices=sorted(VALID_PERIODS),
+                        help="History downloaded per ticker (default: 5y)")
+    parser.add_argument("--period", default="3mo", choices=sorted(PERIOD_BARS),
+                        help="/api/predict window being simulated (default: 3mo)")
+    parser.add_argument("--horizon", type=int, default=None,
+                        help="Bars ahead to score (default: PredictionService.HORIZON)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=8,
+                        help="Tickers per worker task (default: 8)")
+    parser.add_argument("--per-ticker", action="store_true",
+                        help="Keep the per-ticker breakdown in the report")
+    parser.add_argument("--out", help="Write the JSON report here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO,
+                        format="%(asctime)s [%(levelname)s] %(name)s — %(message)s")
+    args    = parse_args(argv)
+    tickers = load_tickers(args)
+    if not tickers:
+        raise SystemExit("No tickers given (use --tickers or --tickers-file).")
+
+    started = time.perf_counter()
+    frames  = build_stock_service().fetch_history_many(tickers, args.history)
+    missing = [t for t, df in frames.items() if df.empty]
+    if missing:
+        logger.warning(f"No history for: {', '.join(missing)}")
+    fetched = time.perf_counter()
+
+    report = BacktestService(workers=args.workers, chunk_size=args.chunk_size).run(
+        frames, period=args.period, horizon=args.horizon)
+    if not args.per_ticker:
+        report.pop("per_ticker", None)
+    report["history"] = args.history
+    report["timing_s"] = {
+        "fetch"   : round(fetched - started, 3),
+        "backtest": round(time.perf_counter() - fetched, 3),
+    }
+
+    payload = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            fh.write(payload + "\n")
+        logger.info(f"Report written to {args.out}")
+    else:
+        sys.stdout.write(payload + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+"""
+==============================================================================
+scripts/benchmark.py
+==============================================================================
+Responsibility : Offline micro-benchmarks of the /api/predict hot paths.
+
+Usage (from backend/):
+    python -m scripts.benchmark                              # compare to baseline
+    python -m scripts.benchmark --save-baseline              # record a new one
+    python -m scripts.benchmark --sizes 20,1000 --cases compute_all,predict
+
+Every case runs on synthetic OHLCV frames (seeded random walk, no network)
+from 20 bars up to 1M bars (compute_universe spreads the frame over a
+500-ticker universe). For each case × size the median / min wall time
+and the peak traced memory (tracemalloc, one extra run) are recorded. With a
+baseline file present, a case is flagged as a regression when its min time
+(the least noisy statistic) or peak memory grows by more than --threshold;
+the exit status is 1 if anything regressed, so the script can gate CI.
+
+Baselines are machine specific: record one per machine / environment (e.g.
+before and after a pandas or numpy upgrade) and compare on that machine.
+Shared / throttled VMs can swing by 1.5× between runs; raise --threshold
+there, or compare several runs.
+==============================================================================
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from services.indicator_service import IndicatorService
+from services.market_data import MarketDataProvider
+from services.prediction_service import PredictionService
+from services.stock_service import StockService
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZES    = [20, 100, 1_000, 10_000, 100_000, 1_000_000]
+DEFAULT_BASELINE = os.path.join("data", "benchmark-baseline.json")
+
+# Daily bars until the index would run past pandas' Timestamp range
+# (~1677); longer frames use minute bars instead
+MAX_DAILY_BARS = 50_000
+
+BENCH_TICKER = "BENCH.NS"
+
+# compute_universe case: a NIFTY-500-sized universe over the frame's last
+# bars, capped at five years of daily bars (the longest period served)
+UNIVERSE_SIZE     = 500
+UNIVERSE_MAX_BARS = 1_250
+
+
+# ─── Synthetic data ───────────────────────────────────────────────────────────
+
+def synthetic_ohlcv(n: int, seed: int = 42, start_price: float = 1000.0) -> pd.DataFrame:
+    """
+    `n` bars shaped like a provider response: [Open, High, Low, Close,
+    Volume] on a naive "Date" index, prices rounded to the paisa.
+
+    The log price is mean-reverting (AR(1), phi = 0.999), so even 1M bars
+    stay within a realistic range instead of drifting to 0 or infinity.
+    """
+    rng   = np.random.default_rng(seed)
+    alpha = 0.001                                    # 1 - phi
+    shock = rng.normal(0.0, 0.015, n)
+    shock[0] = 0.0                                   # the recursion starts at z[0]
+    log_p = pd.Series(shock / alpha).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    close = np.round(start_price * np.exp(log_p), 2)
+
+    open_ = np.empty(n)
+    open_[0]  = start_price
+    open_[1:] = close[:-1] * np.exp(rng.normal(0.0, 0.004, n - 1))
+    open_     = np.round(open_, 2)
+    wick  = np.abs(rng.normal(0.0, 0.006, (2, n)))
+    high  = np.round(np.maximum(open_, close) * (1 + wick[0]), 2)
+    low   = np.round(np.minimum(open_, close) * (1 - wick[1]), 2)
+    volume = np.round(rng.lognormal(13.0, 0.6, n))
+
+    if n <= MAX_DAILY_BARS:
+        index = pd.bdate_range(end="2024-12-31", periods=n, name="Date")
+    else:
+        index = pd.date_range(end="2024-12-31 15:29", periods=n, freq="min", name="Date")
+    return pd.DataFrame({"Open": open_, "High": high, "Low": low,
+                         "Close": close, "Volume": volume}, index=index)
+
+
+class SyntheticProvider(MarketDataProvider):
+    """Serves one prebuilt frame for every ticker and period (no window)."""
+
+    name = "synthetic"
+
+    def __init__(self, frame: pd.DataFrame):
+        self.frame = frame
+
+    def history(self, ticker: str, period: str | None = None,
+                start: str | None = None) -> pd.DataFrame:
+        return self.frame
+
+    def meta(self, ticker: str) -> dict:
+        return {"longName": "Synthetic Benchmark Ltd", "sector": "N/A",
+                "currency": "INR", "exchange": "NSE"}
+
+
+# ─── Cases ────────────────────────────────────────────────────────────────────
+# Each case takes the frame and returns the zero-argument call to time;
+# preparation (inputs the call needs) happens outside the timed region.
+
+indicator_svc  = IndicatorService()
+prediction_svc = PredictionService()
+
+
+def case_compute_all(df: pd.DataFrame):
+    return lambda: indicator_svc.compute_all(df)
+
+
+def case_predict(df: pd.DataFrame):
+    graph     = indicator_svc.evaluate(df)
+    inputs    = graph.to_dict(prediction_svc.REQUIRED_INDICATORS, series=False)
+    obv_trend = graph.value("obv_trend")
+    return lambda: prediction_svc.predict(df, inputs, obv_trend=obv_trend)
+
+
+def case_obv_trend(df: pd.DataFrame):
+    return lambda: PredictionService._compute_obv_trend(df)
+
+
+def case_serialize_ohlcv(df: pd.DataFrame):
+    stock_svc = StockService(provider=SyntheticProvider(df))
+    return lambda: stock_svc.serialize_ohlcv(df)
+
+
+def case_compute_universe(df: pd.DataFrame):
+    """UNIVERSE_SIZE tickers (the frame rescaled per column), as /api/predict/batch runs it."""
+    tail  = df.iloc[-UNIVERSE_MAX_BARS:]
+    scale = np.random.default_rng(0).uniform(0.1, 10.0, UNIVERSE_SIZE)
+    close, high, low = (tail[c].to_numpy()[:, None] * scale for c in ("Close", "High", "Low"))
+    volume  = np.repeat(tail["Volume"].to_numpy()[:, None], UNIVERSE_SIZE, axis=1)
+    tickers = [f"U{j:03d}.NS" for j in range(UNIVERSE_SIZE)]
+    return lambda: indicator_svc.compute_universe(close, high, low, volume, tickers,
+                                                  include_obv_trend=True)
+
+
+def case_api_predict(df: pd.DataFrame):
+    """GET /api/predict through the Flask test client (view + encoding)."""
+    app_module = _load_app()
+    app_module.stock_svc = StockService(provider=SyntheticProvider(df))
+    client = app_module.app.test_client()
+
+    def call():
+        response = client.get(f"/api/predict?ticker={BENCH_TICKER}&period=5y")
+        if response.status_code != 200:
+            raise RuntimeError(f"/api/predict returned {response.status_code}")
+        return response.data
+    return call
+
+
+CASES = {
+    "compute_all"     : case_compute_all,
+    "predict"         : case_predict,
+    "obv_trend"       : case_obv_trend,
+    "serialize_ohlcv" : case_serialize_ohlcv,
+    "compute_universe": case_compute_universe,
+    "api_predict"     : case_api_predict,
+}
+
+
+# ─── Runner ───────────────────────────────────────────────────────────────────
+
+def measure(fn, min_time: float, min_repeats: int = 3, max_repeats: int = 10_000) -> dict:
+    """Time `fn` (after one warm-up call), then trace its peak allocation."""
+    fn()
+    times   = []
+    started = time.perf_counter()
+    while len(times) < max_repeats and (len(times) < min_repeats
+                                        or time.perf_counter() - started < min_time):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "median_ms": round(statistics.median(times) * 1000, 4),
+        "min_ms"   : round(min(times) * 1000, 4),
+        "repeats"  : len(times),
+        "peak_kb"  : round(peak / 1024, 1),
+    }
+
+
+def run(cases: list, sizes: list, min_time: float, seed: int) -> dict:
+    results = {}
+    for n in sizes:
+        df = synthetic_ohlcv(n, seed=seed)
+        for name in cases:
+            key = f"{name}/{n}"
+            try:
+                results[key] = measure(CASES[name](df), min_time)
+            except Exception as e:
+                logger.error(f"{key}: {e}")
+                results[key] = {"error": str(e)}
+                continue
+            logger.info(f"{key:<28} {results[key]['median_ms']:>12.3f} ms "
+                        f"{results[key]['peak_kb']:>12.1f} KiB")
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float,
+            floor_ms: float = 0.05) -> list:
+    """
+    Cases whose min time or peak memory exceeds the baseline by more than
+    `threshold` (fraction). Differences under `floor_ms` are timer noise.
+    """
+    regressions = []
+    for key, cur in results.items():
+        base = baseline.get(key)
+        if not base or "error" in base or "error" in cur:
+            continue
+        for metric, floor in (("min_ms", floor_ms), ("peak_kb", 64.0)):
+            if cur[metric] - base[metric] > floor and cur[metric] > base[metric] * (1 + threshold):
+                regressions.append({
+                    "case"    : key,
+                    "metric"  : metric,
+                    "baseline": base[metric],
+                    "current" : cur[metric],
+                    "ratio"   : round(cur[metric] / base[metric], 3) if base[metric] else None,
+                })
+    return regressions
+
+
+def environment() -> dict:
+    return {
+        "python"  : platform.python_version(),
+        "pandas"  : pd.__version__,
+        "numpy"   : np.__version__,
+        "platform": platform.platform(),
+        "cpus"    : os.cpu_count(),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the /api/predict hot paths offline.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="Comma-separated bar counts (default: 20 … 1000000)")
+    parser.add_argument("--cases", default=",".join(CASES),
+                        help=f"Comma-separated subset of: {', '.join(CASES)}")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="Seconds to keep repeating each case (min 3 runs, default: 0.2)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help=f"Baseline JSON to compare with / save to (default: {DEFAULT_BASELINE})")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Write the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed growth before a case is flagged (default: 0.25 = 25%%)")
+    parser.add_argument("--out", help="Write the JSON report here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO,
+                        format="%(asctime)s [%(levelname)s] %(name)s — %(message)s")
+    args  = parse_args(argv)
+    cases = [c.strip() for c in args.cases.split(",") if c.strip()]
+    unknown = [c for c in cases if c not in CASES]
+    if unknown:
+        raise SystemExit(f"Unknown case(s): {', '.join(unknown)}")
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    if any(n < 2 for n in sizes):
+        raise SystemExit("Sizes must be at least 2 bars.")
+
+    report = {
+        "environment": environment(),
+        "results"    : run(cases, sizes, args.min_time, args.seed),
+    }
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+            fh.write("\n")
+        logger.info(f"Baseline written to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        report["baseline"]    = {"path": args.baseline, "environment": baseline.get("environment")}
+        report["regressions"] = compare(report["results"], baseline.get("results", {}),
+                                        args.threshold)
+        for r in report["regressions"]:
+            logger.warning(f"REGRESSION {r['case']} {r['metric']}: "
+                           f"{r['baseline']} → {r['current']} (×{r['ratio']})")
+
+    payload = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            fh.write(payload + "\n")
+        logger.info(f"Report written to {args.out}")
+    else:
+        sys.stdout.write(payload + "\n")
+    if report.get("regressions"):
+        sys.exit(1)
+
+
+# ─── Private helpers ──────────────────────────────────────────────────────────
+
+def _load_app():
+    """
+    Import app.py configured for offline use (no network). Importing it
+    starts no background work (see app.start_background).
+    """
+    if "app" not in sys.modules:
+        os.environ["MARKET_DATA_PROVIDER"] = "fixture"
+        os.environ["FIXTURE_DIR"]          = tempfile.mkdtemp(prefix="bench-fixtures-")
+        os.environ["BAR_STORE_ENABLED"]    = "0"
+        import app
+        for name in ("app", "services.stock_service"):      # per-request INFO lines
+            logging.getLogger(name).setLevel(logging.WARNING)
+    return sys.modules["app"]
+
+
+if __name__ == "__main__":
+    main()
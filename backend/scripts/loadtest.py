@@ -0,0 +1,336 @@
+"""
+==============================================================================
+scripts/loadtest.py
+==============================================================================
+Responsibility : End-to-end load test of the API against a stub upstream.
+
+Usage (from backend/):
+    python -m scripts.loadtest --workers 2 --threads 8 --concurrency 8,32 \\
+                               --duration 30 --latency-ms 120 --out load.json
+    python -m scripts.loadtest --server uvicorn --workers 2 --app asgi:application
+    python -m scripts.loadtest --target http://10.0.0.5:5000 --mix predict=1
+
+Starts scripts/stub_upstream.py (synthetic bars, artificial latency), then
+the API under gunicorn / uvicorn / werkzeug with MARKET_DATA_PROVIDER=http
+pointed at the stub (skip that with --target to drive a running server).
+For every --concurrency level, that many closed-loop clients send requests
+picked from the --mix weights for --duration seconds (after --warmup), and
+the report gives per-route throughput, p50/p95/p99 latency and error rate
+as JSON, so worker / thread configurations can be compared run by run.
+
+Any other setting (CACHE_TTL_*, SCHEDULER_ENABLED, ...) is taken from the
+environment as usual. The load generator shares the machine with the API
+unless --target points elsewhere; on small machines, read results as
+relative rather than absolute numbers.
+==============================================================================
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_TICKERS = [
+    "RELIANCE.NS", "TCS.NS", "INFY.NS", "HDFCBANK.NS", "ICICIBANK.NS",
+    "WIPRO.NS", "SBIN.NS", "AXISBANK.NS", "BAJFINANCE.NS", "ASIANPAINT.NS",
+    "MARUTI.NS", "TITAN.NS", "HINDUNILVR.NS", "LTIM.NS", "NESTLEIND.NS",
+    "ADANIENT.NS",
+]
+
+# Route name → request path (the four routes the dashboard calls)
+ROUTES = {
+    "predict" : lambda rng, args: (f"/api/predict?ticker={rng.choice(args.tickers)}"
+                                   f"&period={args.period}&points={args.points}"),
+    "trending": lambda rng, args: "/api/stocks/trending",
+    "top"     : lambda rng, args: "/api/stocks/top",
+    "search"  : lambda rng, args: f"/api/stocks/search?q={rng.choice(args.tickers)}",
+}
+DEFAULT_MIX = "predict=6,trending=2,top=1,search=1"
+
+SERVERS = ("gunicorn", "uvicorn", "werkzeug")
+
+
+# ─── Processes ────────────────────────────────────────────────────────────────
+
+def start_stub(args, port: int, log_dir: str) -> subprocess.Popen:
+    cmd = [sys.executable, "-m", "scripts.stub_upstream", "--port", str(port),
+           "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms),
+           "--error-rate", str(args.upstream_error_rate), "--seed", str(args.seed)]
+    if args.latency_file:
+        cmd += ["--latency-file", args.latency_file]
+    return _spawn(cmd, os.environ.copy(), os.path.join(log_dir, "stub.log"))
+
+
+def start_api(args, port: int, stub_url: str, log_dir: str) -> subprocess.Popen:
+    env = {**os.environ, "MARKET_DATA_PROVIDER": "http", "MARKET_DATA_URL": stub_url}
+    bind = f"127.0.0.1:{port}"
+    if args.server == "gunicorn":
+        cmd = [sys.executable, "-m", "gunicorn", "-b", bind, "-w", str(args.workers),
+               "--threads", str(args.threads), "-k", args.worker_class or "gthread",
+               "--timeout", "120", args.app or "app:app"]
+    elif args.server == "uvicorn":
+        cmd = [sys.executable, "-m", "uvicorn", "--host", "127.0.0.1", "--port", str(port),
+               "--workers", str(args.workers), "--log-level", "warning",
+               args.app or "asgi:application"]
+    else:
+        module, _, attr = (args.app or "app:app").partition(":")
+        cmd = [sys.executable, "-c",
+               "from werkzeug.serving import run_simple; "
+               f"from {module} import {attr} as application; "
+               "from app import start_background; start_background(); "
+               f"run_simple('127.0.0.1', {port}, application, threaded=True)"]
+    return _spawn(cmd, env, os.path.join(log_dir, "api.log"))
+
+
+def wait_ready(url: str, proc: subprocess.Popen | None, timeout: float):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc is not None and proc.poll() is not None:
+            raise SystemExit(f"Process exited with {proc.returncode} before {url} was up "
+                             "(see its log).")
+        try:
+            if requests.get(url, timeout=2).ok:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise SystemExit(f"Timed out waiting for {url}")
+
+
+# ─── Load generation ──────────────────────────────────────────────────────────
+
+def run_level(base_url: str, args, concurrency: int, weights: dict) -> dict:
+    """Closed loop: `concurrency` clients, each sending its next request on reply."""
+    names, probs = list(weights), list(weights.values())
+    samples      = []                               # (route, seconds, ok)
+    samples_lock = threading.Lock()
+    started      = time.monotonic()
+    measure_from = started + args.warmup
+    stop_at      = measure_from + args.duration
+
+    def client(i: int):
+        rng     = random.Random(args.seed * 1000 + i)
+        session = requests.Session()
+        session.mount("http://", HTTPAdapter(pool_maxsize=1))
+        local   = []
+        while True:
+            now = time.monotonic()
+            if now >= stop_at:
+                break
+            route = rng.choices(names, probs)[0]
+            url   = base_url + ROUTES[route](rng, args)
+            t0    = time.perf_counter()
+            try:
+                ok = session.get(url, timeout=args.timeout).status_code < 400
+            except requests.RequestException:
+                ok = False
+            elapsed = time.perf_counter() - t0
+            if now >= measure_from:
+                local.append((route, elapsed, ok))
+        session.close()
+        with samples_lock:
+            samples.extend(local)
+
+    threads = [threading.Thread(target=client, args=(i,), daemon=True)
+               for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    return {
+        "concurrency": concurrency,
+        "duration_s" : args.duration,
+        "total"      : summarize([(s, ok) for _, s, ok in samples], args.duration),
+        "routes"     : {name: summarize([(s, ok) for r, s, ok in samples if r == name],
+                                        args.duration)
+                        for name in names},
+    }
+
+
+def summarize(samples: list, duration: float) -> dict:
+    """Throughput, latency percentiles (all requests, ms) and error rate."""
+    if not samples:
+        return {"requests": 0, "rps": 0.0, "errors": 0, "error_rate": 0.0}
+    latency = np.array([s for s, _ in samples]) * 1000
+    errors  = sum(1 for _, ok in samples if not ok)
+    p50, p95, p99 = np.percentile(latency, [50, 95, 99])
+    return {
+        "requests"  : len(samples),
+        "rps"       : round(len(samples) / duration, 2),
+        "errors"    : errors,
+        "error_rate": round(errors / len(samples), 4),
+        "p50_ms"    : round(float(p50), 2),
+        "p95_ms"    : round(float(p95), 2),
+        "p99_ms"    : round(float(p99), 2),
+        "mean_ms"   : round(float(latency.mean()), 2),
+        "max_ms"    : round(float(latency.max()), 2),
+    }
+
+
+def parse_mix(text: str) -> dict:
+    weights = {}
+    for part in text.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name not in ROUTES:
+            raise SystemExit(f"Unknown route '{name}' in --mix (choose from {', '.join(ROUTES)})")
+        try:
+            weights[name] = float(weight or 1)
+        except ValueError:
+            raise SystemExit(f"Invalid weight '{weight}' for route '{name}'")
+    if not weights or sum(weights.values()) <= 0:
+        raise SystemExit("--mix needs at least one route with a positive weight")
+    return {k: v for k, v in weights.items() if v > 0}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the API against a stub upstream.")
+    parser.add_argument("--target", help="Drive an already running API at this URL "
+                                         "(no stub / server is started)")
+    parser.add_argument("--server", default="gunicorn", choices=SERVERS)
+    parser.add_argument("--app", help="WSGI/ASGI app (default: app:app, asgi:application for uvicorn)")
+    parser.add_argument("--workers", type=int, default=2, help="Server worker processes (default: 2)")
+    parser.add_argument("--threads", type=int, default=8, help="Threads per gunicorn worker (default: 8)")
+    parser.add_argument("--worker-class", help="gunicorn -k (default: gthread)")
+    parser.add_argument("--concurrency", default="1,8,32",
+                        help="Comma-separated client counts, one run each (default: 1,8,32)")
+    parser.add_argument("--mix", default=DEFAULT_MIX,
+                        help=f"Route weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--duration", type=float, default=20.0,
+                        help="Measured seconds per level (default: 20)")
+    parser.add_argument("--warmup", type=float, default=3.0,
+                        help="Unmeasured seconds before each level (default: 3)")
+    parser.add_argument("--tickers", default=",".join(DEFAULT_TICKERS),
+                        help="Symbols predict/search pick from (default: the dashboard lists)")
+    parser.add_argument("--period", default="1y", help="/api/predict period (default: 1y)")
+    parser.add_argument("--points", type=int, default=400,
+                        help="/api/predict chart points, as the frontend sends (default: 400)")
+    parser.add_argument("--latency-ms", type=float, default=100.0,
+                        help="Stub upstream delay per call (default: 100)")
+    parser.add_argument("--jitter-ms", type=float, default=30.0,
+                        help="Standard deviation of the stub delay (default: 30)")
+    parser.add_argument("--latency-file", help="Recorded latency samples for the stub")
+    parser.add_argument("--upstream-error-rate", type=float, default=0.0,
+                        help="Share of stub calls answered 503 (default: 0)")
+    parser.add_argument("--timeout", type=float, default=30.0,
+                        help="Client request timeout in seconds (default: 30)")
+    parser.add_argument("--startup-timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--log-dir", help="Where stub / server logs go (default: a temp dir)")
+    parser.add_argument("--out", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+    args.tickers = [t.strip().upper() for t in args.tickers.split(",") if t.strip()]
+    return args
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO,
+                        format="%(asctime)s [%(levelname)s] %(name)s — %(message)s")
+    args    = parse_args(argv)
+    weights = parse_mix(args.mix)
+    levels  = [int(c) for c in args.concurrency.split(",") if c.strip()]
+    if not levels or min(levels) < 1:
+        raise SystemExit("--concurrency needs positive client counts")
+    log_dir = args.log_dir or tempfile.mkdtemp(prefix="loadtest-")
+    os.makedirs(log_dir, exist_ok=True)
+
+    procs = []
+    try:
+        if args.target:
+            base_url = args.target.rstrip("/")
+            wait_ready(base_url + "/api/health", None, args.startup_timeout)
+        else:
+            stub_port, api_port = _free_port(), _free_port()
+            stub_url = f"http://127.0.0.1:{stub_port}"
+            procs.append(start_stub(args, stub_port, log_dir))
+            wait_ready(stub_url + "/health", procs[-1], args.startup_timeout)
+            procs.append(start_api(args, api_port, stub_url, log_dir))
+            base_url = f"http://127.0.0.1:{api_port}"
+            wait_ready(base_url + "/api/health", procs[-1], args.startup_timeout)
+        logger.info(f"Driving {base_url} (logs in {log_dir})")
+
+        runs = []
+        for concurrency in levels:
+            run = run_level(base_url, args, concurrency, weights)
+            total = run["total"]
+            logger.info(f"c={concurrency:<4} {total['rps']:>8.1f} req/s  "
+                        f"p50 {total.get('p50_ms', 0):.1f}  p95 {total.get('p95_ms', 0):.1f}  "
+                        f"p99 {total.get('p99_ms', 0):.1f} ms  errors {total['error_rate']:.2%}")
+            runs.append(run)
+    finally:
+        for proc in reversed(procs):
+            _stop(proc)
+
+    report = {
+        "config": {
+            "target"     : args.target,
+            "server"     : None if args.target else args.server,
+            "app"        : None if args.target else args.app,
+            "workers"    : None if args.target else args.workers,
+            "threads"    : None if args.target else args.threads,
+            "mix"        : weights,
+            "period"     : args.period,
+            "points"     : args.points,
+            "tickers"    : len(args.tickers),
+            "latency_ms" : None if args.target else args.latency_ms,
+            "jitter_ms"  : None if args.target else args.jitter_ms,
+            "upstream_error_rate": None if args.target else args.upstream_error_rate,
+            "warmup_s"   : args.warmup,
+            "host"       : {"python": platform.python_version(), "cpus": os.cpu_count()},
+        },
+        "runs": runs,
+    }
+    payload = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            fh.write(payload + "\n")
+        logger.info(f"Report written to {args.out}")
+    else:
+        sys.stdout.write(payload + "\n")
+
+
+# ─── Private helpers ──────────────────────────────────────────────────────────
+
+def _spawn(cmd: list, env: dict, log_path: str) -> subprocess.Popen:
+    log = open(log_path, "ab")
+    try:
+        return subprocess.Popen(cmd, cwd=BACKEND_DIR, env=env, stdout=log,
+                                stderr=subprocess.STDOUT)
+    finally:
+        log.close()                      # the child keeps its own descriptor
+
+
+def _stop(proc: subprocess.Popen):
+    if proc.poll() is None:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+if __name__ == "__main__":
+    main()
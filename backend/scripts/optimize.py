@@ -0,0 +1,103 @@
+"""
+==============================================================================
+scripts/optimize.py
+==============================================================================
+Responsibility : Command-line tuner for PredictionService parameters.
+
+Usage (from backend/):
+    python -m scripts.optimize --tickers-file universe.txt --trials 5000 \\
+                               --features-cache data/features-3mo.npz
+
+Features are built once (or loaded from --features-cache) and every trial
+only re-weights them; see services/optimizer_service.py. The best set is
+written to PREDICTOR_PARAMS_DIR as the next predictor-vN.json, which the
+API loads on its next start (pin a version with PREDICTOR_PARAMS_FILE).
+==============================================================================
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+
+import config
+from services.backtest_service import PERIOD_BARS
+from services.optimizer_service import (ParamOptimizer, build_features,
+                                        load_features, save_features)
+from scripts.backtest import build_stock_service, load_tickers
+from utils.validators import VALID_PERIODS
+
+logger = logging.getLogger(__name__)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Tune PredictionService parameters.")
+    parser.add_argument("--tickers", help="Comma-separated symbols")
+    parser.add_argument("--tickers-file", help="File with one symbol per line")
+    parser.add_argument("--history", default="5y", choices=sorted(VALID_PERIODS),
+                        help="History downloaded per ticker (default: 5y)")
+    parser.add_argument("--period", default="3mo", choices=sorted(PERIOD_BARS),
+                        help="/api/predict window being simulated (default: 3mo)")
+    parser.add_argument("--horizon", type=int, default=None,
+                        help="Bars ahead to score (default: PredictionService.HORIZON)")
+    parser.add_argument("--features-cache",
+                        help="Load features from this .npz if it exists, else build and save it")
+    parser.add_argument("--trials", type=int, default=1000, help="Random candidates (default: 1000)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: CPU count)")
+    parser.add_argument("--train-fraction", type=float, default=0.7,
+                        help="Share of dates used for training (default: 0.7)")
+    parser.add_argument("--error-penalty", type=float, default=0.01,
+                        help="Objective cost per 1%% of price error (default: 0.01)")
+    parser.add_argument("--min-coverage", type=float, default=0.2,
+                        help="Minimum share of windows called BULLISH/BEARISH (default: 0.2)")
+    parser.add_argument("--out-dir", default=config.PREDICTOR_PARAMS_DIR,
+                        help="Directory for predictor-vN.json (default: PREDICTOR_PARAMS_DIR)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Print the result without writing a parameter file")
+    return parser.parse_args(argv)
+
+
+def get_features(args) -> dict:
+    if args.features_cache and os.path.exists(args.features_cache):
+        features = load_features(args.features_cache)
+        meta = features["meta"]
+        if meta["period"] == args.period and (args.horizon is None
+                                              or meta["horizon"] == args.horizon):
+            logger.info(f"Loaded {features['current'].size} windows from {args.features_cache}")
+            return features
+        logger.info("Feature cache was built for other settings; rebuilding")
+
+    tickers = load_tickers(args)
+    if not tickers:
+        raise SystemExit("No tickers given (use --tickers or --tickers-file).")
+    frames   = build_stock_service().fetch_history_many(tickers, args.history)
+    features = build_features(frames, args.period, args.horizon, args.workers)
+    if args.features_cache:
+        save_features(args.features_cache, features)
+        logger.info(f"Features cached to {args.features_cache}")
+    return features
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO,
+                        format="%(asctime)s [%(levelname)s] %(name)s — %(message)s")
+    args     = parse_args(argv)
+    features = get_features(args)
+
+    optimizer = ParamOptimizer(features, workers=args.workers,
+                               train_fraction=args.train_fraction,
+                               error_penalty=args.error_penalty,
+                               min_coverage=args.min_coverage)
+    result = optimizer.search(trials=args.trials, seed=args.seed)
+
+    if not args.dry_run:
+        path = ParamOptimizer.write_params(result, args.out_dir)
+        logger.info(f"Parameters written to {path}")
+    sys.stdout.write(json.dumps(result, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
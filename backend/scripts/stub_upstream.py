@@ -0,0 +1,221 @@
+"""
+==============================================================================
+scripts/stub_upstream.py
+==============================================================================
+Responsibility : Local stand-in for the upstream market-data API, with
+                 artificial latency, for load tests (scripts/loadtest.py).
+
+Usage (from backend/):
+    python -m scripts.stub_upstream --port 8900 --latency-ms 120 --jitter-ms 40
+    python -m scripts.stub_upstream --fixture-dir data/fixtures \\
+                                    --latency-file data/fixtures/latency.json
+
+    # then point the API at it
+    MARKET_DATA_PROVIDER=http MARKET_DATA_URL=http://127.0.0.1:8900 python app.py
+
+Serves the protocol of services.market_data.HttpProvider. Bars come from a
+fixture directory (FixtureProvider layout) or, by default, are synthetic:
+~5 years of daily bars per ticker, seeded by the symbol, so any valid
+ticker exists and every run serves the same data.
+==============================================================================
+"""
+
+import argparse
+import json
+import logging
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from scripts.benchmark import synthetic_ohlcv
+from services.market_data import FixtureProvider, PERIOD_OFFSETS
+from utils.serializer import date_labels, dump_json
+
+logger = logging.getLogger(__name__)
+
+SYNTHETIC_BARS = 1300            # a little over the longest period (5y)
+
+
+class SyntheticSource:
+    """Deterministic synthetic bars and meta for any ticker."""
+
+    def __init__(self, bars: int = SYNTHETIC_BARS):
+        self.bars    = bars
+        self._frames = {}
+        self._lock   = threading.Lock()
+
+    def history_many(self, tickers: list, period: str | None = None,
+                     start: str | None = None) -> dict:
+        return {t: self._window(self._frame(t), period, start) for t in tickers}
+
+    def meta(self, ticker: str) -> dict:
+        df = self._frame(ticker)
+        return {
+            "longName"        : f"{ticker.split('.')[0].title()} Synthetic Ltd",
+            "sector"          : "Synthetic",
+            "industry"        : "Load Testing",
+            "marketCap"       : int(df["Close"].iloc[-1] * 1e9),
+            "trailingPE"      : 21.5,
+            "fiftyTwoWeekHigh": float(df["High"].iloc[-252:].max()),
+            "fiftyTwoWeekLow" : float(df["Low"].iloc[-252:].min()),
+            "currency"        : "INR",
+            "exchange"        : "NSE",
+        }
+
+    def _frame(self, ticker: str) -> pd.DataFrame:
+        with self._lock:
+            if ticker not in self._frames:
+                self._frames[ticker] = synthetic_ohlcv(
+                    self.bars, seed=zlib.crc32(ticker.encode()),
+                    start_price=float(100 + zlib.crc32(ticker.encode()) % 4900))
+            return self._frames[ticker]
+
+    @staticmethod
+    def _window(df: pd.DataFrame, period: str | None, start: str | None) -> pd.DataFrame:
+        if start:
+            return df[df.index >= pd.Timestamp(start)]
+        if period in PERIOD_OFFSETS:
+            return df[df.index >= df.index[-1] - PERIOD_OFFSETS[period]]
+        return df
+
+
+class Latency:
+    """
+    Artificial upstream delay per call kind ("history" | "meta"): samples
+    from a recorded latency file (FixtureProvider format) when given, else
+    normal(latency_ms, jitter_ms) clipped at zero.
+    """
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 samples: dict | None = None, seed: int | None = None):
+        self.latency_ms = latency_ms
+        self.jitter_ms  = jitter_ms
+        self.samples    = samples or {}
+        self._rng       = np.random.default_rng(seed)
+        self._lock      = threading.Lock()
+
+    def sleep(self, kind: str):
+        with self._lock:                       # Generator is not thread-safe
+            if self.samples.get(kind):
+                ms = float(self._rng.choice(self.samples[kind]))
+            else:
+                ms = self._rng.normal(self.latency_ms, self.jitter_ms) if self.jitter_ms \
+                     else self.latency_ms
+        if ms > 0:
+            time.sleep(ms / 1000.0)
+
+
+def make_handler(source, latency: Latency, error_rate: float = 0.0, seed: int | None = None):
+    rng  = np.random.default_rng(None if seed is None else seed + 1)
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"            # keep-alive for the client pool
+
+        def do_GET(self):
+            url    = urlsplit(self.path)
+            params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+            if url.path == "/health":
+                return self._send(200, {"status": "ok"})
+            if url.path not in ("/history", "/meta"):
+                return self._send(404, {"error": "not found"})
+
+            kind = url.path.strip("/")
+            latency.sleep(kind)
+            with lock:
+                failed = error_rate > 0 and rng.random() < error_rate
+            if failed:
+                return self._send(503, {"error": "injected failure"})
+
+            if kind == "meta":
+                try:
+                    return self._send(200, source.meta(params.get("ticker", "")))
+                except Exception as e:
+                    return self._send(404, {"error": str(e)})
+
+            tickers = [t for t in params.get("tickers", "").split(",") if t]
+            frames  = source.history_many(tickers, period=params.get("period"),
+                                          start=params.get("start"))
+            return self._send(200, {t: _frame_dict(df) for t, df in frames.items()})
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status: int, body):
+            data = dump_json(body)
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    return Handler
+
+
+def serve(host: str = "127.0.0.1", port: int = 8900, fixture_dir: str | None = None,
+          latency: Latency | None = None, error_rate: float = 0.0,
+          seed: int | None = None) -> ThreadingHTTPServer:
+    """Build the stub server (call serve_forever() on the result)."""
+    source = FixtureProvider(fixture_dir) if fixture_dir else SyntheticSource()
+    server = ThreadingHTTPServer((host, port),
+                                 make_handler(source, latency or Latency(), error_rate, seed))
+    server.daemon_threads = True
+    return server
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Stub upstream market-data server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--fixture-dir", help="Serve these fixtures instead of synthetic bars")
+    parser.add_argument("--latency-ms", type=float, default=0.0,
+                        help="Mean added delay per call (default: 0)")
+    parser.add_argument("--jitter-ms", type=float, default=0.0,
+                        help="Standard deviation of the delay (default: 0)")
+    parser.add_argument("--latency-file",
+                        help="Recorded latency samples {kind: [ms, ...]}; overrides --latency-ms")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Share of calls answered 503 (default: 0)")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO,
+                        format="%(asctime)s [%(levelname)s] %(name)s — %(message)s")
+    args    = parse_args(argv)
+    samples = None
+    if args.latency_file:
+        with open(args.latency_file, "r", encoding="utf-8") as fh:
+            samples = json.load(fh)
+    server = serve(args.host, args.port, args.fixture_dir,
+                   Latency(args.latency_ms, args.jitter_ms, samples, args.seed),
+                   args.error_rate, args.seed)
+    logger.info(f"Stub upstream on http://{args.host}:{args.port} "
+                f"({args.fixture_dir or 'synthetic'}, {args.latency_ms}±{args.jitter_ms} ms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+# ─── Private helpers ──────────────────────────────────────────────────────────
+
+def _frame_dict(df: pd.DataFrame) -> dict:
+    if df is None or df.empty:
+        return {"dates": []}
+    return {"dates": date_labels(df.index),
+            **{c.lower(): df[c].to_numpy(dtype=np.float64).tolist()
+               for c in ("Open", "High", "Low", "Close", "Volume")}}
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+"""
+==============================================================================
+services/backtest_service.py
+==============================================================================
+Responsibility : Walk-forward evaluation of the prediction pipeline.
+
+At every historical bar t of every ticker, the engine rebuilds what
+/api/predict would have seen on that day — the last `lookback` bars up to
+and including t — runs IndicatorService + PredictionService on it, and
+compares the forecast with the close HORIZON bars later.
+
+Vectorisation:
+  ─ Each (ticker, t) window is one column of a lookback × windows matrix,
+    so IndicatorService.universe_arrays() evaluates thousands of historical
+    days in a single NumPy pass (recursive indicators loop over the
+    `lookback` rows only, never over the full history).
+  ─ PredictionService.predict_many() scores all windows at once.
+  ─ Ticker chunks are spread over CPU cores with a process pool.
+
+Report:
+  ─ Direction hit rate (overall and per trend call)
+  ─ Error of predicted_price against the realised HORIZON-bar close
+  ─ Calibration of `confidence` against realised hit rates
+==============================================================================
+"""
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from services.indicator_service import IndicatorService
+from services.prediction_service import PredictionService
+
+logger = logging.getLogger(__name__)
+
+
+# Approximate trading bars in each /api/predict `period` window
+PERIOD_BARS = {"1mo": 21, "3mo": 63, "6mo": 126, "1y": 252, "2y": 504, "5y": 1260}
+
+# Confidence buckets for the calibration table (confidence is clipped to 20–92)
+CONFIDENCE_BINS = [20, 30, 40, 50, 60, 70, 80, 92]
+
+# Trend labels are shipped between processes as small integers
+_TREND_CODES = {"BEARISH": -1, "NEUTRAL": 0, "BULLISH": 1}
+
+
+def window_features(close: np.ndarray, high: np.ndarray, low: np.ndarray,
+                    volume: np.ndarray, lookback: int,
+                    indicator_svc: IndicatorService | None = None) -> dict:
+    """
+    Prediction inputs for every `lookback`-bar window of one ticker.
+
+    Args:
+        close, high, low, volume : (n_bars,) arrays in date order
+        lookback                 : bars per window (see PERIOD_BARS)
+
+    Returns:
+        {"end": (W,) index of each window's last bar,
+         "current": (W,) close at that bar,
+         "obv_trend": (W,),
+         <REQUIRED_INDICATORS field>: (W,) rounded like compute_all()}
+        with W = n_bars − lookback + 1 (empty if the history is shorter).
+    """
+    indicator_svc = indicator_svc or IndicatorService()
+    n_windows = len(close) - lookback + 1
+    if n_windows <= 0:
+        empty = np.empty(0)
+        return {"end": np.empty(0, dtype=np.int64), "current": empty, "obv_trend": empty,
+                **{k: empty for k in PredictionService.REQUIRED_INDICATORS}}
+
+    def _windows(a):   # (lookback, W): column j = bars j .. j+lookback-1
+        return sliding_window_view(np.asarray(a, dtype=np.float64), lookback).T
+
+    latest, _, obv_trend = indicator_svc.universe_arrays(
+        _windows(close), _windows(high), _windows(low), _windows(volume))
+
+    features = {k: np.round(latest[k], 4) for k in PredictionService.REQUIRED_INDICATORS}
+    features["end"]       = np.arange(lookback - 1, len(close))
+    features["current"]   = np.asarray(close[lookback - 1:], dtype=np.float64)
+    features["obv_trend"] = obv_trend
+    return features
+
+
+def replay_chunk(chunk: list, lookback: int, horizon: int) -> list:
+    """
+    Walk-forward replay for a few tickers (process-pool task).
+
+    Args:
+        chunk : [(ticker, dates_int64, close, high, low, volume), ...]
+
+    Returns:
+        [(ticker, samples)] with samples a dict of equal-length arrays:
+        date, current, predicted, change_pct, confidence, trend, realised.
+        `realised` is NaN where the HORIZON-bar outcome is not known yet.
+    """
+    indicator_svc  = IndicatorService()
+    prediction_svc = PredictionService()
+
+    out = []
+    for ticker, dates, close, high, low, volume in chunk:
+        feats = window_features(close, high, low, volume, lookback, indicator_svc)
+        if not len(feats["end"]):
+            continue
+
+        preds = prediction_svc.predict_many(
+            feats["current"],
+            {k: feats[k] for k in PredictionService.REQUIRED_INDICATORS},
+            feats["obv_trend"],
+        )
+
+        target   = feats["end"] + horizon
+        realised = np.full(len(target), np.nan)
+        known    = target < len(close)
+        realised[known] = close[target[known]]
+
+        out.append((ticker, {
+            "date"      : dates[feats["end"]],
+            "current"   : feats["current"],
+            "predicted" : preds["predicted_price"],
+            "change_pct": preds["change_pct"],
+            "confidence": preds["confidence"],
+            "trend"     : np.vectorize(_TREND_CODES.get, otypes=[np.int8])(preds["trend"]),
+            "realised"  : realised,
+        }))
+    return out
+
+
+class BacktestService:
+    """
+    Walk-forward backtester for PredictionService.
+
+    Usage:
+        frames = stock_svc.fetch_history_many(tickers, "5y")
+        report = BacktestService(workers=8).run(frames, period="3mo")
+    """
+
+    def __init__(self, workers: int | None = None, chunk_size: int = 8):
+        self.workers    = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+
+    # ─── Public API ──────────────────────────────────────────────────────────
+
+    def run(self, frames: dict, period: str = "3mo",
+            horizon: int | None = None) -> dict:
+        """
+        Replay the pipeline over every bar of every history and summarise.
+
+        Args:
+            frames  : {ticker: OHLCV DataFrame} — long histories (e.g. '5y')
+            period  : /api/predict window being simulated (see PERIOD_BARS)
+            horizon : bars ahead to score against (default: PredictionService.HORIZON)
+
+        Returns:
+            JSON-serialisable report (see summarise()).
+        """
+        lookback = PERIOD_BARS[period]
+        horizon  = horizon or PredictionService.HORIZON
+
+        samples = self.replay(frames, lookback, horizon)
+        report  = self.summarise(samples)
+        report.update({"period": period, "lookback": lookback, "horizon": horizon})
+        return report
+
+    def replay(self, frames: dict, lookback: int, horizon: int) -> dict:
+        """
+        Per-ticker sample arrays (see replay_chunk) for all frames, computed
+        on `self.workers` processes.
+        """
+        tasks = [self._task_row(t, df) for t, df in frames.items()
+                 if df is not None and len(df) >= lookback]
+        chunks = [tasks[i:i + self.chunk_size]
+                  for i in range(0, len(tasks), self.chunk_size)]
+
+        results = []
+        if self.workers <= 1 or len(chunks) <= 1:
+            for chunk in chunks:
+                results.extend(replay_chunk(chunk, lookback, horizon))
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                futures = [pool.submit(replay_chunk, c, lookback, horizon) for c in chunks]
+                for fut in futures:
+                    results.extend(fut.result())
+
+        logger.info(f"Backtest: replayed {len(results)} tickers, "
+                    f"{sum(len(s['date']) for _, s in results)} windows")
+        return dict(results)
+
+    def summarise(self, samples: dict) -> dict:
+        """
+        Aggregate replayed samples into hit-rate, error and calibration stats.
+        Only windows whose HORIZON-bar outcome is known are scored.
+        """
+        rows = {k: np.concatenate([s[k] for s in samples.values()]) if samples else np.empty(0)
+                for k in ("current", "predicted", "change_pct", "confidence",
+                          "trend", "realised")}
+        scored = ~np.isnan(rows["realised"])
+        r = {k: v[scored] for k, v in rows.items()}
+
+        realised_dir  = np.sign(r["realised"] - r["current"])
+        predicted_dir = np.sign(r["change_pct"])
+        hit = (predicted_dir == realised_dir) & (realised_dir != 0)
+
+        # ── Direction ─────────────────────────────────────────────────────
+        by_trend = {}
+        for label, code in _TREND_CODES.items():
+            mask = r["trend"] == code
+            by_trend[label] = {
+                "samples" : int(mask.sum()),
+                "hit_rate": self._rate(hit[mask]),
+            }
+        called = r["trend"] != 0
+
+        # ── Price error (as % of the price at forecast time) ─────────────
+        err_pct   = (r["predicted"] - r["realised"]) / r["current"] * 100
+        naive_pct = (r["current"] - r["realised"]) / r["current"] * 100
+
+        per_ticker = {}
+        for t, s in samples.items():
+            ok = ~np.isnan(s["realised"])
+            if not ok.any():
+                continue
+            t_dir = np.sign(s["realised"][ok] - s["current"][ok])
+            t_hit = (np.sign(s["change_pct"][ok]) == t_dir) & (t_dir != 0)
+            per_ticker[t] = {
+                "samples" : int(ok.sum()),
+                "hit_rate": self._rate(t_hit),
+                "mae_pct" : self._mean(np.abs(s["predicted"][ok] - s["realised"][ok])
+                                       / s["current"][ok] * 100),
+            }
+
+        return {
+            "tickers"  : len(samples),
+            "windows"  : int(len(scored)),
+            "scored"   : int(scored.sum()),
+            "direction": {
+                "hit_rate"        : self._rate(hit),
+                "called_hit_rate" : self._rate(hit[called]),
+                "called_share"    : self._rate(called),
+                "by_trend"        : by_trend,
+            },
+            "error": {
+                "mae_pct"       : self._mean(np.abs(err_pct)),
+                "rmse_pct"      : self._rms(err_pct),
+                "bias_pct"      : self._mean(err_pct),
+                "naive_mae_pct" : self._mean(np.abs(naive_pct)),
+            },
+            "calibration": self._calibration(r["confidence"], hit),
+            "per_ticker" : per_ticker,
+        }
+
+    # ─── Private helpers ─────────────────────────────────────────────────────
+
+    @staticmethod
+    def _task_row(ticker: str, df: pd.DataFrame) -> tuple:
+        """Plain arrays for one ticker (cheap to pickle to a worker)."""
+        df = df.ffill()
+        return (ticker,
+                df.index.values.astype("datetime64[D]").astype(np.int64),
+                df["Close"].to_numpy(np.float64), df["High"].to_numpy(np.float64),
+                df["Low"].to_numpy(np.float64), df["Volume"].to_numpy(np.float64))
+
+    def _calibration(self, confidence: np.ndarray, hit: np.ndarray) -> dict:
+        """Hit rate per confidence bucket plus expected calibration error."""
+        buckets, ece = [], 0.0
+        idx = np.clip(np.digitize(confidence, CONFIDENCE_BINS[1:-1]), 0, len(CONFIDENCE_BINS) - 2)
+        for b in range(len(CONFIDENCE_BINS) - 1):
+            mask = idx == b
+            n    = int(mask.sum())
+            mean_conf = self._mean(confidence[mask])
+            hit_rate  = self._rate(hit[mask])
+            if n:
+                ece += n / len(confidence) * abs(hit_rate - mean_conf / 100)
+            buckets.append({
+                "range"          : [CONFIDENCE_BINS[b], CONFIDENCE_BINS[b + 1]],
+                "samples"        : n,
+                "mean_confidence": mean_conf,
+                "hit_rate"       : hit_rate,
+            })
+        return {"buckets": buckets, "ece": round(ece, 4)}
+
+    @staticmethod
+    def _rate(mask: np.ndarray) -> float | None:
+        return round(float(mask.mean()), 4) if len(mask) else None
+
+    @staticmethod
+    def _mean(values: np.ndarray) -> float | None:
+        return round(float(values.mean()), 4) if len(values) else None
+
+    @staticmethod
+    def _rms(values: np.ndarray) -> float | None:
+        return round(float(np.sqrt((values ** 2).mean())), 4) if len(values) else None
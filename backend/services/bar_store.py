@@ -0,0 +1,223 @@
+"""
+==============================================================================
+services/bar_store.py
+==============================================================================
+Responsibility : Persistent on-disk OHLCV store used by StockService so that
+                 repeat history requests only fetch the bars that are new
+                 since the last download.
+
+Layout (one pair of files per ticker under BAR_STORE_DIR):
+  ─ <TICKER>.npy  : float64 matrix of shape (6, n_bars), one contiguous row
+                    per column → [epoch_seconds, Open, High, Low, Close, Volume].
+                    Opened with np.load(mmap_mode="r") so a read only touches
+                    the pages of the requested date range.
+  ─ <TICKER>.json : sidecar with the earliest date the store is known to
+                    cover ("covered_from") and the last write time.
+
+Writes go to a temp file followed by os.replace(), so concurrent readers
+(other threads or gunicorn workers) always see a complete file.
+==============================================================================
+"""
+
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class BarStore:
+    """
+    Columnar, memory-mapped daily bar store keyed by ticker.
+
+    Design notes:
+    - Dates are stored as UTC epoch seconds (exact in float64).
+    - Frames handed out are fresh copies; the mmap is never exposed.
+    - Overlapping dates on append are replaced by the newer bars, which is
+      how a partial (intraday) last bar gets refreshed.
+    """
+
+    COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+    # Characters allowed in a ticker-derived file name
+    _SAFE_NAME = re.compile(r"[^A-Z0-9._-]")
+
+    def __init__(self, root: str):
+        self.root   = root
+        self._locks = {}
+        self._guard = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    # ─── Public API ──────────────────────────────────────────────────────────
+
+    def read(self, ticker: str, start: pd.Timestamp | None = None) -> pd.DataFrame | None:
+        """
+        Load stored bars for a ticker, optionally from `start` onwards.
+
+        Returns:
+            DataFrame shaped like StockService.fetch_history output,
+            or None if nothing is stored for this ticker.
+        """
+        path = self._data_path(ticker)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            mat = np.load(path, mmap_mode="r")
+        except Exception as e:
+            logger.warning(f"BarStore: unreadable file for {ticker}: {e}")
+            return None
+
+        first = 0
+        if start is not None:
+            first = int(np.searchsorted(mat[0], self._to_epoch(start), side="left"))
+
+        block = np.array(mat[:, first:])  # copy the slice out of the mmap
+        del mat
+
+        index = pd.to_datetime(block[0], unit="s")
+        index.name = "Date"
+        return pd.DataFrame(
+            {col: block[i + 1] for i, col in enumerate(self.COLUMNS)},
+            index=index,
+        )
+
+    def covered_from(self, ticker: str) -> pd.Timestamp | None:
+        """Earliest date the stored history is known to be complete from."""
+        meta = self._read_meta(ticker)
+        if not meta or not meta.get("covered_from"):
+            return None
+        return pd.Timestamp(meta["covered_from"])
+
+    def last_date(self, ticker: str) -> pd.Timestamp | None:
+        """Date of the most recent stored bar, or None."""
+        path = self._data_path(ticker)
+        if not os.path.exists(path):
+            return None
+        try:
+            mat = np.load(path, mmap_mode="r")
+            if mat.shape[1] == 0:
+                return None
+            return pd.to_datetime(float(mat[0, -1]), unit="s")
+        except Exception:
+            return None
+
+    def write(self, ticker: str, df: pd.DataFrame, covered_from: pd.Timestamp):
+        """
+        Replace the stored history for a ticker with `df`.
+
+        Args:
+            covered_from : Start of the window `df` was downloaded for. A
+                           later request starting on/after this date can be
+                           served from the store without a full download.
+        """
+        with self._lock_for(ticker):
+            self._write_matrix(ticker, self._to_matrix(df))
+            self._write_meta(ticker, covered_from)
+
+    def append(self, ticker: str, delta: pd.DataFrame) -> pd.DataFrame | None:
+        """
+        Merge newly downloaded bars into the stored history.
+
+        Bars in `delta` replace any stored bars on the same or later dates.
+
+        Returns:
+            The full merged history (or None if nothing was stored).
+        """
+        with self._lock_for(ticker):
+            stored = self.read(ticker)
+            if stored is None:
+                return None
+            if delta is None or delta.empty:
+                return stored
+
+            delta  = self._normalise_index(delta)
+            keep   = stored[stored.index < delta.index[0]]
+            merged = pd.concat([keep, delta[self.COLUMNS]])
+            self._write_matrix(ticker, self._to_matrix(merged))
+            self._write_meta(ticker, self.covered_from(ticker))
+            return merged
+
+    # ─── Private helpers ─────────────────────────────────────────────────────
+
+    def _lock_for(self, ticker: str) -> threading.Lock:
+        with self._guard:
+            return self._locks.setdefault(ticker, threading.Lock())
+
+    def _data_path(self, ticker: str) -> str:
+        return os.path.join(self.root, self._file_stem(ticker) + ".npy")
+
+    def _meta_path(self, ticker: str) -> str:
+        return os.path.join(self.root, self._file_stem(ticker) + ".json")
+
+    def _file_stem(self, ticker: str) -> str:
+        return self._SAFE_NAME.sub("_", ticker.upper())
+
+    def _read_meta(self, ticker: str) -> dict | None:
+        try:
+            with open(self._meta_path(ticker), "r", encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, ticker: str, covered_from: pd.Timestamp | None):
+        meta = {
+            "covered_from": covered_from.isoformat() if covered_from is not None else None,
+            "updated_at"  : time.time(),
+        }
+        self._atomic_write(self._meta_path(ticker),
+                           json.dumps(meta).encode("utf-8"))
+
+    def _write_matrix(self, ticker: str, mat: np.ndarray):
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                np.save(fh, mat)
+            os.replace(tmp, self._data_path(ticker))
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def _atomic_write(self, path: str, payload: bytes):
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(payload)
+            os.replace(tmp, path)
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def _to_matrix(self, df: pd.DataFrame) -> np.ndarray:
+        df  = self._normalise_index(df)
+        mat = np.empty((len(self.COLUMNS) + 1, len(df)), dtype=np.float64)
+        mat[0] = df.index.values.astype("datetime64[s]").astype(np.int64)
+        for i, col in enumerate(self.COLUMNS):
+            mat[i + 1] = df[col].to_numpy(dtype=np.float64)
+        return mat
+
+    @staticmethod
+    def _normalise_index(df: pd.DataFrame) -> pd.DataFrame:
+        """Strip timezone info and sort, so epoch conversion is stable."""
+        if getattr(df.index, "tz", None) is not None:
+            df = df.copy()
+            df.index = df.index.tz_localize(None)
+        if not df.index.is_monotonic_increasing:
+            df = df.sort_index()
+        return df
+
+    @staticmethod
+    def _to_epoch(ts: pd.Timestamp) -> float:
+        ts = pd.Timestamp(ts)
+        if ts.tzinfo is not None:
+            ts = ts.tz_localize(None)
+        return float(ts.value // 10**9)
@@ -0,0 +1,304 @@
+"""
+==============================================================================
+services/cache.py
+==============================================================================
+Responsibility : In-process TTL + LRU cache shared by the service layer.
+
+Features:
+  ─ Per-call TTL, so each StockService method keeps its own freshness window
+  ─ Eviction by entry count AND approximate byte size (LRU order)
+  ─ Single-flight loading: concurrent misses on the same key wait for one
+    loader call instead of each hitting the upstream provider, also when
+    the key is part of a batched load (get_or_load_many)
+  ─ Hit / miss / eviction counters for sizing
+  ─ Optional `shared` tier (services/shared_cache.py): misses are looked up
+    there before loading, and loads / sets are written through, so other
+    worker processes on the host reuse them
+  ─ export() / restore() of the live entries, so services/cache_snapshot.py
+    can carry them across a restart
+==============================================================================
+"""
+
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class _Flight:
+    """A loader call in progress; waiters block on `done`."""
+
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done  = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class TTLCache:
+    """
+    Thread-safe TTL/LRU cache with request coalescing.
+
+    Cached values are shared between callers and must be treated as
+    read-only (copy a DataFrame before mutating it).
+    """
+
+    def __init__(self, max_entries: int = 512, max_bytes: int = 64 * 1024 * 1024,
+                 shared=None):
+        self.max_entries = max_entries
+        self.max_bytes   = max_bytes
+        self.shared      = shared        # SharedCache (cross-process) or None
+
+        self._entries  = OrderedDict()   # key → (expires_at, size, value)
+        self._inflight = {}              # key → _Flight
+        self._bytes    = 0
+        self._lock     = threading.Lock()
+
+        self._stats = {
+            "hits"       : 0,
+            "misses"     : 0,
+            "coalesced"  : 0,
+            "evictions"  : 0,
+            "expirations": 0,
+            "load_errors": 0,
+        }
+
+    # ─── Public API ──────────────────────────────────────────────────────────
+
+    def get_or_load(self, key, loader, ttl: float):
+        """
+        Return the cached value for `key`, calling `loader()` on a miss.
+
+        If another thread is already loading the same key, wait for its
+        result instead of calling the loader again. Loader exceptions are
+        propagated to every waiter and are never cached.
+        """
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                self._stats["hits"] += 1
+                return value
+
+            flight = self._inflight.get(key)
+            if flight is not None:
+                self._stats["coalesced"] += 1
+                leader = False
+            else:
+                self._stats["misses"] += 1
+                flight = self._inflight[key] = _Flight()
+                leader = True
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            if self.shared is not None:
+                # Shared tier coalesces across processes and stores the result
+                flight.value, ttl = self.shared.get_or_load(key, loader, ttl)
+            else:
+                flight.value = loader()
+            self._insert(key, flight.value, ttl)
+            return flight.value
+        except Exception as e:
+            flight.error = e
+            with self._lock:
+                self._stats["load_errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+    def get_or_load_many(self, keys, loader, ttl: float) -> dict:
+        """
+        get_or_load for several keys with one batched `loader(missing)` call,
+        which returns {key: value} for every key in `missing`.
+
+        The keys this call loads are in flight for other callers (single or
+        batched), and keys already in flight elsewhere are waited for rather
+        than loaded again. Returns {key: value} in `keys` order.
+        """
+        keys = list(dict.fromkeys(keys))
+        values, led, waits = {}, {}, {}
+        with self._lock:
+            for key in keys:
+                found, value = self._lookup(key)
+                if found:
+                    self._stats["hits"] += 1
+                    values[key] = value
+                elif key in self._inflight:
+                    self._stats["coalesced"] += 1
+                    waits[key] = self._inflight[key]
+                else:
+                    self._stats["misses"] += 1
+                    led[key] = self._inflight[key] = _Flight()
+
+        if led:
+            self._load_many(led, loader, ttl, values)
+
+        # Only after our own flights are done, so two batches can't deadlock
+        for key, flight in waits.items():
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            values[key] = flight.value
+        return {key: values[key] for key in keys}
+
+    def get(self, key, default=None):
+        """Return a live cached value without loading, or `default`."""
+        with self._lock:
+            found, value = self._lookup(key)
+            self._stats["hits" if found else "misses"] += 1
+            if found:
+                return value
+
+        hit = self.shared.get(key) if self.shared is not None else None
+        if hit is None:
+            return default
+        value, ttl = hit
+        self._insert(key, value, ttl)
+        return value
+
+    def set(self, key, value, ttl: float):
+        """Insert/replace an entry (and write it through to the shared tier)."""
+        self._insert(key, value, ttl)
+        if self.shared is not None:
+            self.shared.set(key, value, ttl)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._remove(key)
+        if self.shared is not None:
+            self.shared.delete(key)
+
+    def export(self) -> list:
+        """Live local entries as [(key, ttl_left, value), ...], oldest use first."""
+        now = time.monotonic()
+        with self._lock:
+            return [(key, expires_at - now, value)
+                    for key, (expires_at, _, value) in self._entries.items()
+                    if expires_at > now]
+
+    def restore(self, entries) -> int:
+        """Insert export()-shaped entries locally (warm start); returns the count."""
+        restored = 0
+        for key, ttl_left, value in entries:
+            if ttl_left > 0:
+                self._insert(key, value, ttl_left)
+                restored += 1
+        return restored
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """Counters plus current occupancy and hit ratio."""
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            stats = {
+                **self._stats,
+                "entries"    : len(self._entries),
+                "bytes"      : self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes"  : self.max_bytes,
+                "hit_ratio"  : round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+            }
+        if self.shared is not None:
+            stats["shared"] = self.shared.stats()
+        return stats
+
+    # ─── Private helpers ─────────────────────────────────────────────────────
+
+    def _load_many(self, led: dict, loader, ttl: float, values: dict):
+        """Resolve the flights get_or_load_many leads, storing results in `values`."""
+        try:
+            todo = list(led)
+            if self.shared is not None:
+                for key in todo:
+                    hit = self.shared.get(key)
+                    if hit is not None:
+                        led[key].value = values[key] = hit[0]
+                        self._insert(key, hit[0], hit[1])
+                todo = [key for key in todo if key not in values]
+            if todo:
+                loaded = loader(todo)
+                for key in todo:
+                    led[key].value = values[key] = loaded[key]
+                    self.set(key, loaded[key], ttl)
+        except Exception as e:
+            for key, flight in led.items():
+                if key not in values:
+                    flight.error = e
+            with self._lock:
+                self._stats["load_errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                for key in led:
+                    self._inflight.pop(key, None)
+            for flight in led.values():
+                flight.done.set()
+
+    def _insert(self, key, value, ttl: float):
+        """Insert/replace a local entry and evict LRU entries to fit the limits."""
+        size = self._sizeof(value)
+        if size > self.max_bytes:
+            logger.info(f"TTLCache: value for {key!r} too large to cache ({size} B)")
+            return
+
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, size, value)
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries
+                                     or self._bytes > self.max_bytes):
+                old_key = next(iter(self._entries))
+                self._remove(old_key)
+                self._stats["evictions"] += 1
+
+    # ─── Private helpers (caller holds self._lock) ──────────────────────────
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, _, value = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self._stats["expirations"] += 1
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    @classmethod
+    def _sizeof(cls, value) -> int:
+        """Approximate in-memory footprint of a cached value in bytes."""
+        if isinstance(value, pd.DataFrame):
+            return int(value.memory_usage(index=True, deep=True).sum())
+        if isinstance(value, pd.Series):
+            return int(value.memory_usage(index=True, deep=True))
+        if isinstance(value, np.ndarray):
+            return int(value.nbytes)
+        if isinstance(value, dict):
+            return sys.getsizeof(value) + sum(
+                cls._sizeof(k) + cls._sizeof(v) for k, v in value.items())
+        if isinstance(value, (list, tuple)):
+            return sys.getsizeof(value) + sum(cls._sizeof(v) for v in value)
+        return sys.getsizeof(value)
@@ -0,0 +1,118 @@
+"""
+==============================================================================
+services/cache_snapshot.py
+==============================================================================
+Responsibility : Persist the process's hot state to one local file and load
+                 it back on boot, so a restarted (or woken) instance does not
+                 start from an empty cache.
+
+What is saved:
+  ─ Every live TTLCache entry (recent histories, meta, quotes) with its
+    wall-clock expiry; on load, entries that expired meanwhile are skipped
+    without being decoded.
+  ─ A small `state` dict from the caller (app.py: the published trending /
+    top dashboard snapshots).
+
+File format: one MessagePack map, values tagged by utils.serializer.pack_value.
+It is written to a temp file and renamed into place (a crash mid-save keeps
+the previous snapshot), and read back through a read-only memory map.
+==============================================================================
+"""
+
+import logging
+import mmap
+import os
+import tempfile
+import time
+
+from utils.serializer import pack_msgpack, pack_value, unpack_msgpack, unpack_value
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 1
+
+
+class CacheSnapshot:
+    """
+    Save / load a TTLCache (plus caller state) to a single file.
+
+    Usage:
+        snapshot = CacheSnapshot("data/warm-start.msgpack")
+        state    = snapshot.load(cache)                 # on boot
+        snapshot.save(cache, {"snapshots": snapshots})  # on a timer / at exit
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    # ─── Public API ──────────────────────────────────────────────────────────
+
+    def save(self, cache, state: dict | None = None) -> int:
+        """Write the live entries of `cache` and `state`; returns the entry count."""
+        now     = time.time()
+        entries = []
+        for key, ttl_left, value in cache.export():
+            try:
+                entries.append([list(key), now + ttl_left, pack_value(value)])
+            except (TypeError, ValueError) as e:
+                logger.debug(f"CacheSnapshot: skipping {key!r}: {e}")
+
+        payload = pack_msgpack({
+            "format"  : SNAPSHOT_FORMAT,
+            "saved_at": now,
+            "entries" : entries,
+            "state"   : state or {},
+        })
+        self._atomic_write(payload)
+        logger.info(f"CacheSnapshot: saved {len(entries)} entries "
+                    f"({len(payload) / 1024:.0f} KiB) to {self.path}")
+        return len(entries)
+
+    def load(self, cache) -> dict:
+        """
+        Restore unexpired entries into `cache` and return the saved state
+        ({} when there is no usable snapshot).
+        """
+        try:
+            with open(self.path, "rb") as fh, \
+                    mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                snap = unpack_msgpack(mapped)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:                    # empty / truncated / foreign file
+            logger.warning(f"CacheSnapshot: ignoring unreadable {self.path}: {e}")
+            return {}
+
+        if not isinstance(snap, dict) or snap.get("format") != SNAPSHOT_FORMAT:
+            logger.warning(f"CacheSnapshot: ignoring {self.path} (unknown format)")
+            return {}
+
+        now, live, skipped = time.time(), [], 0
+        for entry in snap.get("entries") or []:
+            try:
+                key, expires_at, blob = entry
+                if expires_at > now:
+                    live.append((tuple(key), expires_at - now, unpack_value(blob)))
+            except Exception as e:                # e.g. a value encoding that changed
+                skipped += 1
+                logger.debug(f"CacheSnapshot: skipping undecodable entry: {e}")
+        restored = cache.restore(live)
+        logger.info(f"CacheSnapshot: restored {restored}/{len(snap.get('entries') or [])} "
+                    f"entries ({skipped} undecodable) saved "
+                    f"{now - snap.get('saved_at', now):.0f}s ago")
+        return snap.get("state") or {}
+
+    # ─── Private helpers ─────────────────────────────────────────────────────
+
+    def _atomic_write(self, payload: bytes):
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)),
+                                   suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(payload)
+            os.replace(tmp, self.path)
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
@@ -0,0 +1,288 @@
+"""
+==============================================================================
+services/incremental_indicators.py
+==============================================================================
+Responsibility : Stateful, streaming counterpart of IndicatorService.
+
+Keeps running state per ticker so each new (or revised) daily bar updates
+every indicator in O(1), instead of recomputing the whole series:
+
+  ─ SMA-20 / SMA-50 / Bollinger σ : rolling sums (and sum of squares)
+  ─ EMA-12 / EMA-26 / MACD signal : EMA accumulators (adjust=False)
+  ─ RSI-14                        : Wilder gain/loss averages (pandas
+                                    adjust=True weighting, min_periods=14)
+  ─ ATR-14                        : EMA of true range
+  ─ OBV                           : cumulative signed volume
+  ─ Annualised volatility         : Welford mean/variance of daily returns
+  ─ 7d / 14d / 30d returns        : ring buffer of the last closes
+
+Scalars match IndicatorService.compute_all() to floating-point tolerance.
+==============================================================================
+"""
+
+import copy
+import logging
+import math
+import threading
+from collections import deque
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class _TickerState:
+    """Running accumulators for one ticker. Every field is O(1) in size."""
+
+    SMA_FAST, SMA_SLOW   = 20, 50
+    EMA_FAST, EMA_SLOW   = 12, 26
+    MACD_SIGNAL          = 9
+    RSI_PERIOD           = 14
+    ATR_PERIOD           = 14
+    BB_WINDOW, BB_STD    = 20, 2.0
+    RETURN_WINDOWS       = (7, 14, 30)
+    RESYNC_EVERY         = 256     # bars between exact re-sums of the windows
+
+    def __init__(self):
+        self.last_date  = None
+        self.n          = 0
+
+        # Closes needed for rolling windows and cumulative returns
+        self.closes     = deque(maxlen=max(self.SMA_SLOW, max(self.RETURN_WINDOWS) + 1))
+        self.anchor     = None     # closes are summed relative to this to limit cancellation
+        self.sum_fast   = 0.0
+        self.sumsq_fast = 0.0
+        self.sum_slow   = 0.0
+
+        self.ema_fast   = None
+        self.ema_slow   = None
+        self.macd_sig   = None
+
+        self.rsi_gain   = 0.0      # adjust=True EWM numerators; the shared
+        self.rsi_loss   = 0.0      # weight denominator cancels in gain/loss
+        self.rsi_last   = None     # most recent defined RSI (mirrors `_last`)
+
+        self.atr        = None
+        self.obv        = 0.0
+
+        self.ret_n      = 0        # Welford accumulators over daily returns
+        self.ret_mean   = 0.0
+        self.ret_m2     = 0.0
+
+    # ─── Update ──────────────────────────────────────────────────────────────
+
+    def push(self, high: float, low: float, close: float, volume: float):
+        prev_close = self.closes[-1] if self.closes else None
+
+        # ── Rolling sums (SMA-20/50, Bollinger) ───────────────────────────
+        if self.anchor is None:
+            self.anchor = close
+        x = close - self.anchor
+
+        if len(self.closes) >= self.SMA_FAST:
+            old = self.closes[-self.SMA_FAST] - self.anchor
+            self.sum_fast   -= old
+            self.sumsq_fast -= old * old
+        if len(self.closes) >= self.SMA_SLOW:
+            self.sum_slow -= self.closes[-self.SMA_SLOW] - self.anchor
+        self.sum_fast   += x
+        self.sumsq_fast += x * x
+        self.sum_slow   += x
+        self.closes.append(close)
+        if (self.n + 1) % self.RESYNC_EVERY == 0:
+            self._resync_sums()
+
+        # ── EMAs / MACD ───────────────────────────────────────────────────
+        self.ema_fast = self._ema_step(self.ema_fast, close, self.EMA_FAST)
+        self.ema_slow = self._ema_step(self.ema_slow, close, self.EMA_SLOW)
+        self.macd_sig = self._ema_step(self.macd_sig, self.ema_fast - self.ema_slow,
+                                       self.MACD_SIGNAL)
+
+        # ── RSI (pandas ewm(com=period-1, adjust=True)) ───────────────────
+        delta = close - prev_close if prev_close is not None else 0.0
+        decay = 1.0 - 1.0 / self.RSI_PERIOD
+        self.rsi_gain = max(delta, 0.0)  + decay * self.rsi_gain
+        self.rsi_loss = max(-delta, 0.0) + decay * self.rsi_loss
+        if self.n + 1 >= self.RSI_PERIOD and self.rsi_loss != 0:
+            rs = self.rsi_gain / self.rsi_loss
+            self.rsi_last = 100 - (100 / (1 + rs))
+
+        # ── ATR ───────────────────────────────────────────────────────────
+        if prev_close is None:
+            tr = high - low
+        else:
+            tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
+        self.atr = self._ema_step(self.atr, tr, self.ATR_PERIOD)
+
+        # ── OBV ───────────────────────────────────────────────────────────
+        if prev_close is not None:
+            if close > prev_close:
+                self.obv += volume
+            elif close < prev_close:
+                self.obv -= volume
+
+        # ── Daily-return variance (Welford) ───────────────────────────────
+        if prev_close:
+            r = close / prev_close - 1.0
+            self.ret_n    += 1
+            d              = r - self.ret_mean
+            self.ret_mean += d / self.ret_n
+            self.ret_m2   += d * (r - self.ret_mean)
+
+        self.n += 1
+
+    def clone(self) -> "_TickerState":
+        """Cheap copy (only the close buffer is mutable)."""
+        other = copy.copy(self)
+        other.closes = deque(self.closes, maxlen=self.closes.maxlen)
+        return other
+
+    def _resync_sums(self):
+        """Recompute the rolling sums exactly to stop float drift building up."""
+        fast = [c - self.anchor for c in list(self.closes)[-self.SMA_FAST:]]
+        slow = [c - self.anchor for c in list(self.closes)[-self.SMA_SLOW:]]
+        self.sum_fast   = math.fsum(fast)
+        self.sumsq_fast = math.fsum(v * v for v in fast)
+        self.sum_slow   = math.fsum(slow)
+
+    @staticmethod
+    def _ema_step(prev, value, span):
+        if prev is None:
+            return value
+        alpha = 2.0 / (span + 1)
+        return alpha * value + (1 - alpha) * prev
+
+    # ─── Read-out ────────────────────────────────────────────────────────────
+
+    def scalars(self) -> dict:
+        """Latest values in the same schema/rounding as compute_all()."""
+        n_close = len(self.closes)
+
+        sma20 = self.anchor + self.sum_fast / self.SMA_FAST if n_close >= self.SMA_FAST else None
+        sma50 = self.anchor + self.sum_slow / self.SMA_SLOW if n_close >= self.SMA_SLOW else None
+
+        bb_upper = bb_lower = None
+        if sma20 is not None:
+            mean_x = self.sum_fast / self.BB_WINDOW
+            var    = max((self.sumsq_fast - self.BB_WINDOW * mean_x * mean_x)
+                         / (self.BB_WINDOW - 1), 0.0)
+            std    = math.sqrt(var)
+            bb_upper = sma20 + self.BB_STD * std
+            bb_lower = sma20 - self.BB_STD * std
+
+        macd = self.ema_fast - self.ema_slow if self.ema_fast is not None else None
+
+        vol_ann = None
+        if self.ret_n >= 2:
+            vol_ann = math.sqrt(self.ret_m2 / (self.ret_n - 1)) * math.sqrt(252) * 100
+
+        def _cum_ret(n):
+            if n_close < n + 1:
+                return None
+            base = self.closes[-n - 1]
+            return round(((self.closes[-1] - base) / base) * 100, 4)
+
+        return {
+            "sma20"          : _r4(sma20),
+            "sma50"          : _r4(sma50),
+            "ema12"          : _r4(self.ema_fast),
+            "ema26"          : _r4(self.ema_slow),
+            "macd"           : _r4(macd),
+            "macd_signal"    : _r4(self.macd_sig),
+            "macd_hist"      : _r4(macd - self.macd_sig if macd is not None else None),
+            "rsi14"          : _r4(self.rsi_last),
+            "bb_upper"       : _r4(bb_upper),
+            "bb_middle"      : _r4(sma20),
+            "bb_lower"       : _r4(bb_lower),
+            "atr14"          : _r4(self.atr),
+            "obv"            : _r4(self.obv if self.n else None),
+            "volatility_ann" : _r4(vol_ann),
+            "return_7d"      : _cum_ret(7),
+            "return_14d"     : _cum_ret(14),
+            "return_30d"     : _cum_ret(30),
+        }
+
+
+def _r4(v):
+    return round(float(v), 4) if v is not None else None
+
+
+class IncrementalIndicatorEngine:
+    """
+    Per-ticker streaming indicator state.
+
+    Usage:
+        engine.seed("TCS.NS", history_df)                  # O(n), once
+        engine.update("TCS.NS", date, {"High": .., ...})   # O(1) per bar
+
+    A bar dated on the current last date revises that bar (intraday update);
+    a later date appends a new bar; an earlier date is ignored.
+    """
+
+    def __init__(self):
+        self._states = {}   # ticker → (state before last bar, state after last bar)
+        self._lock   = threading.Lock()
+
+    # ─── Public API ──────────────────────────────────────────────────────────
+
+    def seed(self, ticker: str, df: pd.DataFrame) -> dict:
+        """(Re)build a ticker's state from a full OHLCV history."""
+        bars = list(zip(df.index, df["High"].to_numpy(float), df["Low"].to_numpy(float),
+                        df["Close"].to_numpy(float), df["Volume"].to_numpy(float)))
+
+        prev, cur = None, _TickerState()
+        for i, (date, high, low, close, volume) in enumerate(bars):
+            if i == len(bars) - 1:
+                prev = cur.clone()   # kept so the last bar can be revised
+            cur.push(high, low, close, volume)
+            cur.last_date = pd.Timestamp(date)
+
+        with self._lock:
+            self._states[ticker] = (prev, cur)
+        return cur.scalars()
+
+    def update(self, ticker: str, date, bar) -> dict | None:
+        """
+        Apply one bar (mapping with High/Low/Close/Volume) in O(1).
+
+        Returns:
+            The refreshed scalar dict, or None if the ticker has never been
+            seeded or the bar is older than the latest one.
+        """
+        date = pd.Timestamp(date)
+        with self._lock:
+            pair = self._states.get(ticker)
+            if pair is None:
+                return None
+            prev, cur = pair
+
+            if cur.last_date is not None and date < cur.last_date:
+                return None
+            if cur.last_date is not None and date == cur.last_date:
+                if prev is None:    # first bar revised → start over
+                    prev = _TickerState()
+                base = prev
+            else:
+                base = cur
+
+            new = base.clone()
+            new.push(float(bar["High"]), float(bar["Low"]),
+                     float(bar["Close"]), float(bar["Volume"]))
+            new.last_date = date
+            self._states[ticker] = (base, new)
+            return new.scalars()
+
+    def snapshot(self, ticker: str) -> dict | None:
+        """Current scalars for a ticker without applying a bar."""
+        with self._lock:
+            pair = self._states.get(ticker)
+            return pair[1].scalars() if pair else None
+
+    def last_date(self, ticker: str) -> pd.Timestamp | None:
+        with self._lock:
+            pair = self._states.get(ticker)
+            return pair[1].last_date if pair else None
+
+    def reset(self, ticker: str):
+        with self._lock:
+            self._states.pop(ticker, None)
@@ -12,6 +12,11 @@ Indicators implemented:
   ─ Volatility     : Bollinger Bands (20,2), ATR-14, Daily Volatility %
   ─ Volume         : OBV (On-Balance Volume), Volume SMA-20
   ─ Returns        : Daily returns, 7d / 14d / 30d cumulative returns
+
+compute_all() works on one ticker's DataFrame through a small dependency
+graph (see _NODES) so shared intermediates are computed once and a field
+subset only evaluates what it needs. compute_universe() computes the same
+schema for a whole date × ticker matrix in column-wise NumPy passes.
 ==============================================================================
 """
 
@@ -19,6 +24,8 @@ import numpy as np
 import pandas as pd
 import logging
 
+from utils.serializer import round_list
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,97 +35,56 @@ class IndicatorService:
     No I/O; all methods are deterministic given the same input.
     """
 
-    def compute_all(self, df: pd.DataFrame) -> dict:
+    # Output fields of compute_all(), in response order
+    FIELDS = ["sma20", "sma50", "ema12", "ema26", "macd", "macd_signal",
+              "macd_hist", "rsi14", "bb_upper", "bb_middle", "bb_lower",
+              "atr14", "obv", "volatility_ann", "return_7d", "return_14d",
+              "return_30d"]
+
+    # Keys of compute_all()["series"], in output order
+    SERIES_KEYS = ["sma20", "sma50", "ema12", "ema26", "bb_upper", "bb_lower",
+                   "rsi14", "macd", "macd_signal"]
+
+    # Selector aliases accepted alongside plain field names
+    FIELD_GROUPS = {
+        "macd"     : ["macd", "macd_signal", "macd_hist"],
+        "bollinger": ["bb_upper", "bb_middle", "bb_lower"],
+        "returns"  : ["return_7d", "return_14d", "return_30d"],
+    }
+
+    def compute_all(self, df: pd.DataFrame, fields: list | None = None) -> dict:
         """
         Master method. Computes and returns all indicators as a serialisable dict.
 
         Args:
-            df : DataFrame with at minimum [Close, High, Low, Volume] columns.
+            df     : DataFrame with at minimum [Close, High, Low, Volume] columns.
+            fields : Optional subset of FIELDS; only the graph nodes those
+                     fields depend on are evaluated.
 
         Returns:
             Dict suitable for JSON serialisation (no NaN, no Timestamps).
         """
-        close  = df["Close"]
-        high   = df["High"]
-        low    = df["Low"]
-        volume = df["Volume"]
-
-        # ── Moving Averages ───────────────────────────────────────────────
-        sma20 = self._sma(close, 20)
-        sma50 = self._sma(close, 50)
-        ema12 = self._ema(close, 12)
-        ema26 = self._ema(close, 26)
-
-        # ── MACD ──────────────────────────────────────────────────────────
-        macd_line, signal_line, histogram = self._macd(close)
+        return self.evaluate(df).to_dict(fields)
 
-        # ── RSI ───────────────────────────────────────────────────────────
-        rsi14 = self._rsi(close, 14)
-
-        # ── Bollinger Bands ───────────────────────────────────────────────
-        bb_upper, bb_middle, bb_lower = self._bollinger(close, 20, 2)
-
-        # ── ATR ───────────────────────────────────────────────────────────
-        atr14 = self._atr(high, low, close, 14)
-
-        # ── OBV ───────────────────────────────────────────────────────────
-        obv = self._obv(close, volume)
-
-        # ── Returns ───────────────────────────────────────────────────────
-        daily_returns = close.pct_change().dropna()
-        vol_pct       = round(float(daily_returns.std() * np.sqrt(252) * 100), 4)  # annualised %
+    def evaluate(self, df: pd.DataFrame) -> "IndicatorSet":
+        """
+        Lazily evaluated indicator graph over `df`.
 
-        def _cum_ret(n):
-            if len(close) < n + 1:
-                return None
-            return round(((float(close.iloc[-1]) - float(close.iloc[-n-1]))
-                          / float(close.iloc[-n-1])) * 100, 4)
+        Intermediates (EMA-12/26, the 20-period mean, OBV, ...) are computed
+        at most once and shared by every field and caller that reads them.
+        """
+        return IndicatorSet(df)
 
-        # ── Serialise: return only the most recent scalar or short series ─
-        def _last(series):
-            """Return most-recent non-NaN value as float, or None."""
-            s = series.dropna()
-            return round(float(s.iloc[-1]), 4) if not s.empty else None
+    def expand_fields(self, names: list) -> list:
+        """Resolve selector names / group aliases to FIELDS, in FIELDS order."""
+        wanted = set()
+        for name in names:
+            wanted.update(self.FIELD_GROUPS.get(name, [name]))
+        return [f for f in self.FIELDS if f in wanted]
 
-        def _series_tail(series, n=60):
-            """Return last n values as a list for chart overlays."""
-            s = series.dropna()
-            vals = s.tail(n).tolist()
-            return [round(float(v), 2) if not np.isnan(v) else None for v in vals]
-
-        return {
-            # ── Scalars (latest value) ─────────────────────────────────
-            "sma20"          : _last(sma20),
-            "sma50"          : _last(sma50),
-            "ema12"          : _last(ema12),
-            "ema26"          : _last(ema26),
-            "macd"           : _last(macd_line),
-            "macd_signal"    : _last(signal_line),
-            "macd_hist"      : _last(histogram),
-            "rsi14"          : _last(rsi14),
-            "bb_upper"       : _last(bb_upper),
-            "bb_middle"      : _last(bb_middle),
-            "bb_lower"       : _last(bb_lower),
-            "atr14"          : _last(atr14),
-            "obv"            : _last(obv),
-            "volatility_ann" : vol_pct,
-            "return_7d"      : _cum_ret(7),
-            "return_14d"     : _cum_ret(14),
-            "return_30d"     : _cum_ret(30),
-
-            # ── Series (for chart overlay rendering) ──────────────────
-            "series": {
-                "sma20"     : _series_tail(sma20),
-                "sma50"     : _series_tail(sma50),
-                "ema12"     : _series_tail(ema12),
-                "ema26"     : _series_tail(ema26),
-                "bb_upper"  : _series_tail(bb_upper),
-                "bb_lower"  : _series_tail(bb_lower),
-                "rsi14"     : _series_tail(rsi14),
-                "macd"      : _series_tail(macd_line),
-                "macd_signal": _series_tail(signal_line),
-            }
-        }
+    def selectable_fields(self) -> set:
+        """Every name accepted by expand_fields()."""
+        return set(self.FIELDS) | set(self.FIELD_GROUPS)
 
     # ═══════════════════════════════════════════════════════════════════════════
     #  INDICATOR IMPLEMENTATIONS
@@ -134,23 +100,6 @@ class IndicatorService:
         """Exponential Moving Average (com-based, adjust=False for compatibility)."""
         return series.ewm(span=span, adjust=False).mean()
 
-    def _macd(self, series: pd.Series,
-              fast: int = 12, slow: int = 26, signal: int = 9):
-        """
-        MACD (Moving Average Convergence Divergence).
-
-        Formula:
-            MACD Line   = EMA(fast) − EMA(slow)
-            Signal Line = EMA(MACD Line, signal)
-            Histogram   = MACD Line − Signal Line
-        """
-        ema_fast   = self._ema(series, fast)
-        ema_slow   = self._ema(series, slow)
-        macd_line  = ema_fast - ema_slow
-        signal_ln  = self._ema(macd_line, signal)
-        histogram  = macd_line - signal_ln
-        return macd_line, signal_ln, histogram
-
     @staticmethod
     def _rsi(series: pd.Series, period: int = 14) -> pd.Series:
         """
@@ -169,20 +118,6 @@ class IndicatorService:
         rsi = 100 - (100 / (1 + rs))
         return rsi
 
-    @staticmethod
-    def _bollinger(series: pd.Series, window: int = 20,
-                   num_std: float = 2.0):
-        """
-        Bollinger Bands.
-
-        Upper = SMA + k*σ  |  Lower = SMA − k*σ  (k=2 by default)
-        """
-        sma    = series.rolling(window).mean()
-        std    = series.rolling(window).std()
-        upper  = sma + (num_std * std)
-        lower  = sma - (num_std * std)
-        return upper, sma, lower
-
     @staticmethod
     def _atr(high: pd.Series, low: pd.Series,
              close: pd.Series, period: int = 14) -> pd.Series:
@@ -212,4 +147,379 @@ class IndicatorService:
         """
         direction = np.sign(close.diff().fillna(0))
         obv       = (direction * volume).cumsum()
-        return obv
\ No newline at end of file
+        return obv
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    #  CROSS-SECTIONAL (UNIVERSE) COMPUTATION
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    @staticmethod
+    def align_frames(frames: dict):
+        """
+        Align per-ticker OHLCV DataFrames onto one shared date index.
+
+        Returns:
+            (dates, tickers, close, high, low, volume) where each matrix is a
+            float64 array of shape (n_dates, n_tickers). Dates before a
+            ticker's first bar are NaN.
+        """
+        tickers = [t for t, df in frames.items() if df is not None and not df.empty]
+        if not tickers:
+            return pd.DatetimeIndex([]), [], *(np.empty((0, 0)) for _ in range(4))
+
+        def _matrix(col):
+            return pd.concat({t: frames[t][col] for t in tickers}, axis=1)
+
+        closes = _matrix("Close").sort_index()
+        return (closes.index, tickers, closes.to_numpy(dtype=np.float64),
+                *(_matrix(c).reindex(closes.index).to_numpy(dtype=np.float64)
+                  for c in ("High", "Low", "Volume")))
+
+    @staticmethod
+    def contiguous_columns(close: np.ndarray) -> np.ndarray:
+        """
+        Boolean mask of columns with no NaN after their first bar.
+
+        compute_universe() forward-fills holes in the shared date index
+        (another exchange's holidays, a stale last bar), which adds bars the
+        ticker never traded; only contiguous columns reproduce compute_all().
+        """
+        started = np.argmax(~np.isnan(close), axis=0)
+        row     = np.arange(close.shape[0])[:, None]
+        return ~(np.isnan(close) & (row >= started)).any(axis=0)
+
+    def compute_universe(self, close: np.ndarray, high: np.ndarray,
+                         low: np.ndarray, volume: np.ndarray,
+                         tickers: list, include_series: bool = True,
+                         include_obv_trend: bool = False) -> dict:
+        """
+        compute_all() for every column of aligned date × ticker matrices.
+
+        Every indicator is evaluated for all tickers at once with NumPy
+        (recursive ones such as EMA/RSI loop over dates, vectorised over
+        tickers). Leading NaNs (ticker not yet listed) are allowed; interior
+        gaps are forward-filled as StockService.fetch_history does.
+
+        Args:
+            close, high, low, volume : float arrays of shape (n_dates, n_tickers)
+            tickers                  : column labels, length n_tickers
+            include_series           : also build the 60-point chart series
+            include_obv_trend        : also add the unrounded "obv_trend"
+                                       input of PredictionService.predict()
+
+        Returns:
+            {ticker: dict} — each value has the compute_all() schema.
+        """
+        latest, series, obv_trend = self.universe_arrays(close, high, low, volume)
+        vol_ann = latest["volatility_ann"]
+
+        def _r4(v):
+            return None if np.isnan(v) else round(float(v), 4)
+
+        results = {}
+        for j, t in enumerate(tickers):
+            out = {k: _r4(v[j]) for k, v in latest.items()}
+            # compute_all() reports NaN (not None) for volatility with < 2 returns
+            out["volatility_ann"] = round(float(vol_ann[j]), 4)
+            if include_obv_trend:
+                out["obv_trend"] = float(obv_trend[j])
+            if include_series:
+                out["series"] = {k: self._np_tail(series[k][:, j]) for k in self.SERIES_KEYS}
+            results[t] = out
+        return results
+
+    def universe_arrays(self, close: np.ndarray, high: np.ndarray,
+                        low: np.ndarray, volume: np.ndarray):
+        """
+        Array core of compute_universe(), before rounding and per-ticker
+        dict building (for callers that stay in NumPy, e.g. the backtester).
+
+        Returns:
+            (latest, series, obv_trend) — latest maps every FIELDS entry to
+            an unrounded (n_tickers,) array (NaN = None), series maps
+            SERIES_KEYS to full (n_dates, n_tickers) matrices.
+        """
+        close  = self._np_ffill(np.asarray(close, dtype=np.float64))
+        high   = self._np_ffill(np.asarray(high, dtype=np.float64))
+        low    = self._np_ffill(np.asarray(low, dtype=np.float64))
+        volume = self._np_ffill(np.asarray(volume, dtype=np.float64))
+
+        n_dates, _ = close.shape
+        valid      = ~np.isnan(close)
+        n_valid    = valid.sum(axis=0)
+        first      = np.where(n_valid > 0, np.argmax(valid, axis=0), n_dates)
+
+        # ── Moving averages / MACD ────────────────────────────────────────
+        sma20 = self._np_rolling(close, 20, "mean")
+        sma50 = self._np_rolling(close, 50, "mean")
+        ema12 = self._np_ema(close, 12)
+        ema26 = self._np_ema(close, 26)
+        macd_line   = ema12 - ema26
+        signal_line = self._np_ema(macd_line, 9)
+        histogram   = macd_line - signal_line
+
+        # ── RSI / Bollinger / ATR / OBV ───────────────────────────────────
+        rsi14 = self._np_rsi(close, valid, first, 14)
+        std20 = self._np_rolling(close, 20, "std")
+        bb_upper = sma20 + 2.0 * std20
+        bb_lower = sma20 - 2.0 * std20
+        atr14 = self._np_ema(self._np_true_range(high, low, close), 14)
+        obv   = self._np_obv(close, volume, valid)
+
+        # OBV − EMA10(OBV); 0.0 below 10 bars, as _obv_trend()
+        obv_trend = np.zeros(close.shape[1])
+        if n_dates:
+            obv_trend = np.where(n_valid >= 10, obv[-1] - self._np_ema(obv, 10)[-1], 0.0)
+
+        # ── Returns ───────────────────────────────────────────────────────
+        prev    = np.vstack([np.full((1, close.shape[1]), np.nan), close[:-1]])
+        rets    = close / prev - 1.0
+        n_ret   = (~np.isnan(rets)).sum(axis=0)
+        mean_r  = np.nansum(rets, axis=0) / np.maximum(n_ret, 1)
+        var_r   = np.nansum((rets - mean_r) ** 2, axis=0) / np.maximum(n_ret - 1, 1)
+        vol_ann = np.where(n_ret >= 2, np.sqrt(var_r) * np.sqrt(252) * 100, np.nan)
+
+        def _cum_ret(n):
+            if n_dates < n + 1:
+                return np.full(close.shape[1], np.nan)
+            base = close[-n - 1]
+            out  = (close[-1] - base) / base * 100
+            return np.where(n_valid >= n + 1, out, np.nan)
+
+        scalars = {
+            "sma20"      : sma20,     "sma50"      : sma50,
+            "ema12"      : ema12,     "ema26"      : ema26,
+            "macd"       : macd_line, "macd_signal": signal_line,
+            "macd_hist"  : histogram, "rsi14"      : rsi14,
+            "bb_upper"   : bb_upper,  "bb_middle"  : sma20,
+            "bb_lower"   : bb_lower,  "atr14"      : atr14,
+            "obv"        : obv,
+        }
+        latest = {k: self._np_last_valid(v) for k, v in scalars.items()}
+        latest["volatility_ann"] = vol_ann
+        for n in (7, 14, 30):
+            latest[f"return_{n}d"] = _cum_ret(n)
+
+        series = {
+            "sma20": sma20, "sma50": sma50, "ema12": ema12, "ema26": ema26,
+            "bb_upper": bb_upper, "bb_lower": bb_lower, "rsi14": rsi14,
+            "macd": macd_line, "macd_signal": signal_line,
+        }
+        return latest, series, obv_trend
+
+    # ─── Vectorised kernels (axis 0 = dates, axis 1 = tickers) ───────────────
+
+    @staticmethod
+    def _np_ffill(a: np.ndarray) -> np.ndarray:
+        """Forward-fill NaNs down each column."""
+        if a.size == 0 or not np.isnan(a).any():
+            return a
+        idx = np.where(np.isnan(a), 0, np.arange(a.shape[0])[:, None])
+        np.maximum.accumulate(idx, axis=0, out=idx)
+        return a[idx, np.arange(a.shape[1])]
+
+    @staticmethod
+    def _np_last_valid(a: np.ndarray) -> np.ndarray:
+        """Last non-NaN value of each column (NaN if there is none)."""
+        if a.shape[0] == 0:
+            return np.full(a.shape[1], np.nan)
+        last = a.shape[0] - 1 - np.argmax(~np.isnan(a[::-1]), axis=0)
+        return a[last, np.arange(a.shape[1])]
+
+    @staticmethod
+    def _np_rolling(a: np.ndarray, window: int, how: str) -> np.ndarray:
+        """
+        Rolling mean / sample std; NaN until a full window of data exists.
+
+        Runs pandas' rolling kernels column-wise rather than a NumPy window
+        sum: averages of 2-decimal prices often land exactly on a rounding
+        tie, and only the same summation as compute_all() rounds them the
+        same way.
+        """
+        rolling = pd.DataFrame(a, copy=False).rolling(window)
+        return (rolling.mean() if how == "mean" else rolling.std()).to_numpy()
+
+    @staticmethod
+    def _np_ema(a: np.ndarray, span: int) -> np.ndarray:
+        """EMA with adjust=False, seeded at each column's first valid value."""
+        alpha = 2.0 / (span + 1)
+        out   = np.empty_like(a)
+        state = np.full(a.shape[1], np.nan)
+        for i in range(a.shape[0]):
+            x     = a[i]
+            state = np.where(np.isnan(state), x, alpha * x + (1 - alpha) * state)
+            out[i] = state
+        return out
+
+    @staticmethod
+    def _np_rsi(close: np.ndarray, valid: np.ndarray,
+                first: np.ndarray, period: int) -> np.ndarray:
+        """RSI matching _rsi(): ewm(com=period-1, adjust=True, min_periods=period)."""
+        delta = np.vstack([np.zeros((1, close.shape[1])), np.diff(close, axis=0)])
+        delta = np.where(valid, np.nan_to_num(delta, nan=0.0), 0.0)
+        gain  = np.where(delta > 0, delta, 0.0)
+        loss  = np.where(delta < 0, -delta, 0.0)
+
+        decay = 1.0 - 1.0 / period
+        g = np.zeros(close.shape[1])
+        l = np.zeros(close.shape[1])
+        out = np.full(close.shape, np.nan)
+        for i in range(close.shape[0]):
+            g = gain[i] + decay * g
+            l = loss[i] + decay * l
+            with np.errstate(divide="ignore", invalid="ignore"):
+                out[i] = np.where((i - first + 1 >= period) & (l != 0),
+                                  100 - 100 / (1 + g / l), np.nan)
+        return out
+
+    @staticmethod
+    def _np_true_range(high, low, close) -> np.ndarray:
+        prev = np.vstack([np.full((1, close.shape[1]), np.nan), close[:-1]])
+        return np.fmax(np.fmax(high - low, np.abs(high - prev)), np.abs(low - prev))
+
+    @staticmethod
+    def _np_obv(close, volume, valid) -> np.ndarray:
+        direction = np.sign(np.nan_to_num(np.diff(close, axis=0, prepend=np.nan), nan=0.0))
+        flow      = np.where(valid, direction * np.nan_to_num(volume), 0.0)
+        return np.where(valid, np.cumsum(flow, axis=0), np.nan)
+
+    @staticmethod
+    def _np_tail(col: np.ndarray, n: int = 60) -> list:
+        """Column equivalent of compute_all()'s _series_tail()."""
+        return round_list(col[~np.isnan(col)][-n:])
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#  INDICATOR GRAPH
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _cum_ret(close: pd.Series, n: int):
+    if len(close) < n + 1:
+        return None
+    return round(((float(close.iloc[-1]) - float(close.iloc[-n-1]))
+                  / float(close.iloc[-n-1])) * 100, 4)
+
+
+def _obv_trend(obv: pd.Series) -> float:
+    """OBV minus its 10-day EMA (same as PredictionService._compute_obv_trend)."""
+    if len(obv) < 10:
+        return 0.0
+    obv_ema = obv.ewm(span=10, adjust=False).mean()
+    return float(obv.iloc[-1] - obv_ema.iloc[-1])
+
+
+# node → (dependencies, function of the dependency values)
+# Inputs "close", "high", "low", "volume" are the DataFrame columns.
+_NODES = {
+    # ── Moving Averages ───────────────────────────────────────────────────
+    "sma20"         : (("close",), lambda c: IndicatorService._sma(c, 20)),
+    "sma50"         : (("close",), lambda c: IndicatorService._sma(c, 50)),
+    "ema12"         : (("close",), lambda c: IndicatorService._ema(c, 12)),
+    "ema26"         : (("close",), lambda c: IndicatorService._ema(c, 26)),
+
+    # ── MACD: Line = EMA12 − EMA26, Signal = EMA9(Line), Hist = Line − Signal
+    "macd_line"     : (("ema12", "ema26"), lambda fast, slow: fast - slow),
+    "macd_signal"   : (("macd_line",), lambda m: IndicatorService._ema(m, 9)),
+    "macd_hist"     : (("macd_line", "macd_signal"), lambda m, s: m - s),
+
+    # ── RSI ───────────────────────────────────────────────────────────────
+    "rsi14"         : (("close",), lambda c: IndicatorService._rsi(c, 14)),
+
+    # ── Bollinger Bands (20, 2): SMA20 ± 2σ — middle band is the sma20 node
+    "std20"         : (("close",), lambda c: c.rolling(20).std()),
+    "bb_upper"      : (("sma20", "std20"), lambda m, sd: m + (2.0 * sd)),
+    "bb_lower"      : (("sma20", "std20"), lambda m, sd: m - (2.0 * sd)),
+
+    # ── ATR / OBV ─────────────────────────────────────────────────────────
+    "atr14"         : (("high", "low", "close"),
+                       lambda h, l, c: IndicatorService._atr(h, l, c, 14)),
+    "obv"           : (("close", "volume"), lambda c, v: IndicatorService._obv(c, v)),
+    "obv_trend"     : (("obv",), _obv_trend),
+
+    # ── Returns ───────────────────────────────────────────────────────────
+    "daily_returns" : (("close",), lambda c: c.pct_change().dropna()),
+    "volatility_ann": (("daily_returns",),   # annualised %
+                       lambda r: round(float(r.std() * np.sqrt(252) * 100), 4)),
+    "return_7d"     : (("close",), lambda c: _cum_ret(c, 7)),
+    "return_14d"    : (("close",), lambda c: _cum_ret(c, 14)),
+    "return_30d"    : (("close",), lambda c: _cum_ret(c, 30)),
+}
+
+# Output field → graph node holding its series (scalar = latest value)
+_FIELD_SERIES = {
+    "sma20": "sma20", "sma50": "sma50", "ema12": "ema12", "ema26": "ema26",
+    "macd": "macd_line", "macd_signal": "macd_signal", "macd_hist": "macd_hist",
+    "rsi14": "rsi14", "bb_upper": "bb_upper", "bb_middle": "sma20",
+    "bb_lower": "bb_lower", "atr14": "atr14", "obv": "obv",
+}
+
+
+class IndicatorSet:
+    """
+    Memoised evaluation of the indicator graph for one OHLCV frame.
+    A node is computed the first time it (or a dependant) is read.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self._memo = {
+            "close" : df["Close"],
+            "high"  : df["High"],
+            "low"   : df["Low"],
+            "volume": df["Volume"],
+        }
+
+    def value(self, node: str):
+        """Return a node's value, evaluating its dependencies first."""
+        if node not in self._memo:
+            deps, fn = _NODES[node]
+            self._memo[node] = fn(*(self.value(d) for d in deps))
+        return self._memo[node]
+
+    @property
+    def evaluated(self) -> list:
+        """Nodes computed so far (inputs excluded)."""
+        return [n for n in self._memo if n in _NODES]
+
+    def to_dict(self, fields: list | None = None, series: bool = True,
+                rows: np.ndarray | None = None) -> dict:
+        """
+        Serialise selected fields in the compute_all() schema.
+
+        Args:
+            fields : Subset of IndicatorService.FIELDS (default: all).
+            series : Include the "series" chart-overlay block.
+            rows   : Sorted bar positions of a downsampled chart; each overlay
+                     then keeps only these bars of its 60-bar tail, so it
+                     stays end-aligned with the chart labels.
+        """
+        wanted = IndicatorService.FIELDS if fields is None else [
+            f for f in IndicatorService.FIELDS if f in set(fields)]
+
+        # ── Serialise: return only the most recent scalar or short series ─
+        def _last(s):
+            """Return most-recent non-NaN value as float, or None."""
+            s = s.dropna()
+            return round(float(s.iloc[-1]), 4) if not s.empty else None
+
+        def _series_tail(s, n=60):
+            """Return last n values as a list for chart overlays."""
+            vals = s.to_numpy(dtype=np.float64)
+            if rows is None:
+                return IndicatorService._np_tail(vals, n)
+            valid = np.flatnonzero(~np.isnan(vals))
+            if not len(valid):
+                return []
+            keep = rows[rows >= valid[-min(n, len(valid))]]
+            return IndicatorService._np_tail(vals[keep], len(keep))
+
+        out = {}
+        for f in wanted:
+            node   = _FIELD_SERIES.get(f, f)
+            out[f] = _last(self.value(node)) if f in _FIELD_SERIES else self.value(node)
+
+        if series:
+            out["series"] = {
+                k: _series_tail(self.value(_FIELD_SERIES[k]))
+                for k in IndicatorService.SERIES_KEYS if k in wanted
+            }
+        return out
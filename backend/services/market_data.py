@@ -0,0 +1,495 @@
+"""
+==============================================================================
+services/market_data.py
+==============================================================================
+Responsibility : Pluggable upstream market-data providers for StockService.
+
+Providers implemented:
+  ─ YFinanceProvider  : live Yahoo Finance data via yfinance (default)
+  ─ FixtureProvider   : CSV / Parquet fixtures from disk, optionally replaying
+                        a recorded latency distribution per call type
+  ─ RecordingProvider : wraps another provider and writes every response plus
+                        its latency to disk in the FixtureProvider layout
+  ─ HttpProvider      : bars and meta from an HTTP service speaking the
+                        protocol of scripts/stub_upstream.py (load tests)
+  ─ InstrumentedProvider : wraps another provider and records call counts and
+                        latency in utils.metrics (applied by build_provider)
+
+Every provider returns cleaned frames: columns [Open, High, Low, Close,
+Volume], a naive "Date" index, no NaN closes. `meta` returns the raw
+Yahoo-style info dict (longName, sector, marketCap, ...).
+==============================================================================
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+
+import numpy as np
+import pandas as pd
+import requests
+import yfinance as yf
+from requests.adapters import HTTPAdapter
+
+from utils.metrics import UPSTREAM_CALLS, UPSTREAM_SECONDS
+
+logger = logging.getLogger(__name__)
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+# Calendar length of each supported `period`
+PERIOD_OFFSETS = {
+    "1mo": pd.DateOffset(months=1),
+    "3mo": pd.DateOffset(months=3),
+    "6mo": pd.DateOffset(months=6),
+    "1y" : pd.DateOffset(years=1),
+    "2y" : pd.DateOffset(years=2),
+    "5y" : pd.DateOffset(years=5),
+}
+
+# Window a quote snapshot is built from
+QUOTE_PERIOD = "1mo"
+
+
+class MarketDataProvider(ABC):
+    """
+    Interface every upstream data source implements.
+
+    History windows are given either as `period` (one of PERIOD_OFFSETS)
+    or as an inclusive `start` date string ("YYYY-MM-DD").
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def history(self, ticker: str, period: str | None = None,
+                start: str | None = None) -> pd.DataFrame:
+        """Daily OHLCV bars for one ticker; empty DataFrame if none."""
+
+    def history_many(self, tickers: list, period: str | None = None,
+                     start: str | None = None) -> dict:
+        """
+        Daily OHLCV bars for several tickers → {ticker: DataFrame}.
+        Default implementation loops; providers with a batch API override it.
+        """
+        return {t: self.history(t, period=period, start=start) for t in tickers}
+
+    @abstractmethod
+    def meta(self, ticker: str) -> dict:
+        """Raw company info dict (Yahoo `.info` keys). Raises on failure."""
+
+    def quote(self, ticker: str) -> pd.DataFrame:
+        """Recent daily bars a quote snapshot is computed from."""
+        return self.history(ticker, period=QUOTE_PERIOD)
+
+    # ─── Shared helpers ──────────────────────────────────────────────────────
+
+    @staticmethod
+    def clean_frame(df: pd.DataFrame) -> pd.DataFrame:
+        """Standard OHLCV clean-up applied to every provider response."""
+        if df is None or df.empty:
+            return pd.DataFrame()
+
+        # ── Clean up ──────────────────────────────────────────────────────
+        df = df[OHLCV_COLUMNS].copy()
+
+        # Flatten multi-level columns if present (yfinance quirk)
+        if isinstance(df.columns, pd.MultiIndex):
+            df.columns = df.columns.get_level_values(0)
+
+        # Drop rows where Close is NaN (incomplete bars)
+        df.dropna(subset=["Close"], inplace=True)
+
+        # Forward-fill remaining NaNs (e.g. missing Volume)
+        df.ffill(inplace=True)
+
+        return df if not df.empty else pd.DataFrame()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#  YAHOO FINANCE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class YFinanceProvider(MarketDataProvider):
+    """Live data from Yahoo Finance via yfinance."""
+
+    name = "yfinance"
+
+    def history(self, ticker: str, period: str | None = None,
+                start: str | None = None) -> pd.DataFrame:
+        df = yf.download(ticker, auto_adjust=True, progress=False,
+                         threads=False, **self._window(period, start))
+        return self.clean_frame(df)
+
+    def history_many(self, tickers: list, period: str | None = None,
+                     start: str | None = None) -> dict:
+        """One multi-symbol yf.download call, split into per-ticker frames."""
+        if len(tickers) == 1:
+            return {tickers[0]: self.history(tickers[0], period=period, start=start)}
+
+        raw = yf.download(tickers, auto_adjust=True, progress=False,
+                          threads=True, group_by="ticker",
+                          **self._window(period, start))
+
+        frames = {}
+        for t in tickers:
+            if raw.empty or not isinstance(raw.columns, pd.MultiIndex):
+                frames[t] = pd.DataFrame()
+            elif t in raw.columns.get_level_values(0):
+                frames[t] = self.clean_frame(raw[t])
+            elif t in raw.columns.get_level_values(1):
+                frames[t] = self.clean_frame(raw.xs(t, axis=1, level=1))
+            else:
+                frames[t] = pd.DataFrame()
+        return frames
+
+    def meta(self, ticker: str) -> dict:
+        return yf.Ticker(ticker).info
+
+    def quote(self, ticker: str) -> pd.DataFrame:
+        hist = yf.Ticker(ticker).history(period=QUOTE_PERIOD, auto_adjust=True)
+        return self.clean_frame(hist)
+
+    @staticmethod
+    def _window(period, start) -> dict:
+        return {"start": start} if start else {"period": period}
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#  FIXTURES / REPLAY
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class FixtureProvider(MarketDataProvider):
+    """
+    Serves recorded data from disk so the backend runs with no network.
+
+    Layout under `root`:
+      ─ <TICKER>.csv | <TICKER>.parquet : OHLCV bars with a Date column/index
+      ─ meta.json                       : {ticker: info dict} (optional)
+      ─ latency.json                    : {"history"|"meta"|"quote": [ms, ...]}
+                                          (optional, see `latency_file`)
+
+    `period` windows are anchored at the fixture's last bar rather than at
+    today, so a fixture recorded months ago replays the same window forever.
+    Parquet fixtures need pyarrow or fastparquet installed.
+    """
+
+    name = "fixture"
+
+    def __init__(self, root: str, latency_file: str | None = None,
+                 seed: int | None = None):
+        self.root    = root
+        self._frames = {}
+        self._lock   = threading.Lock()
+        self._meta   = self._load_json(os.path.join(root, "meta.json")) or {}
+        self._delays = self._load_json(latency_file) if latency_file else None
+        self._rng    = np.random.default_rng(seed)
+
+    def history(self, ticker: str, period: str | None = None,
+                start: str | None = None) -> pd.DataFrame:
+        self._sleep("history")
+        return self._window(ticker, period, start)
+
+    def history_many(self, tickers: list, period: str | None = None,
+                     start: str | None = None) -> dict:
+        # One simulated round trip for the whole batch, like the real API
+        self._sleep("history")
+        return {t: self._window(t, period, start) for t in tickers}
+
+    def meta(self, ticker: str) -> dict:
+        self._sleep("meta")
+        if ticker not in self._meta:
+            raise KeyError(f"No fixture meta for {ticker}")
+        return dict(self._meta[ticker])
+
+    def quote(self, ticker: str) -> pd.DataFrame:
+        self._sleep("quote")
+        return self._window(ticker, QUOTE_PERIOD, None)
+
+    # ─── Private helpers ─────────────────────────────────────────────────────
+
+    def _window(self, ticker: str, period: str | None,
+                start: str | None) -> pd.DataFrame:
+        df = self._frame(ticker)
+        if df.empty:
+            return df
+        if start:
+            return df[df.index >= pd.Timestamp(start)].copy()
+        if period in PERIOD_OFFSETS:
+            return df[df.index >= df.index[-1] - PERIOD_OFFSETS[period]].copy()
+        return df.copy()
+
+    def _frame(self, ticker: str) -> pd.DataFrame:
+        with self._lock:
+            if ticker not in self._frames:
+                self._frames[ticker] = self._read_fixture(ticker)
+            return self._frames[ticker]
+
+    def _read_fixture(self, ticker: str) -> pd.DataFrame:
+        csv_path     = os.path.join(self.root, f"{ticker}.csv")
+        parquet_path = os.path.join(self.root, f"{ticker}.parquet")
+
+        if os.path.exists(parquet_path):
+            df = pd.read_parquet(parquet_path)
+        elif os.path.exists(csv_path):
+            df = pd.read_csv(csv_path)
+        else:
+            logger.warning(f"FixtureProvider: no fixture for {ticker}")
+            return pd.DataFrame()
+
+        if "Date" in df.columns:
+            df = df.set_index("Date")
+        df.index = pd.to_datetime(df.index)
+        df.index.name = "Date"
+        return self.clean_frame(df.sort_index())
+
+    def _sleep(self, kind: str):
+        """Replay one latency sample (ms) recorded for this call type."""
+        samples = (self._delays or {}).get(kind)
+        if samples:
+            time.sleep(float(self._rng.choice(samples)) / 1000.0)
+
+    @staticmethod
+    def _load_json(path: str | None):
+        if not path or not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as fh:
+            return json.load(fh)
+
+
+class RecordingProvider(MarketDataProvider):
+    """
+    Pass-through wrapper that records fixtures from a live provider.
+
+    Each history response is merged into <root>/<TICKER>.csv, meta into
+    meta.json, and every call's latency (ms) is appended to latency.json,
+    which FixtureProvider can replay later. Latency samples are kept in
+    memory and written at most every FLUSH_INTERVAL_S seconds, and on
+    flush() / close() (also run at interpreter exit).
+    """
+
+    name = "recording"
+
+    FLUSH_INTERVAL_S = 5.0
+
+    def __init__(self, inner: MarketDataProvider, root: str):
+        self.inner  = inner
+        self.root   = root
+        self._lock  = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+        self._latency_path = os.path.join(root, "latency.json")
+        self._latency      = FixtureProvider._load_json(self._latency_path) or {}
+        self._latency_lock = threading.Lock()
+        self._unflushed    = 0
+        self._flushed_at   = time.monotonic()
+        atexit.register(self.close)
+
+    def history(self, ticker: str, period: str | None = None,
+                start: str | None = None) -> pd.DataFrame:
+        df = self._timed("history", self.inner.history, ticker,
+                         period=period, start=start)
+        self._save_frame(ticker, df)
+        return df
+
+    def history_many(self, tickers: list, period: str | None = None,
+                     start: str | None = None) -> dict:
+        frames = self._timed("history", self.inner.history_many, tickers,
+                             period=period, start=start)
+        for t, df in frames.items():
+            self._save_frame(t, df)
+        return frames
+
+    def meta(self, ticker: str) -> dict:
+        info = self._timed("meta", self.inner.meta, ticker)
+        with self._lock:
+            path = os.path.join(self.root, "meta.json")
+            data = FixtureProvider._load_json(path) or {}
+            data[ticker] = {k: v for k, v in info.items()
+                            if isinstance(v, (str, int, float, bool, type(None)))}
+            self._write_json(path, data)
+        return info
+
+    def quote(self, ticker: str) -> pd.DataFrame:
+        df = self._timed("quote", self.inner.quote, ticker)
+        self._save_frame(ticker, df)
+        return df
+
+    def flush(self):
+        """Write the latency samples recorded so far to latency.json."""
+        with self._latency_lock:
+            if not self._unflushed:
+                return
+            self._write_json(self._latency_path, self._latency)
+            self._unflushed  = 0
+            self._flushed_at = time.monotonic()
+
+    def close(self):
+        self.flush()
+
+    # ─── Private helpers ─────────────────────────────────────────────────────
+
+    def _timed(self, kind: str, fn, *args, **kwargs):
+        t0 = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            elapsed_ms = round((time.perf_counter() - t0) * 1000, 2)
+            with self._latency_lock:
+                self._latency.setdefault(kind, []).append(elapsed_ms)
+                self._unflushed += 1
+                due = time.monotonic() - self._flushed_at >= self.FLUSH_INTERVAL_S
+            if due:
+                self.flush()
+
+    def _save_frame(self, ticker: str, df: pd.DataFrame):
+        if df is None or df.empty:
+            return
+        with self._lock:
+            path = os.path.join(self.root, f"{ticker}.csv")
+            if os.path.exists(path):
+                old = pd.read_csv(path, index_col="Date", parse_dates=True)
+                df  = pd.concat([old[old.index < df.index[0]], df])
+            df.to_csv(path, index_label="Date")
+
+    @staticmethod
+    def _write_json(path: str, data):
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(data, fh)
+        os.replace(tmp, path)
+
+
+class InstrumentedProvider(MarketDataProvider):
+    """
+    Pass-through wrapper counting and timing every upstream call into
+    utils.metrics (upstream_calls_total, upstream_call_duration_seconds),
+    labelled by the inner provider's name and the call.
+    """
+
+    def __init__(self, inner: MarketDataProvider):
+        self.inner = inner
+        self.name  = inner.name
+
+    def history(self, ticker: str, period: str | None = None,
+                start: str | None = None) -> pd.DataFrame:
+        return self._timed("history", self.inner.history, ticker,
+                           period=period, start=start)
+
+    def history_many(self, tickers: list, period: str | None = None,
+                     start: str | None = None) -> dict:
+        return self._timed("history_many", self.inner.history_many, tickers,
+                           period=period, start=start)
+
+    def meta(self, ticker: str) -> dict:
+        return self._timed("meta", self.inner.meta, ticker)
+
+    def quote(self, ticker: str) -> pd.DataFrame:
+        return self._timed("quote", self.inner.quote, ticker)
+
+    def _timed(self, call: str, fn, *args, **kwargs):
+        t0      = time.perf_counter()
+        outcome = "error"
+        try:
+            result  = fn(*args, **kwargs)
+            outcome = "ok"
+            return result
+        finally:
+            UPSTREAM_SECONDS.observe(time.perf_counter() - t0, provider=self.name, call=call)
+            UPSTREAM_CALLS.inc(provider=self.name, call=call, outcome=outcome)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#  HTTP
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class HttpProvider(MarketDataProvider):
+    """
+    Market data from an HTTP service (see scripts/stub_upstream.py):
+
+      GET /history?tickers=A,B&period=1y   → {ticker: {dates, open, high,
+      GET /history?tickers=A&start=...        low, close, volume}}
+      GET /meta?ticker=A                   → Yahoo-style info dict (404 if unknown)
+
+    history_many is one round trip, like yfinance's multi-symbol download.
+    """
+
+    name = "http"
+
+    def __init__(self, base_url: str, timeout: float = 10.0, pool_size: int = 64):
+        self.base_url = base_url.rstrip("/")
+        self.timeout  = timeout
+        self._session = requests.Session()
+        self._session.mount("http://", HTTPAdapter(pool_maxsize=pool_size))
+        self._session.mount("https://", HTTPAdapter(pool_maxsize=pool_size))
+
+    def history(self, ticker: str, period: str | None = None,
+                start: str | None = None) -> pd.DataFrame:
+        return self.history_many([ticker], period=period, start=start)[ticker]
+
+    def history_many(self, tickers: list, period: str | None = None,
+                     start: str | None = None) -> dict:
+        params = {"tickers": ",".join(tickers)}
+        params.update({"start": start} if start else {"period": period})
+        payload = self._get("/history", params)
+        return {t: self._frame(payload.get(t)) for t in tickers}
+
+    def meta(self, ticker: str) -> dict:
+        return self._get("/meta", {"ticker": ticker})
+
+    def _get(self, path: str, params: dict):
+        resp = self._session.get(self.base_url + path, params=params, timeout=self.timeout)
+        resp.raise_for_status()
+        return resp.json()
+
+    def _frame(self, data: dict | None) -> pd.DataFrame:
+        if not data or not data.get("dates"):
+            return pd.DataFrame()
+        index = pd.DatetimeIndex(pd.to_datetime(data["dates"]), name="Date")
+        df = pd.DataFrame({c: data[c.lower()] for c in OHLCV_COLUMNS},
+                          index=index, dtype="float64")
+        return self.clean_frame(df)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#  FACTORY
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def build_provider(name: str = "yfinance", fixture_dir: str | None = None,
+                   latency_file: str | None = None, seed: int | None = None,
+                   record_dir: str | None = None, url: str | None = None,
+                   timeout: float = 10.0) -> MarketDataProvider:
+    """
+    Construct the provider selected by configuration.
+
+    Args:
+        name         : "yfinance" | "fixture" | "http"
+        fixture_dir  : Fixture root (required for "fixture")
+        latency_file : Recorded latency samples to replay (fixture only)
+        seed         : RNG seed for latency replay
+        record_dir   : If set, wrap the provider in a RecordingProvider
+        url          : Service base URL (required for "http")
+        timeout      : Per-request timeout in seconds (http only)
+
+    The result is always wrapped in an InstrumentedProvider (metrics).
+    """
+    if name == "yfinance":
+        provider = YFinanceProvider()
+    elif name == "fixture":
+        if not fixture_dir:
+            raise ValueError("FixtureProvider requires a fixture directory")
+        provider = FixtureProvider(fixture_dir, latency_file=latency_file, seed=seed)
+    elif name == "http":
+        if not url:
+            raise ValueError("HttpProvider requires a base URL")
+        provider = HttpProvider(url, timeout=timeout)
+    else:
+        raise ValueError(f"Unknown market data provider '{name}'")
+
+    if record_dir:
+        provider = RecordingProvider(provider, record_dir)
+    return InstrumentedProvider(provider)
@@ -0,0 +1,200 @@
+"""
+==============================================================================
+services/meta_store.py
+==============================================================================
+Responsibility : Persistent company metadata keyed by ticker, so requests
+                 read meta from memory instead of calling Yahoo's `.info`.
+
+Fields are kept in two groups with their own refresh age:
+  ─ static : name, sector, industry, currency, exchange   (daily)
+  ─ market : market_cap, pe_ratio, week_high, week_low    (shorter cycle)
+
+The whole table is loaded into memory at startup; reads never touch disk
+or the network. StockService.refresh_meta() (a scheduler job) re-fetches
+stale groups in the background and writes them back; without the scheduler,
+StockService.fetch_meta() starts that re-fetch when it reads a stale group. The SQLite file is
+shared by the gunicorn workers: each reloads it before refreshing, so a
+group one worker refreshed is not fetched again by the others.
+
+Only tickers served within `active_age` are refreshed: every hit is noted
+in memory and written to `served_at` on the next load(), so one worker's
+readers keep a ticker active for the process that runs the refresh. The
+table is trimmed to the `max_entries` most recently served tickers.
+==============================================================================
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+STATIC_FIELDS = ("name", "sector", "industry", "currency", "exchange")
+MARKET_FIELDS = ("market_cap", "pe_ratio", "week_high", "week_low")
+GROUPS        = {"static": STATIC_FIELDS, "market": MARKET_FIELDS}
+
+# Key order of StockService.fetch_meta's dict (kept in served payloads)
+FIELDS = ("name", "sector", "industry", "market_cap", "pe_ratio",
+          "week_high", "week_low", "currency", "exchange")
+
+_SCHEMA = """CREATE TABLE IF NOT EXISTS meta (
+                 ticker    TEXT PRIMARY KEY,
+                 static    TEXT,
+                 static_at REAL,
+                 market    TEXT,
+                 market_at REAL,
+                 served_at REAL
+             ) WITHOUT ROWID"""
+
+
+class MetaStore:
+    """
+    In-memory view of the on-disk metadata table.
+
+    Usage:
+        store = MetaStore("data/meta.sqlite3", static_max_age=86400,
+                          market_max_age=3600)
+        store.get("TCS.NS")               # → fetch_meta-shaped dict or None
+        store.put("TCS.NS", meta)         # after a fresh provider load
+    """
+
+    def __init__(self, path: str, static_max_age: float = 24 * 3600,
+                 market_max_age: float = 3600, active_age: float = 2 * 24 * 3600,
+                 max_entries: int = 2000, clock=time.time):
+        self.path        = path
+        self.max_age     = {"static": static_max_age, "market": market_max_age}
+        self.active_age  = active_age
+        self.max_entries = max_entries
+        self._clock   = clock
+        self._lock    = threading.Lock()
+        self._conn    = None
+        self._pid     = None
+        self._records = {}     # ticker → {"static": {..}, "static_at": ts, "market": .., ...}
+        self._served  = {}     # ticker → last hit not yet written to served_at
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._lock:
+            self._db().execute(_SCHEMA)
+        self.load()
+
+    # ─── Public API ──────────────────────────────────────────────────────────
+
+    def load(self) -> int:
+        """
+        Write pending hits, trim to max_entries, then (re)load every record
+        from disk in one query; returns the count.
+        """
+        served, self._served = self._served, {}
+        with self._lock:
+            db = self._db()
+            db.executemany(
+                "UPDATE meta SET served_at = MAX(COALESCE(served_at, 0), ?) WHERE ticker = ?",
+                [(ts, ticker) for ticker, ts in served.items()])
+            db.execute(
+                "DELETE FROM meta WHERE ticker IN (SELECT ticker FROM meta "
+                "ORDER BY COALESCE(served_at, 0) DESC LIMIT -1 OFFSET ?)", (self.max_entries,))
+            db.commit()
+            rows = db.execute("SELECT ticker, static, static_at, market, market_at, served_at "
+                              "FROM meta").fetchall()
+        records = {}
+        for ticker, static, static_at, market, market_at, served_at in rows:
+            records[ticker] = {
+                "static"   : json.loads(static) if static else None,
+                "static_at": static_at,
+                "market"   : json.loads(market) if market else None,
+                "market_at": market_at,
+                "served_at": max(served_at or 0, served.get(ticker, 0)) or None,
+            }
+        self._records = records              # one assignment: readers see old or new
+        return len(records)
+
+    def get(self, ticker: str) -> dict | None:
+        """Merged fields of both groups (fetch_meta shape), or None if unknown."""
+        record = self._records.get(ticker)
+        if record is None or record["static"] is None:
+            return None
+        self._served[ticker] = self._clock()
+        merged = {**record["static"], **(record["market"] or {})}
+        return {f: merged.get(f) for f in FIELDS}
+
+    def put(self, ticker: str, meta: dict, groups: tuple = ("static", "market"),
+            served: bool = True):
+        """
+        Store the `groups` of a freshly loaded fetch_meta-shaped dict;
+        `served` marks a load made for a request (not a background refresh).
+        """
+        now    = self._clock()
+        record = dict(self._records.get(ticker) or
+                      {"static": None, "static_at": None, "market": None,
+                       "market_at": None, "served_at": None})
+        for group in groups:
+            record[group]         = {f: meta.get(f) for f in GROUPS[group]}
+            record[f"{group}_at"] = now
+        if served:
+            record["served_at"] = now
+
+        with self._lock:
+            self._db().execute(
+                "INSERT OR REPLACE INTO meta VALUES (?, ?, ?, ?, ?, ?)",
+                (ticker,
+                 json.dumps(record["static"]) if record["static"] else None, record["static_at"],
+                 json.dumps(record["market"]) if record["market"] else None, record["market_at"],
+                 record["served_at"]))
+            self._db().commit()
+            self._records = {**self._records, ticker: record}
+
+    def stale(self) -> dict:
+        """{ticker: (group, ...)} for every group older than its max age (active tickers)."""
+        now, out = self._clock(), {}
+        for ticker, record in self._records.items():
+            if not self._active(ticker, record, now):
+                continue
+            groups = self._stale_groups(record, now)
+            if groups:
+                out[ticker] = groups
+        return out
+
+    def stale_groups(self, ticker: str) -> tuple:
+        """Groups of one stored ticker past their max age (() if unknown)."""
+        record = self._records.get(ticker)
+        return self._stale_groups(record, self._clock()) if record is not None else ()
+
+    def tickers(self) -> list:
+        return list(self._records)
+
+    def __contains__(self, ticker: str) -> bool:
+        record = self._records.get(ticker)
+        return record is not None and record["static"] is not None
+
+    def stats(self) -> dict:
+        now   = self._clock()
+        stale = self.stale()
+        return {
+            "entries"      : len(self._records),
+            "active"       : sum(1 for t, r in self._records.items() if self._active(t, r, now)),
+            "stale_static" : sum(1 for g in stale.values() if "static" in g),
+            "stale_market" : sum(1 for g in stale.values() if "market" in g),
+        }
+
+    # ─── Private helpers ─────────────────────────────────────────────────────
+
+    def _active(self, ticker: str, record: dict, now: float) -> bool:
+        served_at = max(record["served_at"] or 0, self._served.get(ticker, 0))
+        return now - served_at < self.active_age
+
+    def _stale_groups(self, record: dict, now: float) -> tuple:
+        return tuple(g for g in GROUPS
+                     if record[g] is None or record[f"{g}_at"] is None
+                     or now - record[f"{g}_at"] >= self.max_age[g])
+
+    def _db(self) -> sqlite3.Connection:
+        """Shared connection (caller holds self._lock); reopened after a fork."""
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            try:                                  # files written before served_at existed
+                self._conn.execute("ALTER TABLE meta ADD COLUMN served_at REAL")
+            except sqlite3.OperationalError:
+                pass
+            self._pid = os.getpid()
+        return self._conn
@@ -0,0 +1,379 @@
+"""
+==============================================================================
+services/optimizer_service.py
+==============================================================================
+Responsibility : Tune PredictionService's WEIGHTS, TREND_THRESHOLD and
+                 MOVE_SCALE against walk-forward history.
+
+Pipeline:
+  1. build_features() replays every (ticker, day) window once (the same
+     windows as BacktestService) and keeps only what the parameters act
+     on: the 8 signal scores, daily volatility, the current price and the
+     realised HORIZON-bar close. Signal scores do not depend on the tuned
+     parameters, so they are never recomputed per trial.
+  2. ParamOptimizer.search() draws random candidates (Dirichlet weights,
+     uniform threshold, log-uniform scale) and scores them in batches:
+     a candidate's net scores for every window are one row of
+     weights @ scores, so the objective is a handful of array reductions.
+     Candidate batches are spread over a process pool.
+  3. The best candidate on the training dates is re-scored on the later
+     validation dates next to the current parameters, and written as a
+     new predictor-vN.json that PredictionService loads at startup.
+
+Objective (higher is better):
+    called_hit_rate − error_penalty × mae_pct
+subject to called_share ≥ min_coverage, where a "call" is a BULLISH or
+BEARISH trend and mae_pct is the predicted-price error in % of price.
+==============================================================================
+"""
+
+import json
+import logging
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import numpy as np
+
+from services.backtest_service import BacktestService, window_features, PERIOD_BARS
+from services.indicator_service import IndicatorService
+from services.prediction_service import PredictionService
+
+logger = logging.getLogger(__name__)
+
+
+# Arrays stored per window by build_features()
+FEATURE_KEYS = ("scores", "daily_vol", "current", "realised", "date", "target_date")
+
+# Search space
+THRESHOLD_RANGE = (0.02, 0.40)
+SCALE_RANGE     = (0.25, 4.0)      # sampled log-uniformly
+
+
+def feature_chunk(chunk: list, lookback: int, horizon: int) -> dict:
+    """
+    Optimiser features for a few tickers (process-pool task).
+
+    Args:
+        chunk : [(ticker, dates_int64, close, high, low, volume), ...] as
+                produced by BacktestService._task_row().
+
+    Returns:
+        {key: array} for FEATURE_KEYS; only windows with a known outcome.
+    """
+    indicator_svc  = IndicatorService()
+    prediction_svc = PredictionService()
+    signals        = list(PredictionService.WEIGHTS)
+
+    parts = {k: [] for k in FEATURE_KEYS}
+    for _, dates, close, high, low, volume in chunk:
+        feats  = window_features(close, high, low, volume, lookback, indicator_svc)
+        target = feats["end"] + horizon
+        known  = target < len(close)
+        if not known.any():
+            continue
+
+        ind    = {k: feats[k][known] for k in PredictionService.REQUIRED_INDICATORS}
+        scores = prediction_svc.score_many(feats["current"][known], ind,
+                                           feats["obv_trend"][known])
+        vol    = ind["volatility_ann"]
+        vol    = np.where(np.isnan(vol) | (vol == 0), 20, vol)   # `or 20` in predict()
+
+        parts["scores"].append(np.vstack([scores[k] for k in signals]))
+        parts["daily_vol"].append(vol / 100 / np.sqrt(252))
+        parts["current"].append(feats["current"][known])
+        parts["realised"].append(close[target[known]])
+        parts["date"].append(dates[feats["end"][known]])
+        parts["target_date"].append(dates[target[known]])
+
+    if not parts["current"]:
+        return {k: (np.empty((len(signals), 0)) if k == "scores" else np.empty(0))
+                for k in FEATURE_KEYS}
+    return {k: np.concatenate(v, axis=-1) for k, v in parts.items()}
+
+
+def build_features(frames: dict, period: str = "3mo", horizon: int | None = None,
+                   workers: int | None = None, chunk_size: int = 8) -> dict:
+    """
+    Precompute the optimiser's per-window features for a universe.
+
+    Returns:
+        {"scores": (8, M), "daily_vol" / "current" / "realised" /
+         "date" / "target_date": (M,)} plus "meta" describing the run.
+    """
+    lookback = PERIOD_BARS[period]
+    horizon  = horizon or PredictionService.HORIZON
+    workers  = workers or os.cpu_count() or 1
+
+    tasks  = [BacktestService._task_row(t, df) for t, df in frames.items()
+              if df is not None and len(df) >= lookback]
+    chunks = [tasks[i:i + chunk_size] for i in range(0, len(tasks), chunk_size)]
+
+    if workers <= 1 or len(chunks) <= 1:
+        parts = [feature_chunk(c, lookback, horizon) for c in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(feature_chunk, chunks,
+                                  [lookback] * len(chunks), [horizon] * len(chunks)))
+
+    if parts:
+        features = {k: np.concatenate([p[k] for p in parts], axis=-1) for k in FEATURE_KEYS}
+    else:
+        features = feature_chunk([], lookback, horizon)
+    features["meta"] = {
+        "tickers" : sorted(t for t, *_ in tasks),
+        "period"  : period,
+        "lookback": lookback,
+        "horizon" : horizon,
+        "signals" : list(PredictionService.WEIGHTS),
+    }
+    logger.info(f"Optimiser features: {features['current'].size} windows "
+                f"from {len(tasks)} tickers")
+    return features
+
+
+def save_features(path: str, features: dict):
+    """Write features to an .npz cache (meta stored as JSON)."""
+    arrays = {k: features[k] for k in FEATURE_KEYS}
+    with open(path, "wb") as fh:
+        np.savez(fh, meta=np.array(json.dumps(features["meta"])), **arrays)
+
+
+def load_features(path: str) -> dict:
+    """Read an .npz cache written by save_features()."""
+    with np.load(path, allow_pickle=False) as data:
+        features = {k: data[k] for k in FEATURE_KEYS}
+        features["meta"] = json.loads(str(data["meta"]))
+    return features
+
+
+# ─── Candidate scoring (runs in pool workers) ────────────────────────────────
+
+_worker_features = None
+
+
+def _init_worker(features: dict):
+    global _worker_features
+    _worker_features = features
+
+
+def _score_batch(weights: np.ndarray, thresholds: np.ndarray, scales: np.ndarray,
+                 split: str, horizon: int, error_penalty: float,
+                 min_coverage: float) -> dict:
+    """Pool entry point: score a candidate batch on the worker's features."""
+    return score_candidates(_worker_features, weights, thresholds, scales, split,
+                            horizon, error_penalty, min_coverage)
+
+
+def score_candidates(features: dict, weights: np.ndarray, thresholds: np.ndarray,
+                     scales: np.ndarray, split: np.ndarray | str, horizon: int,
+                     error_penalty: float, min_coverage: float) -> dict:
+    """
+    Vectorised objective for K candidates over the windows selected by `split`.
+
+    Args:
+        weights    : (K, 8) signal weights in PredictionService.WEIGHTS order
+        thresholds : (K,) trend thresholds
+        scales     : (K,) move scales
+        split      : "train" / "validation" (stored masks) or a boolean mask
+
+    Returns:
+        {metric: (K,) array} — objective, called_hit_rate, called_share,
+        hit_rate, mae_pct.
+    """
+    mask = features[split] if isinstance(split, str) else split
+    scores   = features["scores"][:, mask]
+    current  = features["current"][mask]
+    realised = features["realised"][mask]
+    vol      = features["daily_vol"][mask]
+
+    net = np.asarray(weights) @ scores                                 # (K, M)
+    move_pct  = net * horizon * vol * np.asarray(scales)[:, None] * 100
+    predicted = current * (1 + move_pct / 100)
+    mae_pct   = (np.abs(predicted - realised) / current * 100).mean(axis=1)
+
+    realised_dir = np.sign(realised - current)
+    correct  = (np.sign(net) == realised_dir) & (realised_dir != 0)
+    called   = np.abs(net) > np.asarray(thresholds)[:, None]
+    n_called = called.sum(axis=1)
+
+    called_share = n_called / max(mask.sum(), 1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        called_hit_rate = np.where(n_called > 0, (correct & called).sum(axis=1) / n_called, 0.0)
+
+    objective = called_hit_rate - error_penalty * mae_pct
+    objective = np.where(called_share >= min_coverage, objective, -np.inf)
+    return {
+        "objective"      : objective,
+        "called_hit_rate": called_hit_rate,
+        "called_share"   : called_share,
+        "hit_rate"       : correct.mean(axis=1),
+        "mae_pct"        : mae_pct,
+    }
+
+
+class ParamOptimizer:
+    """
+    Parallel random search over PredictionService parameters.
+
+    Usage:
+        features = build_features(frames, period="3mo")
+        result   = ParamOptimizer(features, workers=8).search(trials=2000)
+        path     = ParamOptimizer.write_params(result, "params/")
+    """
+
+    def __init__(self, features: dict, workers: int | None = None,
+                 train_fraction: float = 0.7, error_penalty: float = 0.01,
+                 min_coverage: float = 0.2, batch_size: int = 16):
+        self.features       = dict(features)
+        self.workers        = workers or os.cpu_count() or 1
+        self.error_penalty  = error_penalty
+        self.min_coverage   = min_coverage
+        self.batch_size     = batch_size
+        self.horizon        = features["meta"]["horizon"]
+
+        # Walk-forward split: train on outcomes known before the split date,
+        # validate on forecasts made on/after it (no overlapping horizons).
+        dates = np.unique(features["date"])
+        if len(dates) < 2:
+            raise ValueError("Not enough history to split into train/validation.")
+        split_date = dates[min(int(len(dates) * train_fraction), len(dates) - 1)]
+        self.features["train"]      = features["target_date"] < split_date
+        self.features["validation"] = features["date"] >= split_date
+        self.split_date = int(split_date)
+
+    # ─── Public API ──────────────────────────────────────────────────────────
+
+    def search(self, trials: int = 1000, seed: int = 42) -> dict:
+        """
+        Evaluate `trials` random candidates (plus the current parameters)
+        and return the best one with train and validation metrics.
+        """
+        weights, thresholds, scales = self._sample(trials, seed)
+
+        batches = [slice(i, i + self.batch_size) for i in range(0, len(weights), self.batch_size)]
+        args    = ("train", self.horizon, self.error_penalty, self.min_coverage)
+
+        if self.workers <= 1 or len(batches) <= 1:
+            results = [score_candidates(self.features, weights[b], thresholds[b],
+                                        scales[b], *args) for b in batches]
+        else:
+            shared = {k: self.features[k] for k in (*FEATURE_KEYS, "train")}
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(shared,)) as pool:
+                futures = [pool.submit(_score_batch, weights[b], thresholds[b],
+                                       scales[b], *args) for b in batches]
+                results = [f.result() for f in futures]
+
+        train = {k: np.concatenate([r[k] for r in results]) for k in results[0]}
+        best  = int(np.argmax(train["objective"]))
+        if not np.isfinite(train["objective"][best]):
+            raise ValueError("No candidate reached the minimum coverage; "
+                             "lower min_coverage or widen the data set.")
+
+        chosen = {
+            "weights"        : {k: round(float(w), 6) for k, w in
+                                zip(PredictionService.WEIGHTS, weights[best])},
+            "trend_threshold": round(float(thresholds[best]), 6),
+            "move_scale"     : round(float(scales[best]), 6),
+        }
+        logger.info(f"Optimiser: best of {len(weights)} candidates is #{best} "
+                    f"(train objective {train['objective'][best]:.4f})")
+
+        return {
+            **chosen,
+            "metrics": {
+                "train"              : self._metrics_at(train, best),
+                "baseline_train"     : self._metrics_at(train, 0),
+                "validation"         : self._evaluate(chosen, "validation"),
+                "baseline_validation": self._evaluate(self._baseline(), "validation"),
+            },
+            "search": {
+                "method"        : "random",
+                "trials"        : trials,
+                "seed"          : seed,
+                "objective"     : "called_hit_rate - error_penalty * mae_pct",
+                "error_penalty" : self.error_penalty,
+                "min_coverage"  : self.min_coverage,
+                "split_date"    : str(np.datetime64(self.split_date, "D")),
+                "train_windows" : int(self.features["train"].sum()),
+                "validation_windows": int(self.features["validation"].sum()),
+            },
+            "data": {**self.features["meta"],
+                     "tickers": len(self.features["meta"]["tickers"])},
+        }
+
+    @staticmethod
+    def write_params(result: dict, directory: str) -> str:
+        """
+        Save a search result as the next predictor-vN.json in `directory`.
+
+        Returns:
+            Path of the written file.
+        """
+        os.makedirs(directory, exist_ok=True)
+        latest  = PredictionService.latest_params_file(directory)
+        version = 1
+        if latest:
+            m = PredictionService.PARAMS_FILE_PATTERN.match(os.path.basename(latest))
+            version = int(m.group(1)) + 1
+
+        params = {
+            "version"   : version,
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            **result,
+        }
+        PredictionService.validate_params(params)
+
+        path = os.path.join(directory, f"predictor-v{version}.json")
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(params, fh, indent=2)
+                fh.write("\n")
+            os.replace(tmp, path)
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        return path
+
+    # ─── Private helpers ─────────────────────────────────────────────────────
+
+    def _sample(self, trials: int, seed: int):
+        """Candidate 0 is the current class defaults; the rest are random."""
+        rng  = np.random.default_rng(seed)
+        base = self._baseline()
+
+        weights = rng.dirichlet(np.ones(len(PredictionService.WEIGHTS)), size=trials)
+        thresholds = rng.uniform(*THRESHOLD_RANGE, size=trials)
+        scales = np.exp(rng.uniform(np.log(SCALE_RANGE[0]), np.log(SCALE_RANGE[1]), size=trials))
+
+        weights    = np.vstack([list(base["weights"].values()), weights])
+        thresholds = np.concatenate([[base["trend_threshold"]], thresholds])
+        scales     = np.concatenate([[base["move_scale"]], scales])
+        return weights, thresholds, scales
+
+    @staticmethod
+    def _baseline() -> dict:
+        return {
+            "weights"        : dict(PredictionService.WEIGHTS),
+            "trend_threshold": PredictionService.TREND_THRESHOLD,
+            "move_scale"     : PredictionService.MOVE_SCALE,
+        }
+
+    def _evaluate(self, params: dict, split: str) -> dict:
+        res = score_candidates(
+            self.features,
+            np.array([list(params["weights"].values())]),
+            np.array([params["trend_threshold"]]),
+            np.array([params["move_scale"]]),
+            split, self.horizon, self.error_penalty, self.min_coverage,
+        )
+        return self._metrics_at(res, 0)
+
+    @staticmethod
+    def _metrics_at(results: dict, i: int) -> dict:
+        return {k: (round(float(v[i]), 4) if np.isfinite(v[i]) else None)
+                for k, v in results.items()}
@@ -30,11 +30,16 @@ Signal sources (8 independent signals):
 ==============================================================================
 """
 
-import numpy as np
-import pandas as pd
+import glob
+import json
 import logging
+import os
+import re
 from typing import Tuple
 
+import numpy as np
+import pandas as pd
+
 logger = logging.getLogger(__name__)
 
 
@@ -43,8 +48,8 @@ class PredictionService:
     Weighted multi-signal ensemble predictor.
 
     Weights are calibrated based on empirical backtesting intuition;
-    a production upgrade would tune these via gradient descent or
-    Bayesian optimisation over a labelled dataset.
+    services/backtest_service.py (python -m scripts.backtest) measures
+    their hit rate, price error and confidence calibration walk-forward.
     """
 
     # Signal weights — must sum to 1.0
@@ -59,18 +64,52 @@ class PredictionService:
         "obv_trend"      : 0.05,
     }
 
+    # |net_score| above this is called BULLISH / BEARISH
+    TREND_THRESHOLD = 0.12
+
+    # Expected-move amplification (gives slight amplification to weak signals)
+    MOVE_SCALE = 1.2
+
     # Projection horizon (trading days ahead)
     HORIZON = 5
 
+    # IndicatorService fields the signals read
+    REQUIRED_INDICATORS = [
+        "sma20", "sma50", "ema12", "ema26", "macd", "macd_signal", "macd_hist",
+        "rsi14", "bb_upper", "bb_middle", "bb_lower", "obv", "volatility_ann",
+        "return_7d", "return_30d",
+    ]
+
+    # Tuned parameter files written by scripts/optimize.py
+    PARAMS_FILE_PATTERN = re.compile(r"^predictor-v(\d+)\.json$")
+
+    def __init__(self, params: dict | None = None):
+        """
+        Args:
+            params : Tuned parameter set (see load_params()). Overrides
+                     WEIGHTS, TREND_THRESHOLD and MOVE_SCALE for this instance;
+                     the class defaults apply when omitted.
+        """
+        self.params_version = None
+        if params:
+            self.validate_params(params)
+            self.WEIGHTS = {k: float(params["weights"][k]) for k in PredictionService.WEIGHTS}
+            self.TREND_THRESHOLD = float(params["trend_threshold"])
+            self.MOVE_SCALE      = float(params["move_scale"])
+            self.params_version  = params.get("version")
+
     # ─── Public API ──────────────────────────────────────────────────────────
 
-    def predict(self, df: pd.DataFrame, indicators: dict) -> dict:
+    def predict(self, df: pd.DataFrame, indicators: dict,
+                obv_trend: float | None = None) -> dict:
         """
         Run the prediction pipeline and return a structured result.
 
         Args:
             df         : Full OHLCV DataFrame.
             indicators : Output of IndicatorService.compute_all().
+            obv_trend  : Precomputed OBV − EMA10(OBV) (the "obv_trend" node of
+                         IndicatorService.evaluate()); recomputed if omitted.
 
         Returns:
             {
@@ -84,7 +123,7 @@ class PredictionService:
         current_price = float(df["Close"].iloc[-1])
 
         # ── Compute individual signal scores ─────────────────────────────
-        scores, signal_details = self._score_all_signals(df, indicators)
+        scores, signal_details = self._score_all_signals(df, indicators, obv_trend)
 
         # ── Weighted ensemble ─────────────────────────────────────────────
         net_score = sum(
@@ -97,14 +136,14 @@ class PredictionService:
         daily_vol         = volatility / 100 / np.sqrt(252)
 
         # Expected move = net_score × horizon × daily_volatility × scaling_factor
-        # Scaling factor (1.2) gives slight amplification to weak signals.
-        expected_move_pct = net_score * self.HORIZON * daily_vol * 1.2 * 100
+        # Scaling factor (MOVE_SCALE) gives slight amplification to weak signals.
+        expected_move_pct = net_score * self.HORIZON * daily_vol * self.MOVE_SCALE * 100
         predicted_price   = round(current_price * (1 + expected_move_pct / 100), 2)
 
         # ── Trend classification ──────────────────────────────────────────
-        if net_score > 0.12:
+        if net_score > self.TREND_THRESHOLD:
             trend = "BULLISH"
-        elif net_score < -0.12:
+        elif net_score < -self.TREND_THRESHOLD:
             trend = "BEARISH"
         else:
             trend = "NEUTRAL"
@@ -125,12 +164,159 @@ class PredictionService:
             "signals"         : signal_details,
         }
 
+    def predict_many(self, current: np.ndarray, indicators: dict,
+                     obv_trend: np.ndarray, details: bool = False) -> dict:
+        """
+        Vectorised predict() for N tickers at once.
+
+        Every signal is scored with np.select / np.where over arrays, and
+        the ensemble is accumulated in WEIGHTS order, so results are
+        identical to calling predict() per ticker.
+
+        Args:
+            current    : (N,) latest close per ticker.
+            indicators : {field: (N,) array} for REQUIRED_INDICATORS; NaN
+                         marks a missing value (None in predict()). See
+                         stack_indicators().
+            obv_trend  : (N,) OBV − EMA10(OBV) per ticker.
+            details    : Also build predict()'s per-ticker "signals" lists
+                         (text generation is per ticker, so this is slower).
+
+        Returns:
+            {
+                predicted_price : (N,) float,
+                trend           : (N,) str,
+                confidence      : (N,) float,
+                change_pct      : (N,) float,
+                net_score       : (N,) float,
+                scores          : {signal_name: (N,) float},
+                signals         : list[list[dict]]   (only if details=True)
+            }
+        """
+        cp = np.asarray(current, dtype=np.float64)
+        ind = {k: np.asarray(indicators[k], dtype=np.float64)
+               for k in self.REQUIRED_INDICATORS}
+        obv_trend = np.asarray(obv_trend, dtype=np.float64)
+
+        scores = self.score_many(cp, ind, obv_trend)
+
+        # ── Weighted ensemble (same summation order as predict()) ─────────
+        net_score = np.zeros_like(cp)
+        for k in self.WEIGHTS:
+            net_score = net_score + scores[k] * self.WEIGHTS[k]
+
+        # ── Translate score to price projection ───────────────────────────
+        volatility = self._or_default(ind["volatility_ann"], 20)
+        daily_vol  = volatility / 100 / np.sqrt(252)
+        expected_move_pct = net_score * self.HORIZON * daily_vol * self.MOVE_SCALE * 100
+        predicted_price   = np.round(cp * (1 + expected_move_pct / 100), 2)
+
+        # ── Trend classification ──────────────────────────────────────────
+        trend = np.select([net_score > self.TREND_THRESHOLD, net_score < -self.TREND_THRESHOLD],
+                          ["BULLISH", "BEARISH"], default="NEUTRAL")
+
+        confidence = self._confidence_many(scores, ind, volatility)
+        change_pct = np.round(((predicted_price - cp) / cp) * 100, 2)
+
+        result = {
+            "predicted_price": predicted_price,
+            "trend"          : trend,
+            "confidence"     : confidence,
+            "change_pct"     : change_pct,
+            "net_score"      : net_score,
+            "scores"         : scores,
+        }
+
+        if details:
+            result["signals"] = [
+                self._score_all_signals(
+                    pd.DataFrame({"Close": [cp[i]]}),
+                    {k: (None if np.isnan(v[i]) else float(v[i])) for k, v in ind.items()},
+                    float(obv_trend[i]),
+                )[1]
+                for i in range(len(cp))
+            ]
+        return result
+
+    @classmethod
+    def stack_indicators(cls, indicator_dicts: list) -> dict:
+        """
+        Turn a list of compute_all()-style dicts into the {field: (N,) array}
+        layout predict_many() takes (None → NaN).
+        """
+        return {
+            k: np.array([np.nan if d.get(k) is None else d[k] for d in indicator_dicts],
+                        dtype=np.float64)
+            for k in cls.REQUIRED_INDICATORS
+        }
+
+    # ─── Tuned parameters ────────────────────────────────────────────────────
+
+    @classmethod
+    def load_params(cls, path: str | None) -> dict | None:
+        """
+        Read a tuned parameter set.
+
+        Args:
+            path : A predictor-vN.json file, or a directory holding such
+                   files (the highest version wins).
+
+        Returns:
+            The parameter dict, or None if `path` is unset or the directory
+            has no parameter files (callers then use the class defaults).
+
+        Raises:
+            ValueError : The file exists but is not a valid parameter set.
+        """
+        if not path:
+            return None
+        if not os.path.exists(path) and not path.endswith(".json"):
+            return None       # params directory not created yet
+        if os.path.isdir(path):
+            path = cls.latest_params_file(path)
+            if path is None:
+                return None
+
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                params = json.load(fh)
+        except (OSError, ValueError) as e:
+            raise ValueError(f"Unreadable predictor params file {path}: {e}") from e
+
+        cls.validate_params(params)
+        logger.info(f"Loaded predictor params v{params.get('version')} from {path}")
+        return params
+
+    @classmethod
+    def latest_params_file(cls, directory: str) -> str | None:
+        """Highest-versioned predictor-vN.json in `directory`, or None."""
+        versions = []
+        for path in glob.glob(os.path.join(directory, "predictor-v*.json")):
+            m = cls.PARAMS_FILE_PATTERN.match(os.path.basename(path))
+            if m:
+                versions.append((int(m.group(1)), path))
+        return max(versions)[1] if versions else None
+
+    @classmethod
+    def validate_params(cls, params: dict):
+        """Raise ValueError unless `params` is a usable parameter set."""
+        weights = params.get("weights")
+        if not isinstance(weights, dict) or set(weights) != set(cls.WEIGHTS):
+            raise ValueError(f"Predictor params need weights for: {', '.join(cls.WEIGHTS)}")
+        if any(not isinstance(w, (int, float)) or w < 0 for w in weights.values()):
+            raise ValueError("Predictor weights must be non-negative numbers.")
+        if abs(sum(weights.values()) - 1.0) > 1e-3:
+            raise ValueError("Predictor weights must sum to 1.0.")
+        for key in ("trend_threshold", "move_scale"):
+            if not isinstance(params.get(key), (int, float)) or params[key] <= 0:
+                raise ValueError(f"Predictor param '{key}' must be a positive number.")
+
     # ═══════════════════════════════════════════════════════════════════════════
     #  SIGNAL SCORING
     # ═══════════════════════════════════════════════════════════════════════════
 
-    def _score_all_signals(self, df: pd.DataFrame,
-                           ind: dict) -> Tuple[dict, list]:
+    def _score_all_signals(self, df: pd.DataFrame, ind: dict,
+                           obv_trend: float | None = None) -> Tuple[dict, list]:
         """
         Compute each signal score in [-1, +1] and build a human-readable
         breakdown list for the frontend.
@@ -271,7 +457,7 @@ class PredictionService:
         # ── 8. OBV Trend ──────────────────────────────────────────────────
         obv    = float(ind.get("obv", 0) or 0)
         closes = df["Close"]
-        obv_sma = self._compute_obv_trend(df)
+        obv_sma = obv_trend if obv_trend is not None else self._compute_obv_trend(df)
         obv_score = np.clip(obv_sma / (abs(obv) + 1), -1, 1) if obv else 0.0
 
         scores["obv_trend"] = obv_score
@@ -283,6 +469,85 @@ class PredictionService:
 
         return scores, details
 
+    def score_many(self, cp: np.ndarray, ind: dict,
+                   obv_trend: np.ndarray) -> dict:
+        """
+        Array version of _score_all_signals() (scores only). NaN inputs
+        behave like the None values predict() sees for missing indicators.
+        Scores do not depend on WEIGHTS or the thresholds, so the optimiser
+        computes them once per window.
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # ── 1. SMA Crossover ─────────────────────────────────────────
+            sma20, sma50 = ind["sma20"], ind["sma50"]
+            has_sma = (sma20 != 0) & (sma50 != 0)
+            sma_score = np.select(
+                [has_sma & (cp > sma20) & (sma20 > sma50),
+                 has_sma & (cp > sma20),
+                 has_sma & (cp < sma20) & (sma20 < sma50),
+                 has_sma & (cp < sma20)],
+                [1.0, 0.5, -1.0, -0.5], default=0.0)
+
+            # ── 2. EMA Crossover ─────────────────────────────────────────
+            ema12, ema26 = ind["ema12"], ind["ema26"]
+            has_ema   = self._truthy(ema12) & self._truthy(ema26)
+            ema_score = np.where(has_ema, np.clip((ema12 - ema26) / ema26 * 50, -1, 1), 0.0)
+
+            # ── 3. MACD Crossover ────────────────────────────────────────
+            macd = self._or_default(ind["macd"], 0)
+            hist = self._or_default(ind["macd_hist"], 0)
+            macd_score = np.where(macd != 0,
+                                  np.clip(hist / (np.abs(macd) + 1e-6), -1, 1), 0.0)
+
+            # ── 4. RSI Regime ────────────────────────────────────────────
+            rsi = self._or_default(ind["rsi14"], 50)
+            rsi_score = np.select(
+                [rsi < 30, rsi > 70, (rsi >= 40) & (rsi <= 60), rsi > 60],
+                [0.8, -0.8, 0.0, 0.4], default=-0.4)
+
+            # ── 5. Bollinger Band Position ───────────────────────────────
+            bb_upper, bb_lower, bb_mid = ind["bb_upper"], ind["bb_lower"], ind["bb_middle"]
+            band_range = bb_upper - bb_lower
+            has_bb = (self._truthy(bb_upper) & self._truthy(bb_lower)
+                      & self._truthy(bb_mid) & (band_range > 0))
+            rel_pos  = (cp - bb_mid) / (band_range / 2)
+            bb_score = np.where(has_bb, np.clip(-rel_pos * 0.6, -1, 1), 0.0)
+
+            # ── 6. Volatility-Adjusted Momentum ──────────────────────────
+            vol_ann   = self._or_default(ind["volatility_ann"], 20)
+            ret_7d    = self._or_default(ind["return_7d"], 0)
+            vol_score = np.clip(ret_7d / (vol_ann + 1e-6) * 2, -1, 1)
+
+            # ── 7. Return Momentum ───────────────────────────────────────
+            ret_30d      = self._or_default(ind["return_30d"], 0)
+            ret_momentum = np.clip(ret_30d / 15, -1, 1)
+
+            # ── 8. OBV Trend ─────────────────────────────────────────────
+            obv       = self._or_default(ind["obv"], 0)
+            obv_score = np.where(obv != 0,
+                                 np.clip(obv_trend / (np.abs(obv) + 1), -1, 1), 0.0)
+
+        return {
+            "sma_cross"      : sma_score,
+            "ema_cross"      : ema_score,
+            "macd_cross"     : macd_score,
+            "rsi_regime"     : rsi_score,
+            "bollinger_pos"  : bb_score,
+            "vol_momentum"   : vol_score,
+            "return_momentum": ret_momentum,
+            "obv_trend"      : obv_score,
+        }
+
+    @staticmethod
+    def _truthy(a: np.ndarray) -> np.ndarray:
+        """Array form of `if x:` for optional floats (None → NaN → False)."""
+        return ~np.isnan(a) & (a != 0)
+
+    @staticmethod
+    def _or_default(a: np.ndarray, default: float) -> np.ndarray:
+        """Array form of `x or default` for optional floats."""
+        return np.where(np.isnan(a) | (a == 0), default, a)
+
     # ═══════════════════════════════════════════════════════════════════════════
     #  CONFIDENCE SCORING
     # ═══════════════════════════════════════════════════════════════════════════
@@ -317,6 +582,30 @@ class PredictionService:
         confidence = round(base - vol_penalty + rsi_boost, 1)
         return float(np.clip(confidence, 20, 92))  # floor=20, ceiling=92
 
+    def _confidence_many(self, scores: dict, ind: dict,
+                         volatility: np.ndarray) -> np.ndarray:
+        """Array version of _compute_confidence()."""
+        s = [scores[k] for k in scores]
+
+        # Sign of np.mean over 8 values, summed in NumPy's pairwise order so
+        # near-zero means resolve to the same sign as in predict()
+        total    = ((s[0] + s[1]) + (s[2] + s[3])) + ((s[4] + s[5]) + (s[6] + s[7]))
+        mean_dir = np.sign(total / len(s))
+        agreeing = sum((np.sign(v) == mean_dir).astype(np.int64) for v in s)
+        agreement_ratio = agreeing / len(s)
+
+        base        = 50 + (agreement_ratio - 0.5) * 80
+        vol_penalty = np.minimum(volatility / 80, 0.3) * 100
+
+        rsi       = self._or_default(ind["rsi14"], 50)
+        rsi_boost = np.where((rsi < 35) | (rsi > 65), 5, 0)
+
+        # predict() rounds a Python float here, which is correctly rounded;
+        # np.round can differ in the last digit, so round element-wise.
+        raw        = base - vol_penalty + rsi_boost
+        confidence = np.array([round(v, 1) for v in raw.tolist()], dtype=np.float64)
+        return np.clip(confidence, 20, 92)
+
     # ═══════════════════════════════════════════════════════════════════════════
     #  HELPERS
     # ═══════════════════════════════════════════════════════════════════════════
@@ -0,0 +1,273 @@
+"""
+==============================================================================
+services/scheduler.py
+==============================================================================
+Responsibility : Background refresh of precomputed payloads (dashboard
+                 snapshots, screener index) on a market-hours-aware clock.
+
+  ─ MarketHours     : exchange session calendar (weekdays, open/close time
+                      in the exchange time zone, optional holiday list)
+  ─ HostLock        : elects one process per host (gunicorn workers share
+                      a lock file) to run the jobs that must not multiply
+                      with the worker count
+  ─ RefreshScheduler: runs registered jobs on a worker pool.
+        While the market is open a job runs every `interval` seconds,
+        aligned to the session open (09:15, 09:16, ... for 60 s).
+        After the close it runs once more to capture closing prices, then
+        sleeps until the next open (or every `closed_interval` seconds).
+        A job never overlaps with its own previous run; a failure is logged
+        and the job keeps its schedule.
+
+Jobs are expected to build their result off to the side and publish it
+with a single assignment, so readers always see a complete payload.
+==============================================================================
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+logger = logging.getLogger(__name__)
+
+
+class MarketHours:
+    """Regular trading session of one exchange (default: NSE)."""
+
+    def __init__(self, tz: str = "Asia/Kolkata", open_time: str = "09:15",
+                 close_time: str = "15:30", holidays=()):
+        self.tz       = ZoneInfo(tz)
+        self.open_at  = datetime.strptime(open_time, "%H:%M").time()
+        self.close_at = datetime.strptime(close_time, "%H:%M").time()
+        self.holidays = {date.fromisoformat(d) if isinstance(d, str) else d
+                         for d in holidays}
+
+    def is_trading_day(self, day: date) -> bool:
+        return day.weekday() < 5 and day not in self.holidays
+
+    def session(self, day: date) -> tuple:
+        """(open, close) datetimes of `day` in the exchange time zone."""
+        return (datetime.combine(day, self.open_at, tzinfo=self.tz),
+                datetime.combine(day, self.close_at, tzinfo=self.tz))
+
+    def is_open(self, now: datetime) -> bool:
+        local = now.astimezone(self.tz)
+        if not self.is_trading_day(local.date()):
+            return False
+        start, end = self.session(local.date())
+        return start <= local < end
+
+    def next_open(self, now: datetime) -> datetime:
+        """First session open strictly after `now`."""
+        day = now.astimezone(self.tz).date()
+        for _ in range(370):
+            if self.is_trading_day(day):
+                start, _ = self.session(day)
+                if start > now:
+                    return start
+            day += timedelta(days=1)
+        raise ValueError("No trading day within a year; check MARKET_HOLIDAYS.")
+
+    def last_close(self, now: datetime) -> datetime | None:
+        """Most recent session close at or before `now`."""
+        day = now.astimezone(self.tz).date()
+        for _ in range(370):
+            if self.is_trading_day(day):
+                _, end = self.session(day)
+                if end <= now:
+                    return end
+            day -= timedelta(days=1)
+        return None
+
+
+class HostLock:
+    """
+    Non-blocking exclusive lock on a file, held for the life of the process.
+
+    The first process on the host to call acquire() gets True; the others
+    get False until that process exits (the OS releases the lock then, so a
+    crashed holder never blocks the next election).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd  = None
+
+    def acquire(self) -> bool:
+        if self._fd is not None:
+            return True
+        try:
+            import fcntl
+        except ImportError:                       # no flock (Windows): single process
+            return True
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+
+class _Job:
+    __slots__ = ("name", "fn", "interval", "closed_interval", "next_run",
+                 "last_run", "last_duration", "last_error", "runs", "running")
+
+    def __init__(self, name, fn, interval, closed_interval):
+        self.name            = name
+        self.fn              = fn
+        self.interval        = interval
+        self.closed_interval = closed_interval
+        self.next_run        = None
+        self.last_run        = None
+        self.last_duration   = None
+        self.last_error      = None
+        self.runs            = 0
+        self.running         = False
+
+
+class RefreshScheduler:
+    """
+    Market-hours-aware periodic job runner.
+
+    Usage:
+        scheduler = RefreshScheduler(MarketHours())
+        scheduler.add("trending", refresh_trending, interval=60)
+        scheduler.start()
+    """
+
+    # Delay after the close before the closing-price refresh
+    CLOSE_GRACE = timedelta(minutes=2)
+
+    # Longest the loop sleeps before re-checking the clock
+    MAX_SLEEP = 30.0
+
+    def __init__(self, market: MarketHours, workers: int = 2, clock=None):
+        self.market = market
+        self._clock = clock or (lambda: datetime.now(timezone.utc))
+        self._jobs  = {}
+        self._pool  = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="refresh")
+        self._lock  = threading.Lock()
+        self._wake  = threading.Event()
+        self._stop  = threading.Event()
+        self._thread = None
+
+    # ─── Public API ──────────────────────────────────────────────────────────
+
+    def add(self, name: str, fn, interval: float,
+            closed_interval: float | None = None, run_now: bool = True):
+        """
+        Register a job.
+
+        Args:
+            interval        : Seconds between runs while the market is open.
+            closed_interval : Optional seconds between runs while closed
+                              (default: only the post-close run).
+            run_now         : Run once immediately regardless of the session.
+        """
+        job = _Job(name, fn, interval, closed_interval)
+        now = self._clock()
+        job.next_run = now if run_now else self.next_run_time(job, now)
+        with self._lock:
+            self._jobs[name] = job
+        self._wake.set()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name="refresh-scheduler",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def run_now(self, name: str):
+        """Make a job due immediately (e.g. after a config change)."""
+        with self._lock:
+            self._jobs[name].next_run = self._clock()
+        self._wake.set()
+
+    def status(self) -> dict:
+        """Per-job schedule and last-run information."""
+        def _iso(ts):
+            return ts.isoformat(timespec="seconds") if ts else None
+
+        with self._lock:
+            return {
+                name: {
+                    "next_run"     : _iso(job.next_run),
+                    "last_run"     : _iso(job.last_run),
+                    "last_duration": job.last_duration,
+                    "last_error"   : job.last_error,
+                    "runs"         : job.runs,
+                    "running"      : job.running,
+                }
+                for name, job in self._jobs.items()
+            }
+
+    def next_run_time(self, job: _Job, now: datetime) -> datetime:
+        """When `job` should next run, given that it is not running at `now`."""
+        market = self.market
+        if market.is_open(now):
+            local       = now.astimezone(market.tz)
+            start, end  = market.session(local.date())
+            step        = timedelta(seconds=job.interval)
+            ticks       = int((now - start) / step) + 1
+            candidate   = start + ticks * step
+            return candidate if candidate < end else end + self.CLOSE_GRACE
+
+        # Closed: one run after the latest close, then wait for the next open
+        last_close = market.last_close(now)
+        if last_close is not None and (job.last_run is None
+                                       or job.last_run < last_close + self.CLOSE_GRACE):
+            return max(now, last_close + self.CLOSE_GRACE)
+
+        candidate = market.next_open(now)
+        if job.closed_interval and job.last_run is not None:
+            candidate = min(candidate, job.last_run + timedelta(seconds=job.closed_interval))
+        return max(candidate, now)
+
+    # ─── Private helpers ─────────────────────────────────────────────────────
+
+    def _loop(self):
+        while not self._stop.is_set():
+            now = self._clock()
+            with self._lock:
+                due = [j for j in self._jobs.values()
+                       if not j.running and j.next_run <= now]
+                for job in due:
+                    job.running  = True
+                    job.last_run = now
+            for job in due:
+                self._pool.submit(self._run, job)
+
+            with self._lock:
+                pending = [j.next_run for j in self._jobs.values() if not j.running]
+            sleep = min([(t - self._clock()).total_seconds() for t in pending]
+                        + [self.MAX_SLEEP])
+            self._wake.wait(max(sleep, 0.05))
+            self._wake.clear()
+
+    def _run(self, job: _Job):
+        started = time.perf_counter()
+        error   = None
+        try:
+            job.fn()
+        except Exception as e:
+            error = str(e)
+            logger.error(f"Scheduler: job '{job.name}' failed: {e}")
+        finally:
+            with self._lock:
+                job.running       = False
+                job.runs         += 1
+                job.last_error    = error
+                job.last_duration = round(time.perf_counter() - started, 3)
+                job.next_run      = self.next_run_time(job, self._clock())
+            self._wake.set()
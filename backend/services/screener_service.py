@@ -0,0 +1,258 @@
+"""
+==============================================================================
+services/screener_service.py
+==============================================================================
+Responsibility : Filter / sort queries over the latest indicator and
+                 prediction scalars of a whole ticker universe.
+
+A scheduled refresh (services/scheduler.py) builds a ScreenerIndex from one
+batched history download, compute_universe-style NumPy passes and
+predict_many(). The index is immutable and swapped in with a single
+reference assignment, so queries never see a half-built snapshot and never
+wait on upstream I/O.
+
+Index layout (columnar):
+  ─ One float64 column per numeric field, row i = ticker i
+  ─ Per field, the row ids sorted by value (NaN rows dropped) plus the
+    sorted values, so `field op constant` is two binary searches
+  ─ Categorical columns (trend) as string arrays
+
+Query syntax (see parse_filters):
+    rsi14<30,price>sma50,trend=BULLISH      comma-separated, all must hold
+==============================================================================
+"""
+
+import logging
+import math
+import re
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from services.indicator_service import IndicatorService
+from services.prediction_service import PredictionService
+
+logger = logging.getLogger(__name__)
+
+
+# Numeric fields besides IndicatorService.FIELDS
+PRICE_FIELDS      = ["price", "predicted", "change_pct", "confidence", "net_score"]
+CATEGORY_FIELDS   = ["trend"]
+
+_FILTER_PATTERN = re.compile(r"^\s*([a-z0-9_]+)\s*(<=|>=|!=|=|<|>)\s*(.+?)\s*$")
+
+
+class ScreenerIndex:
+    """Immutable columnar snapshot of one universe refresh."""
+
+    NUMERIC_FIELDS = IndicatorService.FIELDS + PRICE_FIELDS
+
+    def __init__(self, tickers: list, columns: dict, categories: dict,
+                 generated_at: str):
+        self.tickers      = np.asarray(tickers)
+        self.columns      = columns
+        self.categories   = categories
+        self.generated_at = generated_at
+
+        # field → (row ids sorted by value, sorted values, NaN row ids)
+        self._sorted = {}
+        for field, col in columns.items():
+            order   = np.argsort(col, kind="stable")      # NaN rows sort last
+            n_valid = int((~np.isnan(col)).sum())
+            self._sorted[field] = (order[:n_valid], col[order[:n_valid]], order[n_valid:])
+
+    def __len__(self):
+        return len(self.tickers)
+
+    # ─── Query ───────────────────────────────────────────────────────────────
+
+    def query(self, filters: list, sort: str | None = None, limit: int = 50,
+              fields: list | None = None) -> dict:
+        """
+        Run parsed filters, then sort and project the matches.
+
+        Args:
+            filters : Output of parse_filters().
+            sort    : Field name, '-' prefix for descending (NaN rows last).
+            limit   : Max rows returned.
+            fields  : Fields to return per row (default: all).
+
+        Returns:
+            {"results": [row dicts], "matches": int}
+        """
+        mask = np.ones(len(self.tickers), dtype=bool)
+        for field, op, rhs in filters:
+            mask &= self._match(field, op, rhs)
+
+        if sort:
+            field = sort.lstrip("-")
+            order, _, missing = self._sorted[field]
+            if sort.startswith("-"):
+                order = order[::-1]
+            rows = np.concatenate([order, missing])
+            rows = rows[mask[rows]]
+        else:
+            rows = np.flatnonzero(mask)
+
+        fields = fields or self.NUMERIC_FIELDS + CATEGORY_FIELDS
+        return {
+            "results": [self._row(i, fields) for i in rows[:limit]],
+            "matches": int(len(rows)),
+        }
+
+    # ─── Private helpers ─────────────────────────────────────────────────────
+
+    def _match(self, field: str, op: str, rhs) -> np.ndarray:
+        """Boolean row mask for one `field op rhs` condition."""
+        if field in self.categories:
+            col = self.categories[field]
+            return col == rhs if op == "=" else col != rhs
+
+        col = self.columns[field]
+        if isinstance(rhs, str):     # field-to-field comparison: one vector op
+            other = self.columns[rhs]
+            with np.errstate(invalid="ignore"):
+                match = {"<": col < other, "<=": col <= other, ">": col > other,
+                         ">=": col >= other, "=": col == other, "!=": col != other}[op]
+            # NaN != x is True; like the scalar path, missing values never match
+            return match & ~np.isnan(col) & ~np.isnan(other)
+
+        order, values, _ = self._sorted[field]
+        lo = np.searchsorted(values, rhs, side="left")
+        hi = np.searchsorted(values, rhs, side="right")
+        rows = {
+            "<" : order[:lo],
+            "<=": order[:hi],
+            ">" : order[hi:],
+            ">=": order[lo:],
+            "=" : order[lo:hi],
+            "!=": np.concatenate([order[:lo], order[hi:]]),
+        }[op]
+        mask = np.zeros(len(self.tickers), dtype=bool)
+        mask[rows] = True
+        return mask
+
+    def _row(self, i: int, fields: list) -> dict:
+        row = {"ticker": str(self.tickers[i])}
+        for f in fields:
+            if f in self.categories:
+                row[f] = str(self.categories[f][i])
+            else:
+                v = self.columns[f][i]
+                row[f] = None if np.isnan(v) else float(v)
+        return row
+
+
+def parse_filters(expr: str) -> list:
+    """
+    Parse 'rsi14<30,price>sma50,trend=BULLISH' into (field, op, rhs) tuples.
+
+    rhs is a float, another numeric field name, or (for categorical fields)
+    an upper-cased label. Raises ValueError with a user-facing message.
+    """
+    numeric = set(ScreenerIndex.NUMERIC_FIELDS)
+    filters = []
+    for part in (p for p in expr.split(",") if p.strip()):
+        m = _FILTER_PATTERN.match(part.lower())
+        if not m:
+            raise ValueError(f"Invalid filter '{part.strip()}'. Use e.g. rsi14<30 or price>sma50.")
+        field, op, rhs = m.groups()
+
+        if field in CATEGORY_FIELDS:
+            if op not in ("=", "!="):
+                raise ValueError(f"Field '{field}' only supports = and !=.")
+            filters.append((field, op, rhs.upper()))
+            continue
+        if field not in numeric:
+            raise ValueError(f"Unknown screener field '{field}'. "
+                             f"Accepted values: {', '.join(sorted(numeric | set(CATEGORY_FIELDS)))}.")
+        if rhs in numeric:
+            filters.append((field, op, rhs))
+            continue
+        try:
+            value = float(rhs)
+        except ValueError:
+            value = math.nan
+        if not math.isfinite(value):          # nan / inf would match every row
+            raise ValueError(f"Invalid value '{rhs}' in filter '{part.strip()}'.")
+        filters.append((field, op, value))
+    return filters
+
+
+class ScreenerService:
+    """
+    Owns the current ScreenerIndex and the job that rebuilds it.
+
+    Usage:
+        screener = ScreenerService(stock_svc, indicator_svc, prediction_svc,
+                                   universe=["RELIANCE.NS", ...])
+        screener.refresh()                    # scheduled by app.py
+        screener.index.query(parse_filters("rsi14<30"), sort="-confidence")
+    """
+
+    def __init__(self, stock_svc, indicator_svc: IndicatorService,
+                 prediction_svc: PredictionService, universe: list,
+                 period: str = "3mo"):
+        self.stock_svc      = stock_svc
+        self.indicator_svc  = indicator_svc
+        self.prediction_svc = prediction_svc
+        self.universe       = list(dict.fromkeys(universe))
+        self.period         = period
+
+        self.index = None               # current ScreenerIndex (None until built)
+
+    # ─── Refresh ─────────────────────────────────────────────────────────────
+
+    def refresh(self) -> ScreenerIndex:
+        """Rebuild the index from fresh histories and swap it in."""
+        started = time.perf_counter()
+        frames  = self.stock_svc.fetch_history_many(self.universe, self.period)
+        frames  = {t: df for t, df in frames.items() if df is not None and not df.empty}
+
+        index = self.build_index(frames)
+        self.index = index
+        logger.info(f"Screener: indexed {len(index)}/{len(self.universe)} tickers "
+                    f"in {time.perf_counter() - started:.2f}s")
+        return index
+
+    def build_index(self, frames: dict) -> ScreenerIndex:
+        """Compute every screener field for `frames` in columnar form."""
+        svc = self.indicator_svc
+        _, tickers, close, high, low, volume = svc.align_frames(frames)
+        n = len(tickers)
+
+        columns   = {f: np.full(n, np.nan) for f in IndicatorService.FIELDS}
+        obv_trend = np.zeros(n)
+
+        # Tickers on the shared calendar: one vectorised pass
+        cols = np.flatnonzero(svc.contiguous_columns(close)) if n else np.empty(0, int)
+        if len(cols):
+            latest, _, trend = svc.universe_arrays(close[:, cols], high[:, cols],
+                                                   low[:, cols], volume[:, cols])
+            for f in IndicatorService.FIELDS:
+                columns[f][cols] = np.round(latest[f], 4)
+            obv_trend[cols] = trend
+
+        # The rest (holes in the shared index) through the per-ticker graph
+        for j in np.setdiff1d(np.arange(n), cols):
+            graph = svc.evaluate(frames[tickers[j]])
+            for f, v in graph.to_dict(series=False).items():
+                columns[f][j] = np.nan if v is None else v
+            obv_trend[j] = graph.value("obv_trend")
+
+        current = np.array([float(frames[t]["Close"].iloc[-1]) for t in tickers])
+        preds   = self.prediction_svc.predict_many(
+            current, {k: columns[k] for k in PredictionService.REQUIRED_INDICATORS}, obv_trend)
+
+        columns.update({
+            "price"     : np.round(current, 2),
+            "predicted" : preds["predicted_price"],
+            "change_pct": preds["change_pct"],
+            "confidence": preds["confidence"],
+            "net_score" : np.round(preds["net_score"], 4),
+        })
+        return ScreenerIndex(
+            tickers, columns, {"trend": np.asarray(preds["trend"], dtype=str)},
+            generated_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        )
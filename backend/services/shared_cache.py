@@ -0,0 +1,252 @@
+"""
+==============================================================================
+services/shared_cache.py
+==============================================================================
+Responsibility : Cross-process cache tier behind TTLCache, so the gunicorn
+                 workers on one host share upstream fetches.
+
+Design:
+  ─ One SQLite file in WAL mode: readers never block the writer, and every
+    worker (and thread) opens its own connection to it.
+  ─ Values are stored compactly: DataFrames via utils.serializer.pack_frame
+    (raw column buffers), everything else as MessagePack.
+  ─ Expiry is wall-clock (time.time()), so it means the same in every
+    process; a hit returns the remaining TTL for the in-process tier.
+  ─ Per-key locks are leased rows in a `locks` table: on a miss one worker
+    loads while the others poll for its result. A lease that outlives
+    `lock_timeout` (crashed or stuck worker) is taken over, and a waiter
+    that gives up loads on its own — a lock never blocks a request for good.
+  ─ Any SQLite error degrades to "no shared tier" for that call; the
+    request still goes upstream.
+==============================================================================
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from utils.serializer import pack_value, unpack_value
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS entries (
+           key        TEXT PRIMARY KEY,
+           expires_at REAL NOT NULL,
+           value      BLOB NOT NULL
+       ) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS locks (
+           key        TEXT PRIMARY KEY,
+           owner      TEXT NOT NULL,
+           expires_at REAL NOT NULL
+       ) WITHOUT ROWID""",
+    "CREATE INDEX IF NOT EXISTS entries_expiry ON entries (expires_at)",
+)
+
+
+class SharedCache:
+    """
+    SQLite-backed key → value store with TTLs and cross-process per-key locks.
+
+    Usage:
+        shared = SharedCache("data/shared-cache.sqlite3")
+        value, ttl_left = shared.get_or_load(key, loader, ttl=60)
+    """
+
+    def __init__(self, path: str, max_entries: int = 4096,
+                 lock_timeout: float = 15.0, poll_interval: float = 0.02,
+                 purge_every: int = 256):
+        self.path          = path
+        self.max_entries   = max_entries
+        self.lock_timeout  = lock_timeout
+        self.poll_interval = poll_interval
+        self.purge_every   = purge_every
+
+        self._local  = threading.local()
+        self._lock   = threading.Lock()
+        self._writes = 0
+        self._stats  = {
+            "hits"         : 0,
+            "misses"       : 0,
+            "waits"        : 0,     # another worker was loading the key
+            "lock_timeouts": 0,
+            "errors"       : 0,
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._conn() as conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+
+    # ─── Public API ──────────────────────────────────────────────────────────
+
+    def get(self, key):
+        """(value, ttl_left) for a live entry, else None."""
+        try:
+            row = self._conn().execute(
+                "SELECT expires_at, value FROM entries WHERE key = ?",
+                (self._key(key),)).fetchone()
+        except sqlite3.Error as e:
+            self._error("get", e)
+            return None
+        ttl_left = row[0] - time.time() if row else 0.0
+        self._count("hits" if ttl_left > 0 else "misses")
+        if ttl_left <= 0:
+            return None
+        return unpack_value(row[1]), ttl_left
+
+    def set(self, key, value, ttl: float):
+        """Store `value` for `ttl` seconds (values it can't encode are skipped)."""
+        try:
+            blob = pack_value(value)
+        except (TypeError, ValueError) as e:
+            logger.debug(f"SharedCache: not sharing {key!r}: {e}")
+            return
+        try:
+            with self._conn() as conn:
+                conn.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?)",
+                             (self._key(key), time.time() + ttl, blob))
+        except sqlite3.Error as e:
+            self._error("set", e)
+            return
+        with self._lock:
+            self._writes += 1
+            purge = self._writes % self.purge_every == 0
+        if purge:
+            self.purge()
+
+    def get_or_load(self, key, loader, ttl: float) -> tuple:
+        """
+        (value, ttl_left) from the shared tier, calling `loader()` on a miss.
+
+        Only one worker (the lock holder) calls its loader for a key at a
+        time; the others wait for its entry. Loader exceptions propagate
+        and are not stored.
+        """
+        hit = self.get(key)
+        if hit is not None:
+            return hit
+
+        owner    = self._acquire(key)
+        deadline = time.monotonic() + self.lock_timeout
+        if owner is None:
+            self._count("waits")
+        while owner is None:
+            time.sleep(self.poll_interval)
+            hit = self._peek(key)
+            if hit is not None:
+                return hit
+            if time.monotonic() >= deadline:
+                self._count("lock_timeouts")
+                break                               # load without the lock
+            owner = self._acquire(key)
+
+        try:
+            if owner is not None:
+                hit = self._peek(key)               # stored between get() and lock
+                if hit is not None:
+                    return hit
+            value = loader()
+            self.set(key, value, ttl)
+            return value, ttl
+        finally:
+            if owner is not None:
+                self._release(key, owner)
+
+    def purge(self):
+        """Drop expired entries and stale locks, then trim to max_entries."""
+        now = time.time()
+        try:
+            with self._conn() as conn:
+                conn.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+                conn.execute("DELETE FROM locks WHERE expires_at <= ?", (now,))
+                conn.execute(
+                    "DELETE FROM entries WHERE key IN (SELECT key FROM entries "
+                    "ORDER BY expires_at DESC LIMIT -1 OFFSET ?)", (self.max_entries,))
+        except sqlite3.Error as e:
+            self._error("purge", e)
+
+    def delete(self, key):
+        try:
+            with self._conn() as conn:
+                conn.execute("DELETE FROM entries WHERE key = ?", (self._key(key),))
+        except sqlite3.Error as e:
+            self._error("delete", e)
+
+    def clear(self):
+        try:
+            with self._conn() as conn:
+                conn.execute("DELETE FROM entries")
+        except sqlite3.Error as e:
+            self._error("clear", e)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {**self._stats,
+                    "hit_ratio": round(self._stats["hits"] / lookups, 4) if lookups else 0.0}
+
+    # ─── Private helpers ─────────────────────────────────────────────────────
+
+    def _peek(self, key):
+        """get() without counting (polling while another worker loads)."""
+        try:
+            row = self._conn().execute(
+                "SELECT expires_at, value FROM entries WHERE key = ? AND expires_at > ?",
+                (self._key(key), time.time())).fetchone()
+        except sqlite3.Error as e:
+            self._error("get", e)
+            return None
+        return (unpack_value(row[1]), row[0] - time.time()) if row else None
+
+    def _acquire(self, key) -> str | None:
+        """Take (or take over an expired) lease on `key`; owner token or None."""
+        owner = uuid.uuid4().hex
+        now   = time.time()
+        try:
+            with self._conn() as conn:
+                cur = conn.execute(
+                    "INSERT INTO locks VALUES (?, ?, ?) ON CONFLICT(key) DO UPDATE "
+                    "SET owner = excluded.owner, expires_at = excluded.expires_at "
+                    "WHERE locks.expires_at <= ?",
+                    (self._key(key), owner, now + self.lock_timeout, now))
+        except sqlite3.Error as e:
+            self._error("lock", e)
+            return owner                    # no coordination possible: just load
+        return owner if cur.rowcount == 1 else None
+
+    def _release(self, key, owner: str):
+        try:
+            with self._conn() as conn:
+                conn.execute("DELETE FROM locks WHERE key = ? AND owner = ?",
+                             (self._key(key), owner))
+        except sqlite3.Error as e:
+            self._error("unlock", e)
+
+    def _conn(self) -> sqlite3.Connection:
+        """Per-thread connection, reopened after a fork (gunicorn --preload)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = self._local.conn = self._connect()
+            self._local.pid = os.getpid()
+        return conn
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
+
+    def _error(self, op: str, e: Exception):
+        self._count("errors")
+        logger.warning(f"SharedCache: {op} failed: {e}")
+
+    @staticmethod
+    def _key(key) -> str:
+        return repr(key)
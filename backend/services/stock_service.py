@@ -2,37 +2,88 @@
 ==============================================================================
 services/stock_service.py
 ==============================================================================
-Responsibility : All interactions with Yahoo Finance (via yfinance).
-                 Isolates data-layer logic from business logic.
+Responsibility : All market-data access (Yahoo Finance by default, via a
+                 pluggable MarketDataProvider). Isolates data-layer logic
+                 from business logic.
 ==============================================================================
 """
 
-import yfinance as yf
 import pandas as pd
 import numpy as np
+import asyncio
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+from services.bar_store import BarStore
+from services.cache import TTLCache
+from services.meta_store import MetaStore
+from services.market_data import (MarketDataProvider, YFinanceProvider,
+                                  PERIOD_OFFSETS)
+from utils.serializer import round_list, int_list, date_labels
+
 logger = logging.getLogger(__name__)
 
 
 class StockService:
     """
-    Encapsulates Yahoo Finance data fetching for OHLCV history,
-    company meta-information, and live quotes.
+    Encapsulates market-data fetching for OHLCV history, company
+    meta-information, and live quotes. The upstream source is a
+    MarketDataProvider (YFinanceProvider unless another is injected).
 
     Design notes:
     - All public methods return plain Python dicts / pandas DataFrames.
     - NaN values are cleaned before returning so callers never see them.
     - Errors are logged and re-raised; caller decides how to handle.
+    - With a BarStore attached, fetch_history downloads only new bars.
+    - With a TTLCache attached, every public fetch is cached per CACHE_TTL
+      and concurrent identical requests share one upstream call.
+    - With a MetaStore attached, fetch_meta (and the name / currency of
+      quick_quote) is served from memory; the provider's meta call runs
+      only on a ticker's first sighting, in refresh_meta(), and in the
+      background when a read finds a group past its max age.
+    - The a*-prefixed coroutines (used by asgi.py) run the same blocking
+      calls on a dedicated wide I/O pool, so an event loop can keep
+      hundreds of upstream waits in flight without blocking.
     """
 
+    # Calendar length of each supported `period`, used to slice stored bars
+    PERIOD_OFFSETS = PERIOD_OFFSETS
+
+    # Default freshness window (seconds) per cached method
+    CACHE_TTL = {
+        "history": 60,
+        "meta"   : 6 * 3600,
+        "quote"  : 30,
+    }
+
+    def __init__(self, provider: MarketDataProvider | None = None,
+                 bar_store: BarStore | None = None,
+                 cache: TTLCache | None = None,
+                 cache_ttl: dict | None = None,
+                 io_threads: int = 64,
+                 meta_store: MetaStore | None = None):
+        self._provider = provider or YFinanceProvider()
+        self._bars     = bar_store
+        self._cache    = cache
+        self._meta     = meta_store
+        self._ttl      = {**self.CACHE_TTL, **(cache_ttl or {})}
+
+        self._io_threads = io_threads
+        self._io_pool    = None          # created on first async call
+        self._io_guard   = threading.Lock()
+        self._meta_refreshing = set()    # tickers with a read-triggered refresh running
+
     # ─── Public API ──────────────────────────────────────────────────────────
 
     def fetch_history(self, ticker: str, period: str = "3mo") -> pd.DataFrame:
         """
         Download OHLCV daily bars for the given ticker and period.
 
+        When a BarStore is configured, bars already on disk are reused and
+        only bars from the last stored date onwards are requested upstream.
+
         Args:
             ticker  : Yahoo Finance symbol, e.g. "RELIANCE.NS"
             period  : One of '1mo','3mo','6mo','1y','2y','5y'
@@ -41,34 +92,37 @@ class StockService:
             pd.DataFrame with columns [Open, High, Low, Close, Volume]
             indexed by Date. Returns empty DataFrame on failure.
         """
-        logger.info(f"Fetching history: {ticker} / {period}")
-        try:
-            df = yf.download(ticker, period=period, auto_adjust=True,
-                             progress=False, threads=False)
+        return self._cached(("history", ticker, period), "history",
+                            lambda: self._load_history(ticker, period))
 
-            if df.empty:
-                logger.warning(f"Empty response from yfinance for {ticker}")
-                return pd.DataFrame()
-
-            # ── Clean up ──────────────────────────────────────────────────
-            df = df[["Open", "High", "Low", "Close", "Volume"]].copy()
+    def fetch_history_many(self, tickers: list, period: str = "3mo") -> dict:
+        """
+        Batched fetch_history for a list of tickers.
 
-            # Flatten multi-level columns if present (yfinance quirk)
-            if isinstance(df.columns, pd.MultiIndex):
-                df.columns = df.columns.get_level_values(0)
+        Cached histories are reused and histories another caller is
+        already loading are waited for; all remaining tickers are fetched with
+        one multi-symbol provider call (two when the bar store holds some
+        of them: one full-window call for cold tickers, one delta call for
+        warm ones) and split into per-ticker frames.
 
-            # Drop rows where Close is NaN (incomplete bars)
-            df.dropna(subset=["Close"], inplace=True)
+        Returns:
+            {ticker: DataFrame} for every requested ticker, in request order.
+            Tickers without data map to an empty DataFrame.
+        """
+        tickers = list(dict.fromkeys(tickers))
 
-            # Forward-fill remaining NaNs (e.g. missing Volume)
-            df.ffill(inplace=True)
+        def load(keys: list) -> dict:
+            loaded = self._load_history_many([k[1] for k in keys], period)
+            return {k: loaded.get(k[1], pd.DataFrame()) for k in keys}
 
-            logger.info(f"Fetched {len(df)} bars for {ticker}")
-            return df
-
-        except Exception as e:
-            logger.error(f"fetch_history failed for {ticker}: {e}")
-            raise
+        keys = [("history", t, period) for t in tickers]
+        if self._cache is None:
+            frames = load(keys)
+        else:
+            # Keys in flight (fetch_history, another batch) are waited for,
+            # not downloaded again; ours are in flight for them
+            frames = self._cache.get_or_load_many(keys, load, self._ttl["history"])
+        return {k[1]: frames[k] for k in keys}
 
     def fetch_meta(self, ticker: str) -> dict:
         """
@@ -76,36 +130,243 @@ class StockService:
 
         Returns a dict with safe fallbacks for missing fields.
         """
+        stored = self._stored_meta(ticker)
+        if stored is not None:
+            return stored
         try:
-            info = yf.Ticker(ticker).info
-            return {
-                "name"       : info.get("longName") or info.get("shortName") or ticker,
-                "sector"     : info.get("sector", "N/A"),
-                "industry"   : info.get("industry", "N/A"),
-                "market_cap" : self._fmt_market_cap(info.get("marketCap")),
-                "pe_ratio"   : round(info.get("trailingPE", 0) or 0, 2),
-                "week_high"  : info.get("fiftyTwoWeekHigh", "N/A"),
-                "week_low"   : info.get("fiftyTwoWeekLow", "N/A"),
-                "currency"   : info.get("currency", "INR"),
-                "exchange"   : info.get("exchange", "NSE"),
-            }
+            return self._cached(("meta", ticker), "meta",
+                                lambda: self._load_meta_stored(ticker))
         except Exception as e:
             logger.warning(f"fetch_meta failed for {ticker}: {e}")
-            return {"name": ticker, "sector": "N/A", "industry": "N/A",
-                    "market_cap": "N/A", "pe_ratio": 0,
-                    "week_high": "N/A", "week_low": "N/A",
-                    "currency": "INR", "exchange": "NSE"}
+            return self.fallback_meta(ticker)
+
+    @staticmethod
+    def fallback_meta(ticker: str) -> dict:
+        """fetch_meta's placeholder when no metadata can be loaded in time."""
+        return {"name": ticker, "sector": "N/A", "industry": "N/A",
+                "market_cap": "N/A", "pe_ratio": 0,
+                "week_high": "N/A", "week_low": "N/A",
+                "currency": "INR", "exchange": "NSE"}
 
-    def quick_quote(self, ticker: str) -> dict | None:
+    def quick_quote(self, ticker: str, hist: pd.DataFrame | None = None) -> dict | None:
         """
         Return a lightweight quote snapshot suitable for stock cards.
 
         Includes: ticker, name, current price, 1-day change %, 
                   sparkline (20-day closes), volume.
+
+        Args:
+            hist : Optional pre-fetched ~1mo daily history (e.g. a frame from
+                   fetch_history_many) so no per-ticker history call is made.
+        """
+        return self._cached(("quote", ticker), "quote",
+                            lambda: self._load_quote(ticker, hist))
+
+    def refresh_meta(self, tickers: list = (), fetch: bool = True) -> dict:
+        """
+        Background upkeep of the MetaStore (scheduler job).
+
+        Reloads the store from disk (picking up other workers' writes),
+        re-fetches every group past its max age (of tickers served
+        recently), and loads `tickers` that are not stored yet. With
+        fetch=False (processes that do not own the refresh) only the reload
+        runs. Returns {"refreshed": n, "added": n, "failed": n}.
+        """
+        counts = {"refreshed": 0, "added": 0, "failed": 0}
+        if self._meta is None:
+            return counts
+
+        self._meta.load()
+        if not fetch:
+            return counts
+        todo = self._meta.stale()
+        for t in tickers:
+            if t not in self._meta:
+                todo[t] = ("static", "market")
+
+        for ticker, groups in todo.items():
+            added = ticker not in self._meta
+            try:
+                self._meta.put(ticker, self._load_meta(ticker), groups, served=False)
+            except Exception as e:
+                logger.warning(f"Meta refresh failed for {ticker}: {e}")
+                counts["failed"] += 1
+                continue
+            counts["added" if added else "refreshed"] += 1
+
+        if todo:
+            logger.info(f"Meta refresh: {counts}")
+        return counts
+
+    def cache_stats(self) -> dict:
+        """Hit / miss / eviction counters of the attached cache (if any)."""
+        stats = self._cache.stats() if self._cache is not None else {}
+        if self._meta is not None:
+            stats = {**stats, "meta_store": self._meta.stats()}
+        return stats
+
+    def serialize_ohlcv(self, df: pd.DataFrame, typed: bool = False) -> dict:
+        """
+        Convert a DataFrame of OHLCV data to JSON-serialisable lists
+        for Chart.js consumption.
+
+        Args:
+            typed : Return NumPy arrays instead of lists, for the msgpack
+                    format: float32 prices (NaN kept; ample for charting)
+                    and float64 volume (exact below 2**53).
+
+        Returns:
+            {
+                labels  : ["2024-01-01", ...],
+                open    : [...],
+                high    : [...],
+                low     : [...],
+                close   : [...],
+                volume  : [...],
+            }
+        """
+        if typed:
+            prices = {k.lower(): np.round(df[k].to_numpy(dtype=np.float64), 2)
+                                   .astype(np.float32)
+                      for k in ("Open", "High", "Low", "Close")}
+            volume = np.nan_to_num(df["Volume"].to_numpy(dtype=np.float64), nan=0)
+            return {"labels": date_labels(df.index), **prices,
+                    "volume": np.trunc(volume)}
+
+        return {
+            "labels": date_labels(df.index),
+            "open"  : round_list(df["Open"]),
+            "high"  : round_list(df["High"]),
+            "low"   : round_list(df["Low"]),
+            "close" : round_list(df["Close"]),
+            "volume": int_list(df["Volume"]),
+        }
+
+    # ─── Async API ───────────────────────────────────────────────────────────
+
+    async def afetch_history(self, ticker: str, period: str = "3mo") -> pd.DataFrame:
+        """Awaitable fetch_history (upstream wait runs on the I/O pool)."""
+        return await self._run_io(self.fetch_history, ticker, period)
+
+    async def afetch_history_many(self, tickers: list, period: str = "3mo") -> dict:
+        """Awaitable fetch_history_many."""
+        return await self._run_io(self.fetch_history_many, tickers, period)
+
+    async def afetch_meta(self, ticker: str) -> dict:
+        """Awaitable fetch_meta (no thread hop when the MetaStore has it)."""
+        stored = self._stored_meta(ticker)
+        if stored is not None:
+            return stored
+        return await self._run_io(self.fetch_meta, ticker)
+
+    async def aquick_quote(self, ticker: str, hist: pd.DataFrame | None = None) -> dict | None:
+        """Awaitable quick_quote."""
+        return await self._run_io(self.quick_quote, ticker, hist)
+
+    # ─── Private helpers ─────────────────────────────────────────────────────
+
+    async def _run_io(self, fn, *args):
+        """
+        Run a blocking StockService call off the event loop. yfinance has
+        no async API, so each in-flight upstream wait holds one pool thread
+        (blocked in a socket read); the loop itself never blocks.
+        """
+        return await asyncio.get_running_loop().run_in_executor(self._io_executor(), fn, *args)
+
+    def _io_executor(self) -> ThreadPoolExecutor:
+        if self._io_pool is None:
+            with self._io_guard:
+                if self._io_pool is None:
+                    self._io_pool = ThreadPoolExecutor(max_workers=self._io_threads,
+                                                       thread_name_prefix="stock-io")
+        return self._io_pool
+
+    def _load_history(self, ticker: str, period: str) -> pd.DataFrame:
+        """Uncached body of fetch_history."""
+        logger.info(f"Fetching history: {ticker} / {period}")
+        try:
+            if self._bars is not None and period in self.PERIOD_OFFSETS:
+                df = self._fetch_history_stored(ticker, period)
+            else:
+                df = self._provider.history(ticker, period=period)
+
+            if df.empty:
+                logger.warning(f"Empty response from {self._provider.name} for {ticker}")
+                return pd.DataFrame()
+
+            logger.info(f"Fetched {len(df)} bars for {ticker}")
+            return df
+
+        except Exception as e:
+            logger.error(f"fetch_history failed for {ticker}: {e}")
+            raise
+
+    def _load_meta(self, ticker: str) -> dict:
         """
+        Uncached body of fetch_meta; raises so failures are not cached (or
+        stored). Info without a name (unknown symbol, empty upstream reply)
+        counts as a failure.
+        """
+        info = self._provider.meta(ticker)
+        name = info.get("longName") or info.get("shortName")
+        if not name:
+            raise ValueError(f"No metadata for {ticker}")
+        return {
+            "name"       : name,
+            "sector"     : info.get("sector", "N/A"),
+            "industry"   : info.get("industry", "N/A"),
+            "market_cap" : self._fmt_market_cap(info.get("marketCap")),
+            "pe_ratio"   : round(info.get("trailingPE", 0) or 0, 2),
+            "week_high"  : info.get("fiftyTwoWeekHigh", "N/A"),
+            "week_low"   : info.get("fiftyTwoWeekLow", "N/A"),
+            "currency"   : info.get("currency", "INR"),
+            "exchange"   : info.get("exchange", "NSE"),
+        }
+
+    def _load_meta_stored(self, ticker: str) -> dict:
+        """_load_meta, keeping the result in the MetaStore when attached."""
+        meta = self._load_meta(ticker)
+        if self._meta is not None:
+            try:
+                self._meta.put(ticker, meta)
+            except Exception as e:
+                logger.warning(f"MetaStore write failed for {ticker}: {e}")
+        return meta
+
+    def _stored_meta(self, ticker: str) -> dict | None:
+        """
+        MetaStore read. A group past its max age is still served, and
+        re-fetched in the background (once per ticker at a time), so meta
+        stays fresh even when no scheduler runs refresh_meta().
+        """
+        if self._meta is None:
+            return None
+        stored = self._meta.get(ticker)
+        if stored is not None:
+            groups = self._meta.stale_groups(ticker)
+            if groups:
+                with self._io_guard:
+                    if ticker in self._meta_refreshing:
+                        return stored
+                    self._meta_refreshing.add(ticker)
+                self._io_executor().submit(self._refresh_meta_groups, ticker, groups)
+        return stored
+
+    def _refresh_meta_groups(self, ticker: str, groups: tuple):
+        """Background body of _stored_meta's refresh."""
+        try:
+            self._meta.put(ticker, self._load_meta(ticker), groups)
+        except Exception as e:
+            logger.warning(f"Meta refresh failed for {ticker}: {e}")
+        finally:
+            with self._io_guard:
+                self._meta_refreshing.discard(ticker)
+
+    def _load_quote(self, ticker: str, hist: pd.DataFrame | None = None) -> dict | None:
+        """Uncached body of quick_quote."""
         try:
-            t    = yf.Ticker(ticker)
-            hist = t.history(period="1mo", auto_adjust=True)
+            if hist is None or hist.empty:
+                hist = self._provider.quote(ticker)
 
             if hist.empty or len(hist) < 2:
                 return None
@@ -122,59 +383,130 @@ class StockService:
             rng       = spark_max - spark_min if spark_max != spark_min else 1
             sparkline = closes.tail(15).tolist()
 
-            info = {}
-            try:
-                info = t.info
-            except Exception:
-                pass
+            meta = self.fetch_meta(ticker)
 
             return {
                 "ticker"    : ticker,
-                "name"      : info.get("longName") or info.get("shortName") or ticker,
+                "name"      : meta["name"],
                 "price"     : current,
                 "change_pct": chg_pct,
                 "direction" : "up" if chg_pct >= 0 else "down",
                 "volume"    : int(hist["Volume"].iloc[-1]) if "Volume" in hist else 0,
                 "sparkline" : sparkline,
-                "currency"  : info.get("currency", "INR"),
+                "currency"  : meta["currency"],
             }
 
         except Exception as e:
             logger.error(f"quick_quote failed for {ticker}: {e}")
             raise
 
-    def serialize_ohlcv(self, df: pd.DataFrame) -> dict:
+    def _cached(self, key: tuple, kind: str, loader):
+        """Route a load through the shared cache when one is attached."""
+        if self._cache is None:
+            return loader()
+        return self._cache.get_or_load(key, loader, self._ttl[kind])
+
+    def _fetch_history_stored(self, ticker: str, period: str) -> pd.DataFrame:
         """
-        Convert a DataFrame of OHLCV data to JSON-serialisable lists
-        for Chart.js consumption.
+        Serve history from the bar store, topping it up with a delta fetch.
 
-        Returns:
-            {
-                labels  : ["2024-01-01", ...],
-                open    : [...],
-                high    : [...],
-                low     : [...],
-                close   : [...],
-                volume  : [...],
-            }
+        The last stored bar is always re-requested because it may have been
+        written mid-session; BarStore.append replaces it with the final bar.
         """
-        def _safe_list(series):
-            return [
-                None if (v is None or (isinstance(v, float) and np.isnan(v)))
-                else round(float(v), 2)
-                for v in series
-            ]
+        start = self._period_start(period)
 
-        return {
-            "labels": [d.strftime("%Y-%m-%d") for d in df.index],
-            "open"  : _safe_list(df["Open"]),
-            "high"  : _safe_list(df["High"]),
-            "low"   : _safe_list(df["Low"]),
-            "close" : _safe_list(df["Close"]),
-            "volume": [int(v) if not np.isnan(v) else 0 for v in df["Volume"]],
-        }
+        try:
+            covered = self._bars.covered_from(ticker)
+            last    = self._bars.last_date(ticker)
+        except Exception as e:
+            logger.warning(f"BarStore lookup failed for {ticker}: {e}")
+            covered, last = None, None
 
-    # ─── Private helpers ─────────────────────────────────────────────────────
+        # ── Cold (or too short) store → full download for the window ─────
+        if covered is None or last is None or covered > start:
+            df = self._provider.history(ticker, period=period)
+            if not df.empty:
+                self._safe_store(self._bars.write, ticker, df, start)
+            return df
+
+        # ── Warm store → only ask for bars since the last stored date ────
+        delta = self._provider.history(ticker, start=last.strftime("%Y-%m-%d"))
+        if not delta.empty:
+            self._safe_store(self._bars.append, ticker, delta)
+
+        df = self._bars.read(ticker, start=start)
+        if df is None:
+            return self._provider.history(ticker, period=period)
+        return df
+
+    def _load_history_many(self, tickers: list, period: str) -> dict:
+        """Uncached body of fetch_history_many."""
+        logger.info(f"Fetching history (batch): {len(tickers)} tickers / {period}")
+        try:
+            if self._bars is not None and period in self.PERIOD_OFFSETS:
+                frames = self._fetch_history_many_stored(tickers, period)
+            else:
+                frames = self._provider.history_many(tickers, period=period)
+
+            logger.info(f"Fetched batch history for "
+                        f"{sum(not df.empty for df in frames.values())}/{len(tickers)} tickers")
+            return frames
+
+        except Exception as e:
+            logger.error(f"fetch_history_many failed for {tickers}: {e}")
+            raise
+
+    def _fetch_history_many_stored(self, tickers: list, period: str) -> dict:
+        """Batched counterpart of _fetch_history_stored."""
+        start = self._period_start(period)
+        cold, warm = [], {}
+
+        for t in tickers:
+            try:
+                covered = self._bars.covered_from(t)
+                last    = self._bars.last_date(t)
+            except Exception as e:
+                logger.warning(f"BarStore lookup failed for {t}: {e}")
+                covered, last = None, None
+
+            if covered is None or last is None or covered > start:
+                cold.append(t)
+            else:
+                warm[t] = last
+
+        frames = {}
+
+        # ── Cold tickers → one full-window batch download ────────────────
+        if cold:
+            for t, df in self._provider.history_many(cold, period=period).items():
+                if not df.empty:
+                    self._safe_store(self._bars.write, t, df, start)
+                frames[t] = df
+
+        # ── Warm tickers → one delta download from the oldest last bar ───
+        if warm:
+            since  = min(warm.values()).strftime("%Y-%m-%d")
+            deltas = self._provider.history_many(list(warm), start=since)
+            for t in warm:
+                delta = deltas.get(t)
+                if delta is not None and not delta.empty:
+                    self._safe_store(self._bars.append, t, delta)
+                df = self._bars.read(t, start=start)
+                frames[t] = df if df is not None else pd.DataFrame()
+
+        return frames
+
+    def _safe_store(self, op, *args):
+        """Run a BarStore write; a failing disk must never fail the request."""
+        try:
+            op(*args)
+        except Exception as e:
+            logger.warning(f"BarStore write failed for {args[0]}: {e}")
+
+    def _period_start(self, period: str) -> pd.Timestamp:
+        """First calendar date included in `period`, counted back from today."""
+        return pd.Timestamp.utcnow().tz_localize(None).normalize() \
+            - self.PERIOD_OFFSETS[period]
 
     @staticmethod
     def _fmt_market_cap(value) -> str:
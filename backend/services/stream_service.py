@@ -0,0 +1,280 @@
+"""
+==============================================================================
+services/stream_service.py
+==============================================================================
+Responsibility : Live quote / indicator updates for /api/stream (SSE).
+
+  ─ StreamHub  : one poll loop (thread) per subscribed ticker, shared by all
+                 of that ticker's subscribers. When the polled bar changes,
+                 the IncrementalIndicatorEngine applies it in O(1) and the
+                 resulting event is encoded once; every subscriber gets the
+                 same bytes. The loop starts with the first subscriber and
+                 stops shortly (`linger`) after the last one leaves.
+  ─ StockFeed  : bars from StockService (goes through its cache and bar
+                 store, so polling shares upstream calls with the REST API).
+  ─ ReplayFeed : steps through recorded frames one bar per poll, so the
+                 whole loop runs offline (tests, demos, load tests).
+
+A feed exposes two calls:
+    history(ticker) → DataFrame   bars to seed the engine with
+    recent(ticker)  → DataFrame   latest few bars (last row may be live)
+==============================================================================
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from services.incremental_indicators import IncrementalIndicatorEngine
+from utils.serializer import dump_json
+
+logger = logging.getLogger(__name__)
+
+
+# ─── Feeds ────────────────────────────────────────────────────────────────────
+
+class StockFeed:
+    """Polls through StockService (cached; see CACHE_TTL["history"])."""
+
+    def __init__(self, stock_svc, seed_period: str = "1y",
+                 recent_period: str = "1mo"):
+        self.stock_svc     = stock_svc
+        self.seed_period   = seed_period
+        self.recent_period = recent_period
+
+    def history(self, ticker: str) -> pd.DataFrame:
+        return self.stock_svc.fetch_history(ticker, self.seed_period)
+
+    def recent(self, ticker: str) -> pd.DataFrame:
+        return self.stock_svc.fetch_history(ticker, self.recent_period)
+
+
+class ReplayFeed:
+    """
+    Replays recorded frames: history() returns the first `warmup` bars and
+    each recent() call reveals one more bar, until the frame is exhausted.
+
+    Usage:
+        feed = ReplayFeed(lambda t: provider.history(t, "2y"), warmup=250)
+    """
+
+    def __init__(self, load, warmup: int = 250, window: int = 5):
+        self._load   = load
+        self.warmup  = warmup
+        self.window  = window
+        self._frames = {}
+        self._cursor = {}
+        self._lock   = threading.Lock()
+
+    def history(self, ticker: str) -> pd.DataFrame:
+        df = self._frame(ticker)
+        with self._lock:
+            self._cursor[ticker] = min(self.warmup, len(df))
+            return df.iloc[:self._cursor[ticker]]
+
+    def recent(self, ticker: str) -> pd.DataFrame:
+        df = self._frame(ticker)
+        with self._lock:
+            end = self._cursor[ticker] = min(self._cursor.get(ticker, self.warmup) + 1, len(df))
+        return df.iloc[max(end - self.window, 0):end]
+
+    def _frame(self, ticker: str) -> pd.DataFrame:
+        with self._lock:
+            if ticker not in self._frames:
+                self._frames[ticker] = self._load(ticker)
+            return self._frames[ticker]
+
+
+# ─── Hub ──────────────────────────────────────────────────────────────────────
+
+class _Channel:
+    """Poll loop + subscriber list of one ticker."""
+
+    def __init__(self, ticker: str):
+        self.ticker      = ticker
+        self.subscribers = ()            # replaced, never mutated: lock-free fan-out
+        self.idle_since  = None          # when the last subscriber left
+        self.last_event  = None          # encoded SSE frame of the latest update
+        self.last_bar    = None          # (date, (o, h, l, c, v)) last applied
+
+
+class StreamHub:
+    """
+    Fan-out of per-ticker updates to SSE subscribers.
+
+    Usage:
+        hub = StreamHub(StockFeed(stock_svc), poll_interval=5)
+        token = hub.subscribe(["TCS.NS"], queue.put_nowait)   # called with bytes
+        ...
+        hub.unsubscribe(token)
+
+    A ticker's loop outlives its last subscriber by `linger` seconds, so a
+    page reload reattaches to the warm loop instead of re-seeding.
+    """
+
+    def __init__(self, feed, engine: IncrementalIndicatorEngine | None = None,
+                 poll_interval: float = 5.0, closed_interval: float | None = None,
+                 linger: float = 30.0, market=None, clock=time.monotonic):
+        self.feed            = feed
+        self.engine          = engine or IncrementalIndicatorEngine()
+        self.poll_interval   = poll_interval
+        self.closed_interval = closed_interval or poll_interval
+        self.linger          = linger
+        self.market          = market
+        self._clock          = clock
+        self._channels       = {}
+        self._lock           = threading.Lock()
+        self._closed         = threading.Event()
+        self._seq            = 0
+
+    # ─── Public API ──────────────────────────────────────────────────────────
+
+    def subscribe(self, tickers: list, callback) -> tuple:
+        """
+        Deliver every update of `tickers` to `callback(frame: bytes)`.
+
+        The latest known update of each ticker is delivered immediately.
+        `callback` runs on the poll thread and must not block; an exception
+        it raises drops that one event for that subscriber.
+
+        Returns:
+            Token for unsubscribe().
+        """
+        token = (tuple(tickers), callback)
+        with self._lock:
+            for ticker in tickers:
+                channel = self._channels.get(ticker)
+                if channel is None:
+                    channel = self._channels[ticker] = _Channel(ticker)
+                    threading.Thread(target=self._loop, args=(channel,),
+                                     name=f"stream-{ticker}", daemon=True).start()
+                channel.subscribers = channel.subscribers + (callback,)
+                channel.idle_since  = None
+                if channel.last_event is not None:
+                    self._deliver(callback, channel.last_event)
+        return token
+
+    def unsubscribe(self, token: tuple):
+        tickers, callback = token
+        with self._lock:
+            for ticker in tickers:
+                channel = self._channels.get(ticker)
+                if channel is None:
+                    continue
+                channel.subscribers = tuple(s for s in channel.subscribers
+                                            if s is not callback)
+                if not channel.subscribers:
+                    channel.idle_since = self._clock()
+
+    def status(self) -> dict:
+        """Subscriber count per active ticker."""
+        with self._lock:
+            return {t: len(c.subscribers) for t, c in self._channels.items()}
+
+    def close(self):
+        """Stop every poll loop (process shutdown)."""
+        self._closed.set()
+
+    # ─── Poll loop ───────────────────────────────────────────────────────────
+
+    def _loop(self, channel: _Channel):
+        ticker = channel.ticker
+        try:
+            history = self.feed.history(ticker)
+            if history is not None and not history.empty:
+                self.engine.seed(ticker, history)
+                channel.last_bar = self._bar(history, -1)
+                self._publish(channel, history)
+        except Exception as e:
+            logger.error(f"Stream: seeding {ticker} failed: {e}")
+
+        while not self._closed.wait(self._interval(channel)):
+            with self._lock:
+                if channel.idle_since is not None:
+                    if self._clock() - channel.idle_since < self.linger:
+                        continue                     # no one to poll for
+                    # Removed and reset under the lock: a new subscriber
+                    # either found this channel or gets a fresh one
+                    del self._channels[ticker]
+                    self.engine.reset(ticker)
+                    return
+            try:
+                self._poll(channel)
+            except Exception as e:
+                logger.warning(f"Stream: poll for {ticker} failed: {e}")
+
+    def _poll(self, channel: _Channel):
+        """Apply bars newer than (or revising) the last one; publish on change."""
+        recent = self.feed.recent(channel.ticker)
+        if recent is None or recent.empty:
+            return
+
+        if channel.last_bar is None:                 # seeding found nothing
+            self.engine.seed(channel.ticker, recent)
+        else:
+            if self._bar(recent, -1) == channel.last_bar:
+                return
+            for i in range(len(recent)):
+                bar = self._bar(recent, i)
+                if bar[0] >= channel.last_bar[0] and bar != channel.last_bar:
+                    self.engine.update(channel.ticker, bar[0], recent.iloc[i])
+        channel.last_bar = self._bar(recent, -1)
+        self._publish(channel, recent)
+
+    def _publish(self, channel: _Channel, bars: pd.DataFrame):
+        close      = float(bars["Close"].iloc[-1])
+        prev_close = float(bars["Close"].iloc[-2]) if len(bars) > 1 else None
+        event = {
+            "ticker"    : channel.ticker,
+            "date"      : bars.index[-1].strftime("%Y-%m-%d"),
+            "price"     : round(close, 2),
+            "change_pct": (round((close - prev_close) / prev_close * 100, 2)
+                           if prev_close else None),
+            "indicators": self.engine.snapshot(channel.ticker),
+        }
+        with self._lock:
+            self._seq += 1
+            frame = sse_frame(event, "quote", self._seq)
+            channel.last_event = frame
+        for callback in channel.subscribers:
+            self._deliver(callback, frame)
+
+    # ─── Private helpers ─────────────────────────────────────────────────────
+
+    def _interval(self, channel: _Channel) -> float:
+        if channel.idle_since is not None:
+            return min(self.poll_interval, self.linger)
+        if self.market is None or self.market.is_open(datetime.now(timezone.utc)):
+            return self.poll_interval
+        return self.closed_interval
+
+    @staticmethod
+    def _bar(df: pd.DataFrame, i: int) -> tuple:
+        row = df.iloc[i]
+        return (pd.Timestamp(df.index[i]),
+                tuple(float(row[c]) for c in ("Open", "High", "Low", "Close", "Volume")))
+
+    @staticmethod
+    def _deliver(callback, frame: bytes):
+        try:
+            callback(frame)
+        except Exception:
+            pass     # slow / gone subscriber: it misses this event only
+
+
+def sse_frame(data: dict, event: str | None = None, event_id: int | None = None) -> bytes:
+    """Encode one Server-Sent Events message."""
+    head = b""
+    if event:
+        head += b"event: " + event.encode() + b"\n"
+    if event_id is not None:
+        head += b"id: " + str(event_id).encode() + b"\n"
+    return head + b"data: " + dump_json(data) + b"\n\n"
+
+
+# Comment line sent when idle, so proxies keep the connection open and a
+# closed client is noticed on the next write
+SSE_HEARTBEAT = b": keep-alive\n\n"
@@ -0,0 +1,43 @@
+"""
+Shared fixtures for the backend test suite.
+
+Run from backend/:
+    pip install -r requirements-dev.txt
+    python -m pytest -q
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.benchmark import _load_app, synthetic_ohlcv     # noqa: E402
+
+# Tickers the `app_module` fixture serves (synthetic bars, seeded by position)
+FIXTURE_TICKERS = ("AAA.NS", "BBB.NS", "CCC.NS", "DDD.NS")
+
+
+@pytest.fixture
+def ohlcv():
+    """~1 year of seeded synthetic daily bars (provider-shaped frame)."""
+    return synthetic_ohlcv(260, seed=7)
+
+
+@pytest.fixture(scope="session")
+def app_module():
+    """
+    app.py on the offline fixture provider (as scripts/benchmark.py loads
+    it), serving two years of synthetic bars for FIXTURE_TICKERS. CCC.NS
+    starts later and DDD.NS misses dates the others traded, so it is not
+    contiguous on their shared calendar.
+    """
+    frames = {t: synthetic_ohlcv(520, seed=seed) for seed, t in enumerate(FIXTURE_TICKERS)}
+    frames["CCC.NS"] = frames["CCC.NS"].iloc[220:]                      # listed later
+    frames["DDD.NS"] = frames["DDD.NS"].drop(frames["DDD.NS"].index[300::25])  # own holidays
+
+    module = _load_app()
+    for ticker, df in frames.items():
+        df.to_csv(os.path.join(module.config.FIXTURE_DIR, f"{ticker}.csv"))
+    return module
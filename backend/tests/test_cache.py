@@ -0,0 +1,132 @@
+import threading
+import time
+
+import pytest
+
+from services.cache import TTLCache
+
+
+def test_hit_after_load():
+    cache = TTLCache()
+    calls = []
+    assert cache.get_or_load("k", lambda: calls.append(1) or "v", ttl=60) == "v"
+    assert cache.get_or_load("k", lambda: calls.append(1) or "w", ttl=60) == "v"
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_expired_entry_reloads():
+    cache = TTLCache()
+    cache.set("k", "old", ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("k") is None
+    assert cache.get_or_load("k", lambda: "new", ttl=60) == "new"
+    assert cache.stats()["expirations"] == 1
+
+
+def test_concurrent_misses_share_one_load():
+    cache   = TTLCache()
+    calls   = []
+    release = threading.Event()
+
+    def loader():
+        calls.append(1)
+        release.wait(5)
+        return "v"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load("k", loader, 60)))
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    while cache.stats()["coalesced"] < 7:
+        time.sleep(0.001)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert calls == [1]
+    assert results == ["v"] * 8
+
+
+def test_loader_error_reaches_waiters_and_is_not_cached():
+    cache = TTLCache()
+
+    def failing():
+        raise RuntimeError("upstream down")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_load("k", failing, ttl=60)
+    assert cache.get_or_load("k", lambda: "v", ttl=60) == "v"
+    assert cache.stats()["load_errors"] == 1
+
+
+def test_evicts_least_recently_used_by_count():
+    cache = TTLCache(max_entries=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    cache.get("a")                       # b is now least recently used
+    cache.set("c", 3, ttl=60)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_evicts_by_bytes_and_skips_oversized_values():
+    cache = TTLCache(max_bytes=4096)
+    cache.set("a", "x" * 2000, ttl=60)
+    cache.set("b", "y" * 2000, ttl=60)
+    cache.set("c", "z" * 2000, ttl=60)
+    assert cache.stats()["bytes"] <= 4096
+    assert cache.get("a") is None
+
+    cache.set("huge", "h" * 10_000, ttl=60)
+    assert cache.get("huge") is None
+
+
+def test_batched_load_coalesces_with_single_loads():
+    cache   = TTLCache()
+    batches = []
+    release = threading.Event()
+
+    def load_many(keys):
+        batches.append(keys)
+        release.wait(5)
+        return {k: k.upper() for k in keys}
+
+    cache.set("a", "cached", ttl=60)
+    results = {}
+    batch   = threading.Thread(target=lambda: results.update(
+        first=cache.get_or_load_many(["a", "b", "c"], load_many, 60)))
+    batch.start()
+    while "b" not in cache._inflight:
+        time.sleep(0.001)
+
+    single = threading.Thread(target=lambda: results.update(
+        single=cache.get_or_load("b", lambda: "reloaded", 60)))
+    second = threading.Thread(target=lambda: results.update(
+        second=cache.get_or_load_many(["c", "d"], load_many, 60)))
+    single.start()
+    second.start()
+    while cache.stats()["coalesced"] < 2:
+        time.sleep(0.001)
+    release.set()
+    for t in (batch, single, second):
+        t.join()
+
+    assert sorted(batches) == [["b", "c"], ["d"]]
+    assert results["first"] == {"a": "cached", "b": "B", "c": "C"}
+    assert results["single"] == "B"
+    assert results["second"] == {"c": "C", "d": "D"}
+
+
+def test_batched_load_error_reaches_waiters_and_is_not_cached():
+    cache = TTLCache()
+
+    def failing(keys):
+        raise RuntimeError("upstream down")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_load_many(["a", "b"], failing, ttl=60)
+    assert cache.get_or_load_many(["a", "b"], lambda keys: {k: 1 for k in keys}, 60) \
+        == {"a": 1, "b": 1}
+    assert cache.stats()["load_errors"] == 1
@@ -0,0 +1,79 @@
+import logging
+import time
+
+import pandas as pd
+import pytest
+
+from services.cache import TTLCache
+from services.cache_snapshot import SNAPSHOT_FORMAT, CacheSnapshot
+from utils.serializer import pack_msgpack, pack_value
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "warm-start.msgpack")
+
+
+def test_round_trip_skips_expired_and_unencodable_entries(path, ohlcv):
+    cache = TTLCache()
+    cache.set(("history", "T", "1y"), ohlcv, ttl=60)
+    cache.set(("meta", "T"), {"name": "Tee", "pe_ratio": 12.5}, ttl=60)
+    cache.set(("quote", "T"), {"price": 1.0}, ttl=0.05)
+    cache.set(("other",), object(), ttl=60)
+
+    snapshot = CacheSnapshot(path)
+    assert snapshot.save(cache, {"snapshots": {"top": {"stocks": []}}}) == 3
+    time.sleep(0.1)
+
+    restored = TTLCache()
+    assert snapshot.load(restored) == {"snapshots": {"top": {"stocks": []}}}
+    pd.testing.assert_frame_equal(restored.get(("history", "T", "1y")), ohlcv,
+                                  check_freq=False)
+    assert restored.get(("meta", "T")) == {"name": "Tee", "pe_ratio": 12.5}
+    assert restored.get(("quote", "T")) is None
+    assert restored.stats()["entries"] == 2
+
+
+@pytest.mark.parametrize("damage", ["missing", "empty", "garbage", "truncated", "format"])
+def test_unusable_file_loads_nothing(path, damage):
+    cache = TTLCache()
+    cache.set("k", "v", ttl=60)
+    CacheSnapshot(path).save(cache)
+    with open(path, "rb") as fh:
+        data = fh.read()
+
+    if damage == "missing":
+        assert CacheSnapshot(path + ".absent").load(TTLCache()) == {}
+        return
+    damaged = {
+        "empty"    : b"",
+        "garbage"  : b"\xc1not msgpack",
+        "truncated": data[:len(data) // 2],
+        "format"   : pack_msgpack({"format": SNAPSHOT_FORMAT + 1, "entries": []}),
+    }[damage]
+    with open(path, "wb") as fh:
+        fh.write(damaged)
+
+    restored = TTLCache()
+    assert CacheSnapshot(path).load(restored) == {}
+    assert restored.stats()["entries"] == 0
+
+
+def test_undecodable_entry_is_skipped(path, caplog):
+    expires = time.time() + 60
+    with open(path, "wb") as fh:
+        fh.write(pack_msgpack({
+            "format"  : SNAPSHOT_FORMAT,
+            "saved_at": time.time(),
+            "entries" : [[["good"], expires, pack_value({"a": 1})],
+                         [["bad"], expires, b"F\x00not a frame"],
+                         ["not", "an entry"]],
+            "state"   : {"snapshots": {}},
+        }))
+
+    restored = TTLCache()
+    with caplog.at_level(logging.INFO, logger="services.cache_snapshot"):
+        assert CacheSnapshot(path).load(restored) == {"snapshots": {}}
+    assert restored.get(("good",)) == {"a": 1}
+    assert restored.get(("bad",)) is None
+    assert "restored 1/3 entries (2 undecodable)" in caplog.text
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from utils.downsample import lttb_indices
+
+
+def reference_lttb(y, n_out):
+    """Textbook LTTB (one bucket at a time), for finite y."""
+    n, every = len(y), (len(y) - 2) / (n_out - 2)
+    out, a = [0], 0
+    for b in range(n_out - 2):
+        lo, hi = int(b * every) + 1, int((b + 1) * every) + 1
+        nlo, nhi = hi, min(int((b + 2) * every) + 1, n)
+        if b == n_out - 3:
+            nlo, nhi = n - 1, n
+        cx, cy = (nlo + nhi - 1) / 2.0, float(np.mean(y[nlo:nhi]))
+        areas = [abs((a - cx) * (y[i] - y[a]) - (a - i) * (cy - y[a])) for i in range(lo, hi)]
+        a = lo + int(np.argmax(areas))
+        out.append(a)
+    return out + [n - 1]
+
+
+@pytest.mark.parametrize("n, n_out", [(1000, 100), (260, 3), (261, 50), (97, 96)])
+def test_matches_reference_and_keeps_endpoints(n, n_out):
+    y   = np.random.default_rng(n).normal(size=n).cumsum()
+    idx = lttb_indices(y, n_out)
+    assert len(idx) == n_out
+    assert idx[0] == 0 and idx[-1] == n - 1
+    assert np.all(np.diff(idx) > 0)
+    assert idx.tolist() == reference_lttb(y, n_out)
+
+
+def test_short_series_is_returned_whole():
+    assert lttb_indices([1.0, 2.0, 3.0], 3).tolist() == [0, 1, 2]
+    assert lttb_indices(np.arange(10.0), 400).tolist() == list(range(10))
+
+
+def test_spikes_survive():
+    y = np.zeros(1000)
+    y[[123, 456, 789]] = [50.0, -50.0, 80.0]
+    assert {123, 456, 789} <= set(lttb_indices(y, 20).tolist())
+
+
+def test_nan_is_never_chosen_over_a_finite_point():
+    y = np.random.default_rng(1).normal(size=500).cumsum()
+    y[100:300:2] = np.nan
+    idx = lttb_indices(y, 50)
+    assert len(idx) == 50
+    assert np.isfinite(y[idx[1:-1]]).all()
+
+
+def test_rejects_fewer_than_three_points():
+    with pytest.raises(ValueError):
+        lttb_indices(np.arange(10.0), 2)
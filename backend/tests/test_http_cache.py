@@ -0,0 +1,43 @@
+from datetime import datetime, timedelta, timezone
+
+from utils.http_cache import cache_headers, http_date, is_not_modified, make_etag
+
+MODIFIED = datetime(2024, 10, 15, 10, 0, 0, 250_000, tzinfo=timezone.utc)
+
+
+def test_etag_is_weak_and_depends_on_its_parts():
+    etag = make_etag("TCS.NS", "3mo", "2024-10-15")
+    assert etag.startswith('W/"')
+    assert etag == make_etag("TCS.NS", "3mo", "2024-10-15")
+    assert etag != make_etag("TCS.NS", "6mo", "2024-10-15")
+
+
+def test_if_none_match_uses_weak_comparison():
+    etag   = make_etag("a")
+    strong = etag[2:]
+    assert is_not_modified({"If-None-Match": etag}, etag, MODIFIED)
+    assert is_not_modified({"If-None-Match": strong}, etag, MODIFIED)
+    assert is_not_modified({"If-None-Match": f'"other", {etag}'}, etag, MODIFIED)
+    assert is_not_modified({"If-None-Match": "*"}, etag, MODIFIED)
+    assert not is_not_modified({"If-None-Match": make_etag("b")}, etag, MODIFIED)
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since():
+    headers = {"If-None-Match": make_etag("b"),
+               "If-Modified-Since": http_date(MODIFIED + timedelta(days=1))}
+    assert not is_not_modified(headers, make_etag("a"), MODIFIED)
+
+
+def test_if_modified_since_compares_whole_seconds():
+    etag = make_etag("a")
+    assert is_not_modified({"If-Modified-Since": http_date(MODIFIED)}, etag, MODIFIED)
+    assert not is_not_modified({"If-Modified-Since": http_date(MODIFIED - timedelta(seconds=1))},
+                               etag, MODIFIED)
+    assert not is_not_modified({"If-Modified-Since": "not a date"}, etag, MODIFIED)
+    assert not is_not_modified({}, etag, MODIFIED)
+
+
+def test_cache_headers():
+    headers = cache_headers('W/"x"', MODIFIED, max_age=-5)
+    assert headers["Last-Modified"] == "Tue, 15 Oct 2024 10:00:00 GMT"
+    assert headers["Cache-Control"] == "public, max-age=0"
@@ -0,0 +1,59 @@
+import pytest
+
+from services.incremental_indicators import IncrementalIndicatorEngine
+from services.indicator_service import IndicatorService
+
+
+def _batch(df) -> dict:
+    out = IndicatorService().compute_all(df)
+    out.pop("series")
+    return out
+
+
+def _assert_matches(incremental: dict, batch: dict):
+    assert incremental.keys() == batch.keys()
+    for field, expected in batch.items():
+        if expected is None:
+            assert incremental[field] is None, field
+        else:
+            # compute_all rounds some fields to 2 decimals, the engine to 4
+            assert incremental[field] == pytest.approx(expected, rel=1e-6, abs=0.01), field
+
+
+def test_seed_matches_compute_all(ohlcv):
+    engine = IncrementalIndicatorEngine()
+    _assert_matches(engine.seed("T", ohlcv), _batch(ohlcv))
+
+
+def test_appended_bars_match_compute_all(ohlcv):
+    engine = IncrementalIndicatorEngine()
+    engine.seed("T", ohlcv.iloc[:200])
+    for date, bar in ohlcv.iloc[200:].iterrows():
+        scalars = engine.update("T", date, bar)
+    _assert_matches(scalars, _batch(ohlcv))
+
+
+def test_revised_last_bar_replaces_it(ohlcv):
+    engine = IncrementalIndicatorEngine()
+    engine.seed("T", ohlcv.iloc[:-1])
+    date = ohlcv.index[-1]
+
+    provisional = ohlcv.iloc[-1].copy()
+    provisional["Close"] *= 1.05
+    engine.update("T", date, provisional)              # intraday print
+    scalars = engine.update("T", date, ohlcv.iloc[-1])  # final bar, same date
+    _assert_matches(scalars, _batch(ohlcv))
+
+
+def test_short_history_leaves_windows_empty(ohlcv):
+    engine  = IncrementalIndicatorEngine()
+    scalars = engine.seed("T", ohlcv.iloc[:10])
+    _assert_matches(scalars, _batch(ohlcv.iloc[:10]))
+    assert scalars["sma20"] is None and scalars["sma50"] is None
+
+
+def test_older_bar_and_unknown_ticker_are_ignored(ohlcv):
+    engine = IncrementalIndicatorEngine()
+    engine.seed("T", ohlcv)
+    assert engine.update("T", ohlcv.index[0], ohlcv.iloc[0]) is None
+    assert engine.update("OTHER", ohlcv.index[-1], ohlcv.iloc[-1]) is None
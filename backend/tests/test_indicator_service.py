@@ -0,0 +1,56 @@
+import math
+
+import pytest
+
+from scripts.benchmark import synthetic_ohlcv
+from services.indicator_service import IndicatorService
+
+
+@pytest.fixture(scope="module")
+def universe():
+    frames = {f"T{i}.NS": synthetic_ohlcv(300, seed=100 + i, start_price=50.0 * (i + 1))
+              for i in range(6)}
+    frames["T4.NS"] = frames["T4.NS"].iloc[150:]         # listed later
+    frames["T5.NS"] = frames["T5.NS"].iloc[-20:]         # too short for most windows
+    return frames
+
+
+def _same(a, b) -> bool:
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(_same(a[k], b[k]) for k in a)
+    if isinstance(a, list):
+        return len(a) == len(b) and all(_same(x, y) for x, y in zip(a, b))
+    if isinstance(a, float) and math.isnan(a):
+        return isinstance(b, float) and math.isnan(b)
+    return a == b
+
+
+def test_compute_universe_matches_compute_all(universe):
+    svc = IndicatorService()
+    _, tickers, close, high, low, volume = svc.align_frames(universe)
+    assert svc.contiguous_columns(close).all()
+
+    results = svc.compute_universe(close, high, low, volume, tickers)
+    assert list(results) == list(universe)
+    for ticker, df in universe.items():
+        expected = svc.compute_all(df)
+        assert _same(results[ticker], expected), ticker
+
+
+def test_obv_trend_matches_the_indicator_graph(universe):
+    svc = IndicatorService()
+    _, tickers, close, high, low, volume = svc.align_frames(universe)
+    results = svc.compute_universe(close, high, low, volume, tickers,
+                                   include_series=False, include_obv_trend=True)
+    for ticker, df in universe.items():
+        assert results[ticker]["obv_trend"] == pytest.approx(
+            svc.evaluate(df).value("obv_trend"), rel=1e-12), ticker
+        assert "series" not in results[ticker]
+
+
+def test_holes_are_not_contiguous(universe):
+    frames = dict(universe)
+    frames["T0.NS"] = frames["T0.NS"].drop(frames["T0.NS"].index[200])
+    _, tickers, close, *_ = IndicatorService.align_frames(frames)
+    assert tickers[0] == "T0.NS"
+    assert IndicatorService.contiguous_columns(close).tolist() == [False] + [True] * 5
@@ -0,0 +1,57 @@
+import json
+import os
+import threading
+
+from services.market_data import FixtureProvider, RecordingProvider
+
+
+def _recorder(tmp_path, ohlcv, tickers=("AAA.NS",)):
+    src = tmp_path / "src"
+    src.mkdir()
+    for t in tickers:
+        ohlcv.to_csv(src / f"{t}.csv", index_label="Date")
+    return RecordingProvider(FixtureProvider(str(src)), str(tmp_path / "rec"))
+
+
+def _latency(recorder):
+    with open(os.path.join(recorder.root, "latency.json"), encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def test_latency_is_buffered_until_flush(tmp_path, ohlcv):
+    recorder = _recorder(tmp_path, ohlcv)
+    recorder.history("AAA.NS", period="1mo")
+    recorder.history_many(["AAA.NS"], period="1mo")
+    assert not os.path.exists(os.path.join(recorder.root, "latency.json"))
+    assert os.path.exists(os.path.join(recorder.root, "AAA.NS.csv"))
+
+    recorder.close()
+    assert len(_latency(recorder)["history"]) == 2
+
+
+def test_flushes_periodically_and_keeps_earlier_samples(tmp_path, ohlcv):
+    recorder = _recorder(tmp_path, ohlcv)
+    recorder.history("AAA.NS", period="1mo")
+    recorder.close()
+
+    again = RecordingProvider(recorder.inner, recorder.root)
+    again.FLUSH_INTERVAL_S = 0
+    again.history("AAA.NS", period="1mo")
+    assert len(_latency(again)["history"]) == 2
+
+
+def test_concurrent_calls_lose_no_samples(tmp_path, ohlcv):
+    recorder = _recorder(tmp_path, ohlcv)
+    recorder.FLUSH_INTERVAL_S = 0.001
+
+    def work():
+        for _ in range(25):
+            recorder.history("AAA.NS", period="1mo")
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    recorder.close()
+    assert len(_latency(recorder)["history"]) == 200
@@ -0,0 +1,88 @@
+import re
+
+from utils.metrics import REGISTRY, Registry, StageTimer
+
+
+def _samples(text: str) -> dict:
+    return dict(line.rsplit(" ", 1) for line in text.splitlines()
+                if line and not line.startswith("#"))
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = Registry()
+    hist = registry.histogram("lat_seconds", "Latency.", ("route",), buckets=(5, 1, 10))
+    for v in (0.5, 1, 3, 10, 20):              # a bound is inclusive (le)
+        hist.observe(v, route="a")
+    hist.observe(2, route="b")
+
+    text = registry.render()
+    assert text.startswith("# HELP lat_seconds Latency.\n# TYPE lat_seconds histogram\n")
+    samples = _samples(text)
+    assert [samples[f'lat_seconds_bucket{{route="a",le="{le}"}}'] for le in ("1", "5", "10", "+Inf")] \
+        == ["2", "3", "4", "5"]
+    assert samples['lat_seconds_count{route="a"}'] == "5"
+    assert samples['lat_seconds_sum{route="a"}'] == "34.5"
+    assert samples['lat_seconds_bucket{route="b",le="1"}'] == "0"
+    assert samples['lat_seconds_bucket{route="b",le="+Inf"}'] == "1"
+    assert samples['lat_seconds_sum{route="b"}'] == "2"
+
+
+def test_counter_labels_are_escaped_and_metrics_registered_once():
+    registry = Registry()
+    calls = registry.counter("calls_total", "Calls.", ("path",))
+    assert registry.counter("calls_total", "Calls.", ("path",)) is calls
+
+    calls.inc(path='C:\\tmp\n"x"')
+    calls.inc(2, path='C:\\tmp\n"x"')
+    calls.inc()
+    assert _samples(registry.render()) == {
+        'calls_total{path=""}'                : "1",
+        'calls_total{path="C:\\\\tmp\\n\\"x\\""}': "3",
+    }
+
+
+def test_collector_output():
+    registry = Registry()
+
+    @registry.collector
+    def _collect():
+        return [("queue_depth", "gauge", "Queued jobs.", {(("queue", 'a"b'),): 3, (("queue", "c"),): 0.25}),
+                ("uptime_seconds", "counter", "Uptime.", {(): 12.0})]
+
+    assert registry.render().splitlines() == [
+        "# HELP queue_depth Queued jobs.",
+        "# TYPE queue_depth gauge",
+        'queue_depth{queue="a\\"b"} 3',
+        'queue_depth{queue="c"} 0.25',
+        "# HELP uptime_seconds Uptime.",
+        "# TYPE uptime_seconds counter",
+        "uptime_seconds 12",
+    ]
+
+
+def test_stage_timer_header_and_histogram():
+    count  = 'app_stage_duration_seconds_count{endpoint="test_metrics",stage="work"}'
+    before = int(_samples(REGISTRY.render()).get(count, 0))
+
+    timer = StageTimer("test_metrics")
+    with timer.stage("work"):
+        pass
+    timer.record("slow", 0.01234)
+    assert re.fullmatch(r"work;dur=\d+\.\d, slow;dur=12\.3", timer.header())
+    assert int(_samples(REGISTRY.render())[count]) == before + 1
+
+
+def test_server_timing_on_predict(app_module):
+    client   = app_module.app.test_client()
+    response = client.get("/api/predict?ticker=BBB.NS&period=6mo")
+    assert response.status_code == 200
+
+    entries = response.headers["Server-Timing"].split(", ")
+    assert all(re.fullmatch(r"\w+;dur=\d+\.\d", e) for e in entries), entries
+    stages = [e.split(";")[0] for e in entries]
+    assert stages[-1] == "total"
+    assert {"fetch_history", "compute_all", "predict"} <= set(stages)
+
+    metrics = client.get("/metrics").get_data(as_text=True)
+    assert 'app_stage_duration_seconds_count{endpoint="predict",stage="compute_all"}' in metrics
+    assert "# TYPE stock_cache_hits_total counter" in metrics
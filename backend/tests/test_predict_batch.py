@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from conftest import FIXTURE_TICKERS
+
+URL = "/api/predict/batch"
+
+
+@pytest.fixture
+def client(app_module):
+    return app_module.app.test_client()
+
+
+@pytest.mark.parametrize("body, message", [
+    (None, "must be a JSON object"),
+    (["AAA.NS"], "must be a JSON object"),
+    ({}, ""),
+    ({"tickers": "AAA.NS"}, ""),
+    ({"tickers": []}, ""),
+    ({"tickers": ["AAA.NS", 7]}, ""),
+    ({"tickers": [None]}, ""),
+    ({"tickers": [f"T{i}.NS" for i in range(60)]}, "Too many tickers"),
+    ({"tickers": ["AAA.NS"], "period": "7y"}, ""),
+    ({"tickers": ["AAA.NS"], "indicators": "rsi14,foo"}, "Unknown indicator"),
+    ({"tickers": ["AAA.NS"], "indicators": {"rsi14": 1}}, "comma-separated string or a list"),
+    ({"tickers": ["AAA.NS"], "exclude": ["chart", "prices"]}, "Invalid 'exclude'"),
+])
+def test_invalid_requests_are_400(client, body, message):
+    response = client.post(URL, json=body) if body is not None else \
+        client.post(URL, data="not json", content_type="application/json")
+    assert response.status_code == 400
+    assert response.get_json()["status"] == "error"
+    assert message in response.get_json()["message"]
+
+
+def test_exclude_drops_fields(client):
+    full = client.post(URL, json={"tickers": ["AAA.NS"]}).get_json()["data"]["predictions"][0]
+    assert {"meta", "indicators", "chart", "signals"} <= full.keys()
+
+    for exclude in (["chart", "signals"], "chart", ["meta", "indicators", "chart", "signals"]):
+        row = client.post(URL, json={"tickers": ["AAA.NS"], "exclude": exclude}) \
+                    .get_json()["data"]["predictions"][0]
+        dropped = {exclude} if isinstance(exclude, str) else set(exclude)
+        assert not dropped & row.keys()
+        assert row.keys() == full.keys() - dropped
+
+
+def test_batch_equals_single_predictions(client, app_module):
+    # AAA/BBB/CCC share a calendar (one compute_universe pass); DDD has
+    # holes in it and goes through the per-ticker graph
+    _, _, close, *_ = app_module.indicator_svc.align_frames(
+        app_module.stock_svc.fetch_history_many(list(FIXTURE_TICKERS), "1y"))
+    assert app_module.indicator_svc.contiguous_columns(close).tolist() == [True, True, True, False]
+
+    body  = {"tickers": ["ddd.ns", *FIXTURE_TICKERS, "AAA.NS"], "period": "1y",
+             "indicators": ["rsi14", "macd"]}
+    batch = client.post(URL, json=body).get_json()["data"]
+    assert batch["errors"] == {}
+    assert [p["ticker"] for p in batch["predictions"]] == ["DDD.NS", "AAA.NS", "BBB.NS", "CCC.NS"]
+
+    for row in batch["predictions"]:
+        single = client.get(f"/api/predict?ticker={row['ticker']}&period=1y"
+                            "&indicators=rsi14,macd").get_json()["data"]
+        assert row == {k: single[k] for k in row}, row["ticker"]
+
+
+def test_per_ticker_errors(client, app_module, monkeypatch):
+    real_predict = app_module.prediction_svc.predict
+
+    def predict(df, *args, **kwargs):
+        if np.isclose(df["Close"].iloc[-1], float(
+                app_module.stock_svc.fetch_history("DDD.NS", "3mo")["Close"].iloc[-1])):
+            raise RuntimeError("boom")
+        return real_predict(df, *args, **kwargs)
+
+    monkeypatch.setattr(app_module.prediction_svc, "predict", predict)
+    data = client.post(URL, json={"tickers": ["AAA.NS", "DDD.NS", "ZZZ.NS"]}).get_json()["data"]
+
+    assert [p["ticker"] for p in data["predictions"]] == ["AAA.NS"]
+    assert data["errors"] == {
+        "DDD.NS": "Prediction failed for this ticker.",
+        "ZZZ.NS": "No data found for ticker 'ZZZ.NS'. Ensure suffix (.NS/.BO) is correct.",
+    }
@@ -0,0 +1,95 @@
+import json
+
+import numpy as np
+import pytest
+
+from scripts.benchmark import synthetic_ohlcv
+from services.indicator_service import IndicatorService
+from services.prediction_service import PredictionService
+
+indicator_svc  = IndicatorService()
+prediction_svc = PredictionService()
+
+
+@pytest.fixture
+def universe():
+    # Mixed lengths: the 40-bar frame leaves SMA-50 undefined (NaN in the batch)
+    return [synthetic_ohlcv(n, seed=seed, start_price=100 + 37 * seed)
+            for seed, n in enumerate([260, 260, 120, 60, 40], start=1)]
+
+
+def _inputs(df):
+    graph = indicator_svc.evaluate(df)
+    return (graph.to_dict(prediction_svc.REQUIRED_INDICATORS, series=False),
+            graph.value("obv_trend"))
+
+
+def test_predict_many_is_identical_to_predict(universe):
+    inputs  = [_inputs(df) for df in universe]
+    singles = [prediction_svc.predict(df, ind, obv_trend=obv)
+               for df, (ind, obv) in zip(universe, inputs)]
+
+    batch = prediction_svc.predict_many(
+        np.array([df["Close"].iloc[-1] for df in universe]),
+        prediction_svc.stack_indicators([ind for ind, _ in inputs]),
+        np.array([obv for _, obv in inputs]),
+        details=True,
+    )
+
+    for i, single in enumerate(singles):
+        assert batch["predicted_price"][i] == single["predicted_price"]
+        assert batch["trend"][i] == single["trend"]
+        assert batch["confidence"][i] == single["confidence"]
+        assert batch["change_pct"][i] == single["change_pct"]
+        assert batch["signals"][i] == single["signals"]
+
+
+
+# ─── Tuned parameters ─────────────────────────────────────────────────────────
+
+def params(version: int, **overrides) -> dict:
+    return {"version": version, "weights": dict(PredictionService.WEIGHTS),
+            "trend_threshold": 0.2, "move_scale": 1.5, **overrides}
+
+
+def write(path, data):
+    path.write_text(json.dumps(data) if isinstance(data, dict) else data)
+    return str(path)
+
+
+def test_load_params_picks_the_highest_version(tmp_path):
+    write(tmp_path / "predictor-v2.json", params(2))
+    write(tmp_path / "predictor-v10.json", params(10))      # numeric, not lexical
+    write(tmp_path / "predictor-v9.json.bak", params(99))
+    write(tmp_path / "predictor-latest.json", params(98))
+    assert PredictionService.load_params(str(tmp_path))["version"] == 10
+
+    svc = PredictionService(PredictionService.load_params(str(tmp_path / "predictor-v2.json")))
+    assert svc.params_version == 2
+    assert svc.TREND_THRESHOLD == 0.2 and svc.MOVE_SCALE == 1.5
+    assert PredictionService.TREND_THRESHOLD == 0.12          # class defaults untouched
+
+
+def test_load_params_without_files_uses_defaults(tmp_path):
+    assert PredictionService.load_params(None) is None
+    assert PredictionService.load_params(str(tmp_path)) is None
+    assert PredictionService.load_params(str(tmp_path / "not-created-yet")) is None
+    assert PredictionService(None).params_version is None
+
+
+@pytest.mark.parametrize("data", [
+    "{not json",
+    params(1, weights={"sma_cross": 1.0}),
+    params(1, weights={**PredictionService.WEIGHTS, "sma_cross": -0.1}),
+    params(1, weights={k: 0.5 for k in PredictionService.WEIGHTS}),
+    params(1, trend_threshold=0),
+    params(1, move_scale="1.2"),
+])
+def test_load_params_rejects_invalid_files(tmp_path, data):
+    with pytest.raises(ValueError):
+        PredictionService.load_params(write(tmp_path / "predictor-v1.json", data))
+
+
+def test_load_params_missing_file_is_an_error(tmp_path):
+    with pytest.raises(ValueError):
+        PredictionService.load_params(str(tmp_path / "predictor-v3.json"))
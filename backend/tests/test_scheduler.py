@@ -0,0 +1,70 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from services.scheduler import HostLock, MarketHours, RefreshScheduler, _Job
+
+IST = ZoneInfo("Asia/Kolkata")
+
+
+def ist(*args) -> datetime:
+    return datetime(*args, tzinfo=IST)
+
+
+@pytest.fixture
+def scheduler():
+    # 2024-10-16 (a Wednesday) is a holiday
+    return RefreshScheduler(MarketHours(holidays=["2024-10-16"]), workers=1)
+
+
+def job(interval=60, closed_interval=None, last_run=None) -> _Job:
+    j = _Job("test", lambda: None, interval, closed_interval)
+    j.last_run = last_run
+    return j
+
+
+def test_open_runs_align_to_the_session_open(scheduler):
+    # 09:15 + k·60s: 10:00:30 → 10:01:00
+    assert scheduler.next_run_time(job(), ist(2024, 10, 15, 10, 0, 30)) == ist(2024, 10, 15, 10, 1)
+    assert scheduler.next_run_time(job(300), ist(2024, 10, 15, 9, 16)) == ist(2024, 10, 15, 9, 20)
+
+
+def test_last_tick_of_the_session_becomes_the_closing_run(scheduler):
+    assert scheduler.next_run_time(job(), ist(2024, 10, 15, 15, 29, 30)) \
+        == ist(2024, 10, 15, 15, 32)                    # close + CLOSE_GRACE
+
+
+def test_closed_market_runs_once_after_the_close(scheduler):
+    now = ist(2024, 10, 15, 18, 0)
+    assert scheduler.next_run_time(job(last_run=ist(2024, 10, 15, 15, 0)), now) == now
+
+
+def test_after_the_closing_run_waits_for_the_next_open(scheduler):
+    done = job(last_run=ist(2024, 10, 15, 15, 32))
+    # Wednesday is a holiday → Thursday's open
+    assert scheduler.next_run_time(done, ist(2024, 10, 15, 18, 0)) == ist(2024, 10, 17, 9, 15)
+
+
+def test_weekend_skips_to_monday(scheduler):
+    done = job(last_run=ist(2024, 10, 18, 15, 32))      # Friday's closing run
+    assert scheduler.next_run_time(done, ist(2024, 10, 19, 12, 0)) == ist(2024, 10, 21, 9, 15)
+
+
+def test_closed_interval_repeats_while_closed(scheduler):
+    done = job(closed_interval=600, last_run=ist(2024, 10, 15, 16, 0))
+    assert scheduler.next_run_time(done, ist(2024, 10, 15, 16, 5)) == ist(2024, 10, 15, 16, 10)
+
+
+def test_market_hours_calendar():
+    market = MarketHours(holidays=["2024-10-16"])
+    assert market.is_open(ist(2024, 10, 15, 9, 15))
+    assert not market.is_open(ist(2024, 10, 15, 15, 30))
+    assert not market.is_open(ist(2024, 10, 16, 11, 0))
+    assert market.last_close(ist(2024, 10, 17, 9, 0)) == ist(2024, 10, 15, 15, 30)
+
+
+def test_host_lock_elects_one_holder(tmp_path):
+    path = str(tmp_path / "scheduler.lock")
+    assert HostLock(path).acquire()
+    assert not HostLock(path).acquire()        # another open of the same file
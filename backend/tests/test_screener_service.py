@@ -0,0 +1,86 @@
+import math
+
+import numpy as np
+import pytest
+
+from services.screener_service import ScreenerIndex, parse_filters
+
+NAN = math.nan
+
+
+@pytest.fixture
+def index():
+    #            A      B     C     D    E
+    values = {
+        "rsi14": [25.0, 45.0, 70.0, NAN, 45.0],
+        "sma20": [10.0, 20.0, 30.0, 40.0, NAN],
+        "sma50": [10.0, 25.0, NAN, 35.0, 50.0],
+        "price": [11.0, 19.0, 31.0, 41.0, 49.0],
+    }
+    n       = len(values["rsi14"])
+    columns = {f: np.full(n, NAN) for f in ScreenerIndex.NUMERIC_FIELDS}
+    columns.update({f: np.array(v) for f, v in values.items()})
+    trend   = np.array(["BULLISH", "BEARISH", "BULLISH", "NEUTRAL", "BEARISH"])
+    return ScreenerIndex(["A", "B", "C", "D", "E"], columns, {"trend": trend},
+                         generated_at="2024-01-01T00:00:00+00:00")
+
+
+def tickers(result: dict) -> list:
+    return [row["ticker"] for row in result["results"]]
+
+
+# ─── parse_filters ────────────────────────────────────────────────────────────
+
+def test_parse_filters():
+    assert parse_filters(" RSI14 < 30 , price>=sma50,trend=bullish,") == [
+        ("rsi14", "<", 30.0), ("price", ">=", "sma50"), ("trend", "=", "BULLISH")]
+    assert parse_filters("") == []
+
+
+@pytest.mark.parametrize("expr, message", [
+    ("rsi14", "Invalid filter"),
+    ("rsi14<<30", "Invalid value"),
+    ("foo<3", "Unknown screener field"),
+    ("trend>BULLISH", "only supports = and !="),
+    ("rsi14<abc", "Invalid value"),
+    ("rsi14<nan", "Invalid value"),
+    ("rsi14>-inf", "Invalid value"),
+])
+def test_parse_filters_rejects(expr, message):
+    with pytest.raises(ValueError, match=message):
+        parse_filters(expr)
+
+
+# ─── ScreenerIndex.query ──────────────────────────────────────────────────────
+
+@pytest.mark.parametrize("expr, expected", [
+    ("rsi14<30", ["A"]),
+    ("rsi14<=45", ["A", "B", "E"]),
+    ("rsi14>45", ["C"]),
+    ("rsi14=45", ["B", "E"]),
+    ("rsi14!=45", ["A", "C"]),               # D (no RSI) matches no condition
+    ("sma20<sma50", ["B"]),
+    ("sma20=sma50", ["A"]),
+    ("sma20!=sma50", ["B", "D"]),            # C and E lack one side
+    ("price>sma20,rsi14<50", ["A"]),
+    ("trend=BULLISH", ["A", "C"]),
+    ("trend!=bullish", ["B", "D", "E"]),
+])
+def test_filters(index, expr, expected):
+    assert tickers(index.query(parse_filters(expr))) == expected
+
+
+def test_sort_puts_missing_values_last(index):
+    assert tickers(index.query([], sort="rsi14")) == ["A", "B", "E", "C", "D"]
+    assert tickers(index.query([], sort="-rsi14")) == ["C", "E", "B", "A", "D"]
+    assert tickers(index.query(parse_filters("price>15"), sort="-sma50")) == ["E", "D", "B", "C"]
+
+
+def test_limit_and_fields(index):
+    result = index.query(parse_filters("price>15"), sort="price", limit=2,
+                         fields=["sma50", "trend"])
+    assert result["matches"] == 4
+    assert result["results"] == [
+        {"ticker": "B", "sma50": 25.0, "trend": "BEARISH"},
+        {"ticker": "C", "sma50": None, "trend": "BULLISH"},
+    ]
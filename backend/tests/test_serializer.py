@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.serializer import (MSGPACK_MIMETYPE, TYPED_ARRAY_CODES, date_labels, int_list,
+                              pack_msgpack, round_list, unpack_msgpack)
+
+
+# The per-element loops the column helpers replaced
+def old_round_list(values):
+    return [None if (v is None or (isinstance(v, float) and np.isnan(v)))
+            else round(float(v), 2) for v in values]
+
+
+def old_int_list(values):
+    return [int(v) if not np.isnan(v) else 0 for v in values]
+
+
+def old_date_labels(index):
+    return [d.strftime("%Y-%m-%d") for d in index]
+
+
+def test_round_list_matches_round_including_halfway_values():
+    rng    = np.random.default_rng(3)
+    values = np.concatenate([
+        rng.uniform(0, 5000, 20_000),
+        np.round(rng.uniform(0, 5000, 20_000), 3),     # many exact x.xx5 ties
+        [2.675, 1.005, 0.285, 1862.475, 58.825, -58.825, 0.0, -0.0],
+        [np.nan, np.inf, -np.inf, 1e11 + 0.005],
+    ])
+    values[::97] = np.nan
+    series = pd.Series(values)
+    assert round_list(series) == old_round_list(series)
+    assert round_list(series.to_numpy()) == old_round_list(series)
+    assert round_list([]) == []
+
+
+def test_int_list_truncates_and_fills_nan():
+    values = pd.Series([1.9, -1.9, 0.0, np.nan, 123456789.99, 2.0 ** 52])
+    assert int_list(values) == old_int_list(values)
+    assert all(type(v) is int for v in int_list(values))
+
+
+@pytest.mark.parametrize("tz", [None, "Asia/Kolkata", "America/New_York"])
+def test_date_labels_use_the_local_date(tz):
+    index = pd.date_range("2024-03-08 18:45", periods=400, freq="7h", tz="UTC")
+    index = index.tz_convert(tz) if tz else index.tz_localize(None)
+    assert date_labels(index) == old_date_labels(index)
+
+
+def test_msgpack_typed_arrays_round_trip():
+    payload = {
+        "status": "success",
+        "data"  : {
+            **{f"col{code}": np.arange(5).astype(dtype)
+               for code, (dtype, _) in TYPED_ARRAY_CODES.items()},
+            "big_endian": np.arange(3, dtype=">f8"),
+            "matrix"    : np.ones((2, 2)),
+            "scalar"    : np.float32(1.5),
+            "labels"    : ["2024-01-01"],
+            "missing"   : None,
+        },
+    }
+    data = unpack_msgpack(pack_msgpack(payload))["data"]
+    for code, (dtype, _) in TYPED_ARRAY_CODES.items():
+        assert data[f"col{code}"].dtype == np.dtype(dtype)
+        assert data[f"col{code}"].tolist() == list(range(5))
+    assert data["big_endian"].dtype == np.dtype("<f8")
+    assert data["big_endian"].tolist() == [0.0, 1.0, 2.0]
+    assert data["matrix"] == [[1.0, 1.0], [1.0, 1.0]]
+    assert data["scalar"] == 1.5
+    assert data["labels"] == ["2024-01-01"] and data["missing"] is None
+
+
+def test_predict_msgpack_format(app_module):
+    client  = app_module.app.test_client()
+    url     = "/api/predict?ticker=AAA.NS&period=1y"
+    packed  = client.get(url + "&format=msgpack")
+    as_json = client.get(url).get_json()["data"]["chart"]
+
+    assert packed.status_code == 200
+    assert packed.content_type == MSGPACK_MIMETYPE
+    chart = unpack_msgpack(packed.data)["data"]["chart"]
+    assert chart["labels"] == as_json["labels"]
+    for column in ("open", "high", "low", "close"):
+        assert chart[column].dtype == np.float32
+        assert chart[column].tolist() == pytest.approx(as_json[column], rel=1e-6)
+    assert chart["volume"].dtype == np.float64
+    assert chart["volume"].tolist() == as_json["volume"]
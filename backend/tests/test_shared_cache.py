@@ -0,0 +1,95 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from services.shared_cache import SharedCache
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "shared-cache.sqlite3")
+
+
+def test_round_trip_and_expiry(path):
+    shared = SharedCache(path)
+    frame  = pd.DataFrame({"Close": [1.0, 2.5]},
+                          index=pd.DatetimeIndex(["2024-01-01", "2024-01-02"], name="Date"))
+    shared.set(("history", "X"), frame, ttl=60)
+    shared.set("meta", {"name": "X", "pe_ratio": None, "week": [1.5, 2.0]}, ttl=0.2)
+
+    value, ttl_left = shared.get(("history", "X"))
+    pd.testing.assert_frame_equal(value, frame)
+    assert 0 < ttl_left <= 60
+    assert shared.get("meta")[0] == {"name": "X", "pe_ratio": None, "week": [1.5, 2.0]}
+
+    time.sleep(0.25)
+    assert shared.get("meta") is None
+    assert shared.get("unknown") is None
+
+
+def test_unencodable_values_are_not_stored(path):
+    shared = SharedCache(path)
+    shared.set("obj", object(), ttl=60)
+    assert shared.get("obj") is None
+
+
+def test_one_loader_across_workers(path):
+    # One SharedCache per simulated worker, all on the same file
+    workers = [SharedCache(path, poll_interval=0.01) for _ in range(4)]
+    calls   = []
+    results = []
+    barrier = threading.Barrier(8)
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"price": 101.5}
+
+    def request(shared):
+        barrier.wait()
+        results.append(shared.get_or_load("quote", loader, ttl=60)[0])
+
+    threads = [threading.Thread(target=request, args=(workers[i % 4],)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == [{"price": 101.5}] * 8
+    assert sum(w.stats()["waits"] for w in workers) >= 1
+
+
+def test_expired_lease_is_taken_over(path):
+    shared = SharedCache(path, lock_timeout=0.3)
+    assert shared._acquire("key") is not None          # holder that never releases
+
+    started = time.monotonic()
+    value, _ = shared.get_or_load("key", lambda: "loaded", ttl=60)
+    assert value == "loaded"
+    assert time.monotonic() - started < 2.0
+
+
+def test_loader_errors_propagate_and_release_the_lease(path):
+    shared = SharedCache(path, lock_timeout=30)
+
+    def failing():
+        raise RuntimeError("upstream down")
+
+    with pytest.raises(RuntimeError):
+        shared.get_or_load("key", failing, ttl=60)
+    assert shared.get("key") is None
+
+    started = time.monotonic()
+    assert shared.get_or_load("key", lambda: 7, ttl=60)[0] == 7
+    assert time.monotonic() - started < 1.0            # no wait for the old lease
+
+
+def test_purge_trims_to_max_entries(path):
+    shared = SharedCache(path, max_entries=5, purge_every=1000)
+    for i in range(20):
+        shared.set(("q", i), i, ttl=100 + i)
+    shared.purge()
+    assert [i for i in range(20) if shared.get(("q", i)) is not None] == list(range(15, 20))
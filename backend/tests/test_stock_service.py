@@ -0,0 +1,88 @@
+import json
+import threading
+import time
+
+import pytest
+
+from services.cache import TTLCache
+from services.market_data import FixtureProvider
+from services.meta_store import MetaStore
+from services.stock_service import StockService
+
+
+def wait_for(predicate, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+class CountingProvider(FixtureProvider):
+    def __init__(self, root):
+        super().__init__(root)
+        self.calls = {"meta": 0}
+
+    def meta(self, ticker):
+        self.calls["meta"] += 1
+        return super().meta(ticker)
+
+
+@pytest.fixture
+def provider(tmp_path):
+    (tmp_path / "meta.json").write_text(json.dumps({"T.NS": {"longName": "Tee", "trailingPE": 10}}))
+    return CountingProvider(str(tmp_path))
+
+
+def test_stale_market_group_is_refreshed_on_read(provider, tmp_path):
+    now   = [1000.0]
+    store = MetaStore(str(tmp_path / "meta.sqlite3"), market_max_age=100, clock=lambda: now[0])
+    svc   = StockService(provider, meta_store=store)
+
+    assert svc.fetch_meta("T.NS")["pe_ratio"] == 10
+    provider._meta["T.NS"]["trailingPE"] = 20
+
+    now[0] += 50                                        # fresh: served from memory
+    assert svc.fetch_meta("T.NS")["pe_ratio"] == 10
+    assert provider.calls["meta"] == 1
+
+    now[0] += 50                                        # stale: served, then re-fetched
+    assert svc.fetch_meta("T.NS")["pe_ratio"] == 10
+    wait_for(lambda: store.get("T.NS")["pe_ratio"] == 20)
+    assert provider.calls["meta"] == 2
+    assert store.stale_groups("T.NS") == ()
+    assert svc.fetch_meta("T.NS")["pe_ratio"] == 20
+
+
+def test_concurrent_batches_share_one_download(ohlcv, tmp_path):
+    for t in ("A.NS", "B.NS", "C.NS"):
+        ohlcv.to_csv(tmp_path / f"{t}.csv")
+    release = threading.Event()
+    batches = []
+
+    class SlowProvider(FixtureProvider):
+        def history_many(self, tickers, period=None, start=None):
+            batches.append(sorted(tickers))
+            release.wait(5)
+            return super().history_many(tickers, period, start)
+
+    svc     = StockService(SlowProvider(str(tmp_path)), cache=TTLCache())
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(
+                   svc.fetch_history_many(["A.NS", "B.NS", "C.NS"], "3mo")))
+               for _ in range(3)]
+    for t in threads:
+        t.start()
+    wait_for(lambda: svc.cache_stats()["coalesced"] == 6)
+
+    single = threading.Thread(target=lambda: results.append(
+        {"B.NS": svc.fetch_history("B.NS", "3mo")}))
+    threads.append(single)
+    single.start()
+    wait_for(lambda: svc.cache_stats()["coalesced"] == 7)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert batches == [["A.NS", "B.NS", "C.NS"]]
+    assert all(r["B.NS"] is results[0]["B.NS"] for r in results)
+    assert len(results[0]["A.NS"]) > 0
@@ -0,0 +1,139 @@
+import json
+import threading
+import time
+
+import pytest
+
+from services.incremental_indicators import IncrementalIndicatorEngine
+from services.stream_service import ReplayFeed, StreamHub
+
+WARMUP = 250
+
+
+def wait_for(predicate, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def events(frames: list) -> list:
+    out = []
+    for frame in frames:
+        lines = frame.decode().strip().split("\n")
+        assert lines[0] == "event: quote"
+        out.append(json.loads(lines[-1][len("data: "):]))
+    return out
+
+
+class RevisingFeed(ReplayFeed):
+    """ReplayFeed whose last revealed bar can be re-printed with a new close."""
+
+    revision = None
+
+    def recent(self, ticker):
+        bars = super().recent(ticker)
+        if self.revision is not None:
+            bars = bars.copy()
+            bars.iloc[-1, bars.columns.get_loc("Close")] *= self.revision
+        return bars
+
+
+class ManualClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def make_hub():
+    hubs = []
+
+    def make(feed, **kwargs):
+        hub = StreamHub(feed, poll_interval=0.01, linger=1.0, **kwargs)
+        hubs.append(hub)
+        return hub
+
+    yield make
+    for hub in hubs:
+        hub.close()
+
+
+def test_seed_then_one_event_per_new_bar(make_hub, ohlcv):
+    hub    = make_hub(ReplayFeed(lambda t: ohlcv, warmup=WARMUP))
+    frames = []
+    hub.subscribe(["T"], frames.append)
+
+    n_bars = len(ohlcv) - WARMUP
+    wait_for(lambda: len(frames) == 1 + n_bars)
+    time.sleep(0.05)                                    # feed exhausted: nothing new
+    assert len(frames) == 1 + n_bars
+
+    got = events(frames)
+    assert [e["date"] for e in got] == \
+        [d.strftime("%Y-%m-%d") for d in ohlcv.index[WARMUP - 1:]]
+    assert got[-1]["price"] == round(float(ohlcv["Close"].iloc[-1]), 2)
+
+    expected = IncrementalIndicatorEngine().seed("T", ohlcv)
+    for field, value in expected.items():
+        assert got[-1]["indicators"][field] == pytest.approx(value, rel=1e-9), field
+
+
+def test_revised_last_bar_is_republished(make_hub, ohlcv):
+    feed   = RevisingFeed(lambda t: ohlcv, warmup=len(ohlcv) - 1)
+    hub    = make_hub(feed)
+    frames = []
+    hub.subscribe(["T"], frames.append)
+    wait_for(lambda: len(frames) == 2)
+
+    feed.revision = 1.05
+    wait_for(lambda: len(frames) == 3)
+    before, after = events(frames)[1:]
+    assert after["date"] == before["date"]
+    assert after["price"] == round(float(ohlcv["Close"].iloc[-1]) * 1.05, 2)
+    assert after["indicators"] != before["indicators"]
+
+
+def test_subscribers_share_one_loop_and_identical_frames(make_hub, ohlcv):
+    gate  = threading.Event()
+    hub   = make_hub(ReplayFeed(lambda t: (gate.wait(5), ohlcv)[1], warmup=WARMUP))
+    a, b  = [], []
+    hub.subscribe(["SHARED"], a.append)
+    hub.subscribe(["SHARED"], b.append)
+    assert hub.status() == {"SHARED": 2}
+    assert sum(t.name == "stream-SHARED" for t in threading.enumerate()) == 1
+
+    gate.set()
+    wait_for(lambda: len(a) == 1 + len(ohlcv) - WARMUP and len(b) == len(a))
+    assert a == b
+
+
+def test_late_subscriber_gets_the_last_event(make_hub, ohlcv):
+    hub   = make_hub(ReplayFeed(lambda t: ohlcv, warmup=WARMUP))
+    first = []
+    hub.subscribe(["T"], first.append)
+    wait_for(lambda: len(first) == 1 + len(ohlcv) - WARMUP)
+
+    late = []
+    hub.subscribe(["T"], late.append)
+    assert late == [first[-1]]
+
+
+def test_channel_is_torn_down_after_linger(make_hub, ohlcv):
+    clock  = ManualClock()
+    hub    = make_hub(ReplayFeed(lambda t: ohlcv, warmup=WARMUP), clock=clock)
+    frames = []
+    token  = hub.subscribe(["LINGER"], frames.append)
+    wait_for(lambda: len(frames) == 1 + len(ohlcv) - WARMUP)
+
+    hub.unsubscribe(token)
+    time.sleep(0.05)
+    assert hub.status() == {"LINGER": 0}                # lingering, still seeded
+    assert hub.engine.snapshot("LINGER") is not None
+
+    clock.now += hub.linger
+    wait_for(lambda: hub.status() == {})
+    assert hub.engine.snapshot("LINGER") is None
+    wait_for(lambda: not any(t.name == "stream-LINGER" for t in threading.enumerate()))
@@ -0,0 +1,62 @@
+"""
+utils/downsample.py
+Shape-preserving downsampling of chart series.
+
+lttb_indices() implements Largest-Triangle-Three-Buckets (Steinarsson,
+2013): the first and last points are kept, the rest are split into
+equal-width buckets and from each bucket the point forming the largest
+triangle with the previously kept point and the next bucket's mean is
+chosen. Peaks and troughs survive, unlike with every-k-th sampling.
+
+It returns row positions rather than values, so one selection (made on the
+close) can be applied to every column of a bar frame and to the overlay
+series computed on it.
+"""
+
+import numpy as np
+
+
+def lttb_indices(y, n_out: int) -> np.ndarray:
+    """
+    Positions of the `n_out` points LTTB keeps from `y` (sorted, int64).
+
+    x is taken as the position, which suits bars on a trading-day axis.
+    NaN values are never chosen over a finite one. Returns every position
+    when `y` already has at most `n_out` points.
+    """
+    if n_out < 3:
+        raise ValueError("LTTB needs n_out >= 3 (first, last and one bucket).")
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+
+    # Bucket b (1..n_out-2) covers [edges[b-1], edges[b]) of the inner points;
+    # the last point forms a one-element bucket of its own
+    every  = (n - 2) / (n_out - 2)
+    edges  = np.append(np.floor(np.arange(n_out - 1) * every).astype(np.int64) + 1, n)
+    finite = np.isfinite(y)
+    sums   = np.add.reduceat(np.where(finite, y, 0.0), edges[:-1])
+    counts = np.add.reduceat(finite.astype(np.int64), edges[:-1])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_y = (sums / counts).tolist()                        # NaN if no finite point
+    mean_x = ((edges[:-1] + edges[1:] - 1) / 2.0).tolist()
+
+    # The selection is sequential (each bucket depends on the previous pick)
+    # and buckets are a few points wide: plain floats beat per-bucket NumPy calls
+    ys, bounds = y.tolist(), edges.tolist()
+    out = [0]
+    a   = 0
+    for b in range(n_out - 2):
+        ay, cx, cy = ys[a], mean_x[b + 1], mean_y[b + 1]
+        if cy != cy:                                             # next bucket all NaN
+            cy = ay
+        best, best_area = bounds[b], -1.0
+        for i in range(bounds[b], bounds[b + 1]):
+            area = abs((a - cx) * (ys[i] - ay) - (a - i) * (cy - ay))
+            if area > best_area:                                 # False for NaN
+                best, best_area = i, area
+        a = best
+        out.append(a)
+    out.append(n - 1)
+    return np.asarray(out, dtype=np.int64)
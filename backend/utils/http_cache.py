@@ -0,0 +1,64 @@
+"""
+utils/http_cache.py
+Conditional-request helpers (ETag / Last-Modified / Cache-Control, 304).
+
+Validators are computed from the inputs of a response, not its bytes, so a
+handler can answer a revalidation before doing any of the expensive work.
+ETags are weak (W/"..."): two responses with the same validator carry the
+same data but not the same bytes (the envelope timestamp differs).
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+
+def make_etag(*parts) -> str:
+    """Weak ETag over the repr of `parts` (values that determine the payload)."""
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def cache_headers(etag: str, last_modified: datetime, max_age: int) -> dict:
+    """Response headers advertising the validators and freshness lifetime."""
+    return {
+        "ETag"         : etag,
+        "Last-Modified": http_date(last_modified),
+        "Cache-Control": f"public, max-age={max(int(max_age), 0)}",
+    }
+
+
+def is_not_modified(headers, etag: str, last_modified: datetime) -> bool:
+    """
+    True if the request's conditional headers match (answer 304).
+
+    If-None-Match wins when present (weak comparison, '*' matches);
+    If-Modified-Since is only consulted without it (RFC 9110 §13.2.2).
+    """
+    if_none_match = headers.get("If-None-Match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        wanted = _opaque(etag)
+        return any(_opaque(tag) == wanted for tag in if_none_match.split(","))
+
+    if_modified_since = headers.get("If-Modified-Since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def http_date(ts: datetime) -> str:
+    """IMF-fixdate, e.g. 'Tue, 15 Oct 2024 10:00:00 GMT'."""
+    return format_datetime(ts.astimezone(timezone.utc), usegmt=True)
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
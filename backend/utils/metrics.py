@@ -0,0 +1,208 @@
+"""
+utils/metrics.py
+In-process metrics with Prometheus text exposition and Server-Timing.
+
+  ─ Counter / Histogram : labelled, thread-safe, cumulative since start
+  ─ REGISTRY.collector(): callback run at scrape time for values another
+                          object already tracks (e.g. TTLCache.stats())
+  ─ StageTimer          : times the stages of one request into
+                          STAGE_SECONDS and renders a Server-Timing header
+
+Metrics are per process: with several gunicorn workers each exposes its
+own /metrics (scrape them individually, or sum in PromQL).
+"""
+
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+# Latency buckets (seconds): sub-millisecond CPU stages up to slow upstream
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS    = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, doc: str, labelnames: tuple = ()):
+        self.name       = name
+        self.doc        = doc
+        self.labelnames = tuple(labelnames)
+        self._values    = {}
+        self._lock      = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def _labels(self, key: tuple, extra: str = "") -> str:
+        pairs = [f'{n}="{_escape(v)}"' for n, v in zip(self.labelnames, key)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> list:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{self._labels(k)} {_num(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, doc: str, labelnames: tuple = (),
+                 buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(name, doc, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [[0] * len(self.buckets), 0, 0.0]
+            i = bisect.bisect_left(self.buckets, value)     # first bound >= value
+            if i < len(self.buckets):
+                counts[0][i] += 1
+            counts[1] += 1
+            counts[2] += value
+
+    def render(self) -> list:
+        with self._lock:
+            items = sorted((k, (list(c[0]), c[1], c[2])) for k, c in self._values.items())
+        lines = []
+        for key, (counts, total, value_sum) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                le = 'le="%s"' % _num(bound)
+                lines.append(f"{self.name}_bucket{self._labels(key, le)} {cumulative}")
+            le = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{self._labels(key, le)} {total}")
+            lines.append(f"{self.name}_count{self._labels(key)} {total}")
+            lines.append(f"{self.name}_sum{self._labels(key)} {_num(value_sum)}")
+        return lines
+
+
+class Registry:
+    """Ordered set of metrics plus scrape-time collectors."""
+
+    def __init__(self):
+        self._metrics    = {}
+        self._collectors = []
+        self._lock       = threading.Lock()
+
+    def counter(self, name: str, doc: str, labelnames: tuple = ()) -> Counter:
+        return self._add(Counter(name, doc, labelnames))
+
+    def histogram(self, name: str, doc: str, labelnames: tuple = (),
+                  buckets: tuple = LATENCY_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, doc, labelnames, buckets))
+
+    def collector(self, fn):
+        """
+        Register `fn() → [(name, kind, doc, {labels tuple-of-pairs: value})]`,
+        called on every scrape.
+        """
+        with self._lock:
+            self._collectors.append(fn)
+        return fn
+
+    def render(self) -> str:
+        """Prometheus text exposition format 0.0.4."""
+        with self._lock:
+            metrics, collectors = list(self._metrics.values()), list(self._collectors)
+        out = []
+        for m in metrics:
+            out += [f"# HELP {m.name} {m.doc}", f"# TYPE {m.name} {m.kind}", *m.render()]
+        for fn in collectors:
+            for name, kind, doc, samples in fn():
+                out += [f"# HELP {name} {doc}", f"# TYPE {name} {kind}"]
+                for labels, value in samples.items():
+                    body = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+                    out.append(f"{name}{{{body}}} {_num(value)}" if body else f"{name} {_num(value)}")
+        return "\n".join(out) + "\n"
+
+    def _add(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                return self._metrics[metric.name]
+            self._metrics[metric.name] = metric
+            return metric
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "app_stage_duration_seconds", "Time spent per request stage.", ("endpoint", "stage"))
+REQUEST_SECONDS = REGISTRY.histogram(
+    "app_request_duration_seconds", "End-to-end request latency.", ("endpoint", "status"))
+RESPONSE_BYTES = REGISTRY.histogram(
+    "app_response_size_bytes", "Response body size.", ("endpoint",), SIZE_BUCKETS)
+UPSTREAM_CALLS = REGISTRY.counter(
+    "upstream_calls_total", "Market-data provider calls.", ("provider", "call", "outcome"))
+UPSTREAM_SECONDS = REGISTRY.histogram(
+    "upstream_call_duration_seconds", "Market-data provider call latency.", ("provider", "call"))
+
+
+class StageTimer:
+    """
+    Per-request stage timings.
+
+    Usage:
+        timer = StageTimer("predict")
+        with timer.stage("fetch_history"):
+            ...
+        response.headers["Server-Timing"] = timer.header()
+    """
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self.stages   = []            # (name, seconds) in completion order
+
+    @contextmanager
+    def stage(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - t0)
+
+    def timed(self, name: str, fn, *args, **kwargs):
+        """Call fn(*args, **kwargs) as stage `name` (e.g. on another thread)."""
+        with self.stage(name):
+            return fn(*args, **kwargs)
+
+    def record(self, name: str, seconds: float):
+        self.stages.append((name, seconds))
+        STAGE_SECONDS.observe(seconds, endpoint=self.endpoint, stage=name)
+
+    def header(self) -> str:
+        """Server-Timing value, e.g. 'fetch_history;dur=12.4, predict;dur=0.8'."""
+        return ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.stages)
+
+
+def _num(v) -> str:
+    if isinstance(v, float):
+        if math.isinf(v):
+            return "+Inf" if v > 0 else "-Inf"
+        if v.is_integer():
+            return str(int(v))
+    return repr(v) if isinstance(v, float) else str(v)
+
+
+def _escape(v) -> str:
+    return str(v).replace("\\", r"\\").replace("\n", r"\n").replace('"', r'\"')
@@ -3,11 +3,16 @@ utils/response_builder.py
 Standardised JSON response envelopes for all API endpoints.
 """
 
-from flask import jsonify
+from flask import Response, jsonify
 from datetime import datetime
 
+from utils.serializer import pack_msgpack, dump_json, MSGPACK_MIMETYPE, JSON_MIMETYPE
 
-def success_response(data: dict, status: int = 200):
+# Values accepted by the `format=` parameter
+RESPONSE_FORMATS = ("json", "msgpack")
+
+
+def success_body(data: dict) -> dict:
     """
     Standard success envelope.
 
@@ -17,14 +22,14 @@ def success_response(data: dict, status: int = 200):
         "data"      : {...}
     }
     """
-    return jsonify({
+    return {
         "status"   : "success",
         "timestamp": datetime.utcnow().isoformat() + "Z",
         "data"     : data,
-    }), status
+    }
 
 
-def error_response(message: str, status: int = 400):
+def error_body(message: str, status: int = 400) -> dict:
     """
     Standard error envelope.
 
@@ -34,8 +39,28 @@ def error_response(message: str, status: int = 400):
         "code"    : 400
     }
     """
-    return jsonify({
+    return {
         "status" : "error",
         "message": message,
         "code"   : status,
-    }), status
\ No newline at end of file
+    }
+
+
+def encode_body(body: dict, fmt: str = "json") -> tuple:
+    """Encode an envelope in `fmt` → (bytes, mimetype)."""
+    if fmt == "msgpack":
+        return pack_msgpack(body), MSGPACK_MIMETYPE
+    return dump_json(body) + b"\n", JSON_MIMETYPE
+
+
+def success_response(data: dict, status: int = 200, fmt: str = "json"):
+    """Flask response carrying success_body(data), as JSON or msgpack."""
+    if fmt == "msgpack":
+        payload, mimetype = encode_body(success_body(data), fmt)
+        return Response(payload, mimetype=mimetype), status
+    return jsonify(success_body(data)), status
+
+
+def error_response(message: str, status: int = 400):
+    """Flask response carrying error_body(message, status)."""
+    return jsonify(error_body(message, status)), status
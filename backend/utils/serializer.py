@@ -0,0 +1,181 @@
+"""
+utils/serializer.py
+Fast encoding of API payloads.
+
+  ─ Column helpers (round_list, int_list, date_labels) turn NumPy / pandas
+    columns into JSON-ready lists with vectorised rounding and NaN → null,
+    instead of a Python round() / isnan() / strftime() per element.
+  ─ OrjsonProvider plugs orjson into Flask, so jsonify() and request
+    parsing use it (NumPy scalars and arrays encode natively).
+  ─ pack_msgpack() encodes a payload as MessagePack. NumPy arrays travel as
+    typed-array extension types: the ext data is the raw little-endian
+    buffer, so a browser wraps it in the matching TypedArray with no
+    parsing (ext code → TypedArray in TYPED_ARRAY_CODES).
+  ─ pack_frame() / unpack_frame() store a bar DataFrame the same way: one
+    raw buffer per column plus the index as int64 nanoseconds (caches that
+    leave the process, e.g. services/shared_cache.py). pack_value() tags a
+    cached value as either form.
+"""
+
+import msgpack
+import numpy as np
+import orjson
+import pandas as pd
+from flask.json.provider import DefaultJSONProvider
+
+JSON_MIMETYPE    = "application/json"
+MSGPACK_MIMETYPE = "application/msgpack"
+
+# msgpack ext code → (NumPy dtype, JavaScript TypedArray)
+TYPED_ARRAY_CODES = {
+    1: ("<f8", "Float64Array"),
+    2: ("<f4", "Float32Array"),
+    3: ("<i4", "Int32Array"),
+    4: ("<i8", "BigInt64Array"),
+    5: ("<u1", "Uint8Array"),
+}
+_EXT_BY_DTYPE = {np.dtype(dt): code for code, (dt, _) in TYPED_ARRAY_CODES.items()}
+
+
+# ─── Column helpers ───────────────────────────────────────────────────────────
+
+def round_list(values, decimals: int = 2) -> list:
+    """
+    Round a float column to `decimals` exactly as round() does; NaN becomes
+    None. np.round scales by 10**decimals first, so near-halfway values
+    (e.g. 2.675) can round the other way: those few are redone with round().
+    """
+    arr    = np.asarray(values, dtype=np.float64)
+    scaled = arr * 10.0 ** decimals
+    with np.errstate(invalid="ignore"):                          # inf - inf
+        frac = np.abs(scaled - np.trunc(scaled))
+    ties   = np.flatnonzero(np.abs(frac - 0.5) <= 1e-6 + np.abs(scaled) * 1e-12)
+    out    = np.round(arr, decimals).tolist()
+    for i in ties.tolist():
+        out[i] = round(float(arr[i]), decimals)
+    nan = np.flatnonzero(np.isnan(arr))
+    for i in nan.tolist():
+        out[i] = None
+    return out
+
+
+def int_list(values, fill: int = 0) -> list:
+    """Truncate a numeric column to int; NaN becomes `fill`."""
+    arr = np.asarray(values, dtype=np.float64)
+    return np.nan_to_num(arr, nan=fill).astype(np.int64).tolist()
+
+
+def date_labels(index) -> list:
+    """'YYYY-MM-DD' label per entry of a DatetimeIndex (local exchange date)."""
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return np.datetime_as_string(index.values, unit="D").tolist()
+
+
+# ─── JSON ─────────────────────────────────────────────────────────────────────
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson (sorted keys, like the default)."""
+
+    OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj, **kwargs) -> str:
+        return dump_json(obj, self.sort_keys).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dump_json(obj, self.sort_keys) + b"\n",
+                                        mimetype=self.mimetype)
+
+
+def dump_json(obj, sort_keys: bool = True) -> bytes:
+    """orjson-encode `obj`; types orjson lacks fall back to Flask's default."""
+    option = OrjsonProvider.OPTIONS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+    return orjson.dumps(obj, default=DefaultJSONProvider.default, option=option)
+
+
+# ─── MessagePack ──────────────────────────────────────────────────────────────
+
+def pack_msgpack(obj) -> bytes:
+    """MessagePack-encode `obj`, NumPy arrays as typed-array ext types."""
+    return msgpack.packb(obj, default=_msgpack_default, use_bin_type=True)
+
+
+def unpack_msgpack(data: bytes):
+    """Inverse of pack_msgpack (typed arrays come back as NumPy arrays)."""
+    return msgpack.unpackb(data, ext_hook=_msgpack_ext_hook, raw=False)
+
+
+# ─── DataFrames ───────────────────────────────────────────────────────────────
+
+def pack_frame(df: pd.DataFrame) -> bytes:
+    """
+    Compact binary form of a DataFrame with a DatetimeIndex (or an empty
+    one): column buffers as typed-array ext types, no per-value encoding.
+    """
+    index = df.index
+    data  = {
+        "columns": [str(c) for c in df.columns],
+        "data"   : [np.ascontiguousarray(df[c].to_numpy()) for c in df.columns],
+        "index"  : None,
+    }
+    if isinstance(index, pd.DatetimeIndex):
+        data["index"]      = index.asi8
+        data["index_name"] = index.name
+        data["tz"]         = str(index.tz) if index.tz is not None else None
+    elif len(index):
+        raise TypeError("pack_frame needs a DatetimeIndex")
+    return pack_msgpack(data)
+
+
+def unpack_frame(data: bytes) -> pd.DataFrame:
+    """Inverse of pack_frame; the frame owns (can write) its column data."""
+    obj = unpack_msgpack(data)
+    if obj["index"] is None:
+        return pd.DataFrame(columns=obj["columns"]) if obj["columns"] else pd.DataFrame()
+    index = pd.DatetimeIndex(obj["index"].view("M8[ns]"), name=obj.get("index_name"))
+    if obj.get("tz"):
+        index = index.tz_localize("UTC").tz_convert(obj["tz"])
+    return pd.DataFrame({c: np.array(v) for c, v in zip(obj["columns"], obj["data"])},
+                        index=index)
+
+
+# ─── Tagged values ────────────────────────────────────────────────────────────
+# One byte tag, then pack_frame (DataFrames) or pack_msgpack (anything else);
+# used by the on-disk caches (shared cache tier, warm-start snapshot).
+
+_FRAME_TAG, _MSGPACK_TAG = b"F", b"M"
+
+
+def pack_value(value) -> bytes:
+    if isinstance(value, pd.DataFrame):
+        return _FRAME_TAG + pack_frame(value)
+    return _MSGPACK_TAG + pack_msgpack(value)
+
+
+def unpack_value(blob: bytes):
+    blob = bytes(blob)
+    if blob[:1] == _FRAME_TAG:
+        return unpack_frame(blob[1:])
+    return unpack_msgpack(blob[1:])
+
+
+def _msgpack_default(obj):
+    if isinstance(obj, np.ndarray):
+        code = _EXT_BY_DTYPE.get(obj.dtype.newbyteorder("<"))
+        if code is None or obj.ndim != 1:
+            return obj.tolist()
+        return msgpack.ExtType(code, obj.astype(obj.dtype.newbyteorder("<"),
+                                                copy=False).tobytes())
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not MessagePack serialisable")
+
+
+def _msgpack_ext_hook(code: int, data: bytes):
+    if code in TYPED_ARRAY_CODES:
+        return np.frombuffer(data, dtype=TYPED_ARRAY_CODES[code][0])
+    return msgpack.ExtType(code, data)
@@ -7,6 +7,10 @@ import re
 
 VALID_PERIODS = {"1mo", "3mo", "6mo", "1y", "2y", "5y"}
 
+# Bounds of the chart `points=` downsampling target
+MIN_CHART_POINTS = 10
+MAX_CHART_POINTS = 5000
+
 # Regex: 1-12 uppercase letters, optionally followed by .NS or .BO
 TICKER_PATTERN = re.compile(r"^[A-Z0-9]{1,20}(\.NS|\.BO|\.BSE)?$")
 
@@ -38,4 +42,80 @@ def validate_period(period: str) -> str | None:
             f"Invalid period '{period}'. "
             f"Accepted values: {', '.join(sorted(VALID_PERIODS))}."
         )
-    return None
\ No newline at end of file
+    return None
+
+
+def validate_indicators(names: list, allowed: set) -> str | None:
+    """
+    Validate an `indicators=` selector list against the accepted names.
+    Returns an error message string if invalid, else None.
+    """
+    if not names:
+        return "Parameter 'indicators' must name at least one indicator."
+    unknown = [n for n in names if n not in allowed]
+    if unknown:
+        return (
+            f"Unknown indicator(s): {', '.join(unknown)}. "
+            f"Accepted values: {', '.join(sorted(allowed))}."
+        )
+    return None
+
+
+def validate_tickers(tickers, limit: int) -> str | None:
+    """
+    Validate a list of ticker symbols for a batch request.
+    Returns an error message string if invalid, else None.
+    """
+    if not isinstance(tickers, list) or not tickers:
+        return "Field 'tickers' must be a non-empty list of symbols."
+    if len(tickers) > limit:
+        return f"Too many tickers ({len(tickers)}); at most {limit} per request."
+    for ticker in tickers:
+        if not isinstance(ticker, str):
+            return "Field 'tickers' must contain only strings."
+        err = validate_ticker(ticker)
+        if err:
+            return err
+    return None
+
+
+def validate_format(fmt: str, allowed) -> str | None:
+    """
+    Validate a response `format=` value.
+    Returns an error message string if invalid, else None.
+    """
+    if fmt not in allowed:
+        return (
+            f"Invalid format '{fmt}'. "
+            f"Accepted values: {', '.join(allowed)}."
+        )
+    return None
+
+
+def validate_points(points: str) -> str | None:
+    """
+    Validate a chart `points=` downsampling target.
+    Returns an error message string if invalid, else None.
+    """
+    if not points.isdigit() or not MIN_CHART_POINTS <= int(points) <= MAX_CHART_POINTS:
+        return (
+            f"Invalid points '{points}'. "
+            f"Use an integer from {MIN_CHART_POINTS} to {MAX_CHART_POINTS}."
+        )
+    return None
+
+
+def validate_fields(names: list, allowed) -> str | None:
+    """
+    Validate a `fields=` projection list against the accepted names.
+    Returns an error message string if invalid, else None.
+    """
+    if not names:
+        return "Parameter 'fields' must name at least one field."
+    unknown = [n for n in names if n not in allowed]
+    if unknown:
+        return (
+            f"Unknown field(s): {', '.join(unknown)}. "
+            f"Accepted values: {', '.join(sorted(allowed))}."
+        )
+    return None
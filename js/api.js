@@ -9,6 +9,10 @@ const API = (() => {
 
   const BASE_URL = "https://marketmind-backend-et47.onrender.com";
   const TIMEOUT  = 30_000; // 30s — yfinance can be slow
+  const CHART_POINTS = 400;  // max bars per price chart (~ its pixel width)
+  // Live card updates over /api/stream. Each open tab holds a connection for
+  // as long as it stays open; enable only when the backend serves asgi.py.
+  const LIVE_QUOTES  = false;
 
   /**
    * Core fetch wrapper with timeout and unified error handling.
@@ -44,13 +48,18 @@ const API = (() => {
   }
 
   return {
+    /** Whether the dashboard should subscribe to /api/stream. */
+    liveQuotes: LIVE_QUOTES,
+
     /**
      * Run full prediction pipeline for a ticker.
      * @param {string} ticker — e.g. 'RELIANCE.NS'
      * @param {string} period — '1mo' | '3mo' | '6mo' | '1y'
      */
     predict(ticker, period = '3mo') {
-      return request(`/api/predict?ticker=${encodeURIComponent(ticker)}&period=${period}`);
+      // points: long periods are downsampled server-side (LTTB) to what the
+      // chart can actually draw
+      return request(`/api/predict?ticker=${encodeURIComponent(ticker)}&period=${period}&points=${CHART_POINTS}`);
     },
 
     /** Trending stocks snapshot list. */
@@ -70,5 +79,19 @@ const API = (() => {
     quickQuote(ticker) {
       return request(`/api/stocks/search?q=${encodeURIComponent(ticker)}`);
     },
+
+    /**
+     * Subscribe to live quote events (Server-Sent Events).
+     * The browser reconnects on its own after a dropped connection.
+     * @param {string[]} tickers
+     * @param {function} onQuote — called with {ticker, date, price, change_pct, indicators}
+     * @returns {EventSource} — call .close() to unsubscribe
+     */
+    stream(tickers, onQuote) {
+      const source = new EventSource(
+        `${BASE_URL}/api/stream?tickers=${tickers.map(encodeURIComponent).join(',')}`);
+      source.addEventListener('quote', e => onQuote(JSON.parse(e.data)));
+      return source;
+    },
   };
 })();
\ No newline at end of file
@@ -11,6 +11,7 @@
   // ── State ─────────────────────────────────────────────────────────────────
   let currentTicker = null;
   let currentPeriod = '3mo';
+  let quoteStream   = null;
 
   // ── DOM References ────────────────────────────────────────────────────────
   const searchInput = document.getElementById('searchInput');
@@ -115,11 +116,22 @@
         document.getElementById('topGrid').innerHTML =
           '<p style="color:var(--text-muted);grid-column:1/-1;padding:16px">Could not load top stocks.</p>';
       }
+
+      subscribeQuotes();
     } catch (err) {
       console.error('[loadStockLists]', err);
     }
   }
 
+  /** Keep the rendered cards live via /api/stream (one connection for all). */
+  function subscribeQuotes() {
+    if (!API.liveQuotes) return;
+    const tickers = [...new Set([...document.querySelectorAll('.stock-card[data-ticker]')]
+      .map(card => card.dataset.ticker))];
+    if (quoteStream) quoteStream.close();
+    if (tickers.length) quoteStream = API.stream(tickers, UI.updateStockCard);
+  }
+
   // ═══════════════════════════════════════════════════════════════════════════
   //  MARKET TIME
   // ═══════════════════════════════════════════════════════════════════════════
@@ -259,6 +259,8 @@ const UI = (() => {
       const card = document.createElement('div');
       card.className = 'stock-card animate-in';
       card.style.animationDelay = `${i * 0.05}s`;
+      card.dataset.ticker   = stock.ticker;
+      card.dataset.currency = stock.currency;
 
       const isUp     = stock.direction === 'up';
       const sparkId  = `spark-${gridId}-${i}`;
@@ -285,6 +287,25 @@ const UI = (() => {
     });
   }
 
+  /**
+   * Apply a live quote event to every card showing that ticker.
+   * @param {object} quote — /api/stream event: {ticker, price, change_pct, ...}
+   */
+  function updateStockCard(quote) {
+    document.querySelectorAll(`.stock-card[data-ticker="${quote.ticker}"]`).forEach(card => {
+      if (quote.price != null) {
+        card.querySelector('.stock-card__price').textContent =
+          `${card.dataset.currency === 'INR' ? '₹' : '$'}${quote.price.toLocaleString('en-IN', {minimumFractionDigits:2})}`;
+      }
+      // No previous close yet (first bar): keep the card's change as rendered
+      if (quote.change_pct == null) return;
+      const isUp = quote.change_pct >= 0;
+      const chg = card.querySelector('.stock-card__change');
+      chg.className   = `stock-card__change ${isUp ? 'up' : 'down'}`;
+      chg.textContent = `${isUp ? '+' : ''}${quote.change_pct}%`;
+    });
+  }
+
   // ── Helpers ──────────────────────────────────────────────────────────────
 
   function fmtPrice(v) {
@@ -321,6 +342,7 @@ const UI = (() => {
     showError,
     renderAnalysis,
     renderStockCards,
+    updateStockCard,
   };
 
 })();
\ No newline at end of file